@@ -0,0 +1,207 @@
+import pandas as pd
+import pyarrow as pa
+
+import os
+import time
+import hashlib
+import threading
+
+from pathlib import Path
+from functools import lru_cache
+from typing import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Bump when a change to the import pipeline alters the datasets it produces
+CACHE_FORMAT_VERSION = 1
+
+DEFAULT_CACHE_DIRECTORY = str(Path.home() / '.cache' / 'DataLink' / 'imports')
+DEFAULT_CACHE_SIZE = 4 * 1024 * 1024 * 1024
+
+
+class ArrowStore:
+    """ Content addressed folder of Arrow IPC files, the base of the import cache and the result store.
+
+    Keys are blake2b hashes of format_version, the library versions and the parts that identify an entry, so entries
+    written by other versions are never read back. Entries are written uncompressed, through a temporary file
+    replaced in one step, so a hit can be memory-mapped and a reader never sees a partial file. The file
+    modification time is the use clock: collect removes the entries unused for more than max_age seconds (None keeps
+    them), then the least recently used ones until the folder fits in max_size bytes.
+    """
+    name = 'Store'
+    format_version = 1
+
+    def __init__(self, directory: str, max_size: int, max_age: float = None):
+        self.directory = directory
+        self.max_size = max_size
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+
+    def get_key(self, *parts: str) -> str:
+        key = hashlib.blake2b(digest_size=20)
+        key.update('{0}|{1}|{2}'.format(self.format_version, pd.__version__, pa.__version__).encode())
+        for part in parts:
+            key.update(b'|')
+            key.update(part.encode())
+        return key.hexdigest()
+
+    def get_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + '.arrow')
+
+    def use(self, key: str, read: Callable):
+        """ read(path) of the entry of key, which is marked used, or None if the store has no readable entry """
+        path = self.get_path(key)
+        try:
+            value = read(path)
+            os.utime(path)
+        except (OSError, pa.ArrowInvalid):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    def write(self, key: str, table: pa.Table) -> str:
+        """ Writes table as the entry of key, then collects, and returns the path of the entry """
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.get_path(key)
+        temporary_path = '{0}.{1}.tmp'.format(path, os.getpid())
+        try:
+            with pa.OSFile(temporary_path, 'wb') as file:
+                with pa.ipc.new_file(file, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(temporary_path, path)
+        finally:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+        self.collect()
+        return path
+
+    def collect(self, max_age: float = None, max_size: int = None) -> tuple:
+        """ Removes the entries unused for max_age seconds, then the least recently used until the store fits in
+        max_size bytes (the store settings by default), and returns the number of entries and bytes removed.
+        """
+        max_age = self.max_age if max_age is None else max_age
+        max_size = self.max_size if max_size is None else max_size
+        entries = [(entry.stat().st_mtime, entry.stat().st_size, entry.path) for entry in self.scan()]
+
+        oldest = time.time() - max_age if max_age is not None else float('-inf')
+        total_size = sum(size for _, size, _ in entries)
+        removed = 0
+        freed = 0
+        for modified, size, path in sorted(entries):
+            if modified >= oldest and total_size <= max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total_size -= size
+            removed += 1
+            freed += size
+        return removed, freed
+
+    def scan(self) -> list:
+        """ The directory entries of the store files """
+        if not os.path.isdir(self.directory):
+            return []
+        return [entry for entry in os.scandir(self.directory) if entry.name.endswith('.arrow')]
+
+    def get_usage(self) -> int:
+        return sum(entry.stat().st_size for entry in self.scan())
+
+    def summary(self) -> str:
+        return '{0}: {1} hits, {2} misses, {3:.1f} MB of {4:.1f} MB used'.format(
+            self.name, self.hits, self.misses, self.get_usage() / 1024 ** 2, self.max_size / 1024 ** 2
+        )
+
+
+class ImportCache(ArrowStore):
+    """ Content addressed store of imported datasets.
+
+    Entries are keyed by a hash of the data, schema and validation files and the import options, and are memory-mapped
+    instead of re-parsed on a hit. The directory is kept under max_size bytes by evicting the least recently used
+    entries.
+    """
+    name = 'Import cache'
+    format_version = CACHE_FORMAT_VERSION
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIRECTORY, max_size: int = DEFAULT_CACHE_SIZE):
+        super().__init__(directory, max_size)
+
+    def get_key(self, *filepaths: str, options: str = '') -> str:
+        """ options describes import settings that change the dataset produced from the same files """
+        return super().get_key(options, *(hash_file(filepath) if filepath else '' for filepath in filepaths))
+
+    def load(self, key: str):
+        table = self.use(key, read_table)
+        return table.to_pandas() if table is not None else None
+
+    def store(self, key: str, dataset: pd.DataFrame) -> None:
+        self.write(key, pa.Table.from_pandas(dataset))
+
+
+class KeyLookup:
+    """ Computes the key of an import on its own thread (hashing releases the GIL) so the import does not have to
+    wait for a large file to be hashed before it starts. on_hit is called if the cache already holds the key.
+    """
+    def __init__(self, cache: ImportCache, filepaths: tuple, options: str = '', on_hit: Callable = None):
+        self.cache = cache
+        self.on_hit = on_hit
+        self._hit = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=1)
+        self._key = executor.submit(self.lookup, filepaths, options)
+        executor.shutdown(wait=False)
+
+    def lookup(self, filepaths: tuple, options: str) -> str:
+        key = self.cache.get_key(*filepaths, options=options)
+        if os.path.exists(self.cache.get_path(key)):
+            self._hit.set()
+            if self.on_hit is not None:
+                self.on_hit()
+        else:
+            # The import goes on without the cache; a hit is counted when the cached dataset is loaded
+            self.cache.misses += 1
+        return key
+
+    def is_hit(self) -> bool:
+        return self._hit.is_set()
+
+    def get_key(self) -> str:
+        """ The key, waiting for the hash to finish """
+        return self._key.result()
+
+
+def read_table(path: str) -> pa.Table:
+    """ The table of the Arrow IPC file at path, memory-mapped """
+    return pa.ipc.open_file(pa.memory_map(path)).read_all()
+
+
+def hash_file(filepath: str) -> str:
+    """ Content hash of a file, memoized while its size and modification time are unchanged """
+    stat = os.stat(filepath)
+    return __hash_file(os.path.abspath(filepath), stat.st_mtime_ns, stat.st_size)
+
+
+def get_import_cache() -> ImportCache:
+    """ The import cache shared by every CSV import in the session """
+    return __get_import_cache()
+
+
+"""
+Private helper functions
+"""
+
+
+@lru_cache(maxsize=None)
+def __get_import_cache() -> ImportCache:
+    return ImportCache()
+
+
+@lru_cache(maxsize=256)
+def __hash_file(filepath: str, modified: int, size: int) -> str:
+    digest = hashlib.blake2b(digest_size=20)
+    with open(filepath, 'rb') as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
@@ -1,7 +1,9 @@
 import pandas as pd
 import pyarrow as pa
 
-from DataLink.DataTool.Filter import filter_data, FilterInstruction
+from typing import Any
+
+from DataLink.DataTool.Filter import filter_data_by, FilterInstruction
 
 
 def replace_value(
@@ -10,10 +12,15 @@ def replace_value(
         replace_with: Any,
         additional_filter: list = None
 ) -> pd.DataFrame:
-    if additional_filter is None:
-        selection = filter_data(dataframe, [main_filter])
-    else:
-        additional_filter.append(main_filter)
-        selection = filter_data(dataframe, additional_filter)
-    dataframe.loc[selection, columns] = replace_with
+    """ A copy of dataframe with replace_with in the columns of main_filter at the rows matching any of the filters,
+    main_filter or one of additional_filter, as in the Replace node. Only the replaced columns are copied, dataframe
+    itself is left as it is.
+    """
+    filters = [main_filter] if additional_filter is None else additional_filter + [main_filter]
+    selection = filter_data_by(dataframe, filters)
+    dataframe = dataframe.copy(deep=False)
+    for column_name in main_filter.columns:
+        column = dataframe[column_name].copy()
+        column.loc[selection] = replace_with
+        dataframe[column_name] = column
     return dataframe
@@ -0,0 +1,81 @@
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from DataLink.DataTool.Parallel import map_columns
+from DataLink.DataTool.Log import ImportLog, get_import_log
+
+
+# Text columns with at most DICTIONARY_CARDINALITY_RATIO distinct values per row are dictionary encoded
+DICTIONARY_CARDINALITY_RATIO = 0.5
+INTEGER_TYPES = [pa.int8(), pa.int16(), pa.int32(), pa.int64()]
+
+
+def compact_table(
+        table: pa.Table,
+        categorical: set = frozenset(),
+        workers: int = 1,
+        log: ImportLog = None
+) -> pa.Table:
+    """ Stores every column in the smallest Arrow type that holds its values and logs the memory saved.
+
+    Integer columns are narrowed to the smallest width that fits their observed minimum and maximum. Columns in
+    categorical, and text columns with few distinct values, are dictionary encoded with the narrowest index type.
+    """
+    log = get_import_log(log)
+    columns = map_columns(
+        lambda name: __compact_column(table.column(name), name in categorical),
+        table.column_names,
+        workers
+    )
+
+    before = table.nbytes
+    for name, old, new in zip(table.column_names, table.columns, columns):
+        if old.type != new.type:
+            log.write('Compacted column {0}: {1} ({2}) -> {3} ({4})'.format(
+                name, old.type, __format_size(old.nbytes), __get_type_name(new.type), __format_size(new.nbytes)
+            ))
+    table = pa.Table.from_arrays(columns, names=table.column_names)
+    log.write('Compacted dataset from {0} to {1}'.format(__format_size(before), __format_size(table.nbytes)))
+    return table
+
+
+def get_integer_type(minimum: int, maximum: int) -> pa.DataType:
+    for integer_type in INTEGER_TYPES:
+        bits = integer_type.bit_width - 1
+        if -(1 << bits) <= minimum and maximum < (1 << bits):
+            return integer_type
+    return pa.int64()
+
+
+"""
+Private helper functions
+"""
+
+
+def __compact_column(column: pa.ChunkedArray, categorical: bool) -> pa.ChunkedArray:
+    if pa.types.is_integer(column.type) and column.type.bit_width > 8:
+        limits = pc.min_max(column)
+        minimum, maximum = limits['min'].as_py() or 0, limits['max'].as_py() or 0
+        integer_type = get_integer_type(minimum, maximum)
+        if integer_type.bit_width < column.type.bit_width:
+            return column.cast(integer_type)
+        return column
+
+    if pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+        distinct = pc.count_distinct(column).as_py()
+        if categorical or distinct <= len(column) * DICTIONARY_CARDINALITY_RATIO:
+            index_type = get_integer_type(0, max(distinct - 1, 0))
+            return pc.dictionary_encode(column).cast(pa.dictionary(index_type, column.type))
+    return column
+
+
+def __get_type_name(data_type: pa.DataType) -> str:
+    if pa.types.is_dictionary(data_type):
+        return 'dictionary<{0}, {1}>'.format(data_type.value_type, data_type.index_type)
+    return str(data_type)
+
+
+def __format_size(size: int) -> str:
+    if size < 1024 * 1024:
+        return '{0:.1f} KB'.format(size / 1024)
+    return '{0:.1f} MB'.format(size / 1024 ** 2)
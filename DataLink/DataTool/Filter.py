@@ -1,16 +1,26 @@
 import pandas as pd
 import pyarrow as pa
+import pyarrow.compute as pc
 
 from enum import IntEnum
-from typing import Any
-from dataclasses import dataclass
+from typing import Any, Union
+from dataclasses import dataclass, field
 
 
 class ComparisonFlag(IntEnum):
     SAME = 1
     LESS = 2
     MORE = 4
-    BETWEEN = 5
+    BETWEEN = 8
+
+
+# Kernels of the ordered comparisons by the sum of their flags
+ORDER_KERNELS = {
+    int(ComparisonFlag.MORE): pc.greater,
+    int(ComparisonFlag.LESS): pc.less,
+    int(ComparisonFlag.SAME + ComparisonFlag.MORE): pc.greater_equal,
+    int(ComparisonFlag.SAME + ComparisonFlag.LESS): pc.less_equal
+}
 
 
 @dataclass
@@ -27,59 +37,225 @@ class FilterInstruction:
         self.value = value
 
 
+class FilterExpression:
+    """ Node of a compiled filter. evaluate returns one boolean per row of data (a DataFrame or an Arrow table) as a
+    ChunkedArray, null where the answer depends on a missing value, which counts as no match once the whole tree has
+    been evaluated.
+    """
+    def evaluate(self, data: Union[pd.DataFrame, pa.Table]) -> pa.ChunkedArray:
+        raise NotImplementedError
+
+
+@dataclass
+class Predicate(FilterExpression):
+    """ One comparison of a column with a value, evaluated by a single compute kernel on its Arrow buffers """
+    column: str
+    flag: int
+    value: Any
+
+    def evaluate(self, data: Union[pd.DataFrame, pa.Table]) -> pa.ChunkedArray:
+        return compare(get_column(data, self.column), self.flag, self.value)
+
+
+@dataclass
+class And(FilterExpression):
+    """ Rows matching every child. Children after the first that leaves no row matching are not evaluated. """
+    children: list = field(default_factory=list)
+
+    def evaluate(self, data: Union[pd.DataFrame, pa.Table]) -> pa.ChunkedArray:
+        output = None
+        for child in self.children:
+            result = child.evaluate(data)
+            output = result if output is None else pc.and_kleene(output, result)
+            if not pc.any(output).as_py():
+                break
+        return output if output is not None else get_constant(data, True)
+
+
+@dataclass
+class Or(FilterExpression):
+    """ Rows matching any child. Children after the first that leaves every row matching are not evaluated. """
+    children: list = field(default_factory=list)
+
+    def evaluate(self, data: Union[pd.DataFrame, pa.Table]) -> pa.ChunkedArray:
+        output = None
+        for child in self.children:
+            result = child.evaluate(data)
+            output = result if output is None else pc.or_kleene(output, result)
+            if output.null_count == 0 and pc.all(output).as_py():
+                break
+        return output if output is not None else get_constant(data, False)
+
+
+@dataclass
+class Not(FilterExpression):
+    """ Rows not matching child. A row whose match is unknown does not match child, so it matches Not. """
+    child: FilterExpression
+
+    def evaluate(self, data: Union[pd.DataFrame, pa.Table]) -> pa.ChunkedArray:
+        return pc.invert(fill_unknown(self.child.evaluate(data)))
+
+
+def compile_filters(filter_instructions: list) -> FilterExpression:
+    """ The rows matching any of filter_instructions, as an expression tree """
+    return __any_of([compile_instruction(instruction) for instruction in filter_instructions])
+
+
+def compile_instruction(instruction: FilterInstruction) -> FilterExpression:
+    """ The rows where any column of instruction matches its comparison, as an expression tree. A list of values
+    compared as SAME becomes one membership test per column, and BETWEEN the pair of bounds [lower, upper].
+    """
+    value = instruction.value
+    if instruction.flag == int(ComparisonFlag.SAME) and isinstance(value, (list, tuple, set, frozenset)):
+        value = get_value_set(value)
+
+    predicates = []
+    for column_name in instruction.columns:
+        if instruction.flag == int(ComparisonFlag.BETWEEN):
+            predicates.append(And([
+                Predicate(column_name, int(ComparisonFlag.SAME + ComparisonFlag.MORE), value[0]),
+                Predicate(column_name, int(ComparisonFlag.SAME + ComparisonFlag.LESS), value[1])
+            ]))
+        elif instruction.flag == int(ComparisonFlag.SAME) or instruction.flag in ORDER_KERNELS:
+            predicates.append(Predicate(column_name, instruction.flag, value))
+    return __any_of(predicates)
+
+
+def evaluate_filter(data: Union[pd.DataFrame, pa.Table], expression: FilterExpression) -> pa.BooleanArray:
+    """ The rows of data matching expression as a bit-packed boolean array without nulls """
+    return fill_unknown(expression.evaluate(data)).combine_chunks()
+
+
+def fill_unknown(selection: pa.ChunkedArray) -> pa.ChunkedArray:
+    """ selection with its nulls counted as False. Null slots are cleared by ANDing the value bits with the validity
+    bits, then the validity bitmap is dropped, which is several times faster than fill_null.
+    """
+    if selection.null_count == 0:
+        return selection
+    chunks = []
+    for chunk in selection.chunks:
+        if chunk.null_count > 0:
+            chunk = pc.and_(chunk, pc.is_valid(chunk))
+            chunk = pa.Array.from_buffers(pa.bool_(), len(chunk), [None, chunk.buffers()[1]], 0, chunk.offset)
+        chunks.append(chunk)
+    return pa.chunked_array(chunks, type=pa.bool_())
+
+
 def filter_data_by(dataframe: pd.DataFrame, filter_instructions: list) -> pd.Series:
-    output = pd.Series([False] * len(dataframe.axes[0]))
-    for instruction in filter_instructions:
-        output = output | filter_by(dataframe, instruction)
-    return output
+    return __to_series(evaluate_filter(dataframe, compile_filters(filter_instructions)), dataframe.index)
 
 
 def filter_by(dataframe: pd.DataFrame, instruction: FilterInstruction) -> pd.Series:
-    output = pd.Series([False] * len(dataframe.axes[0]))
+    return __to_series(evaluate_filter(dataframe, compile_instruction(instruction)), dataframe.index)
+
+
+def compare(column: pa.ChunkedArray, flag: int, value: Any) -> pa.ChunkedArray:
+    """ column compared with value, null where column is missing. Comparing with a missing value matches the missing
+    rows for comparisons that include SAME and no row otherwise. A value of another type than the column never
+    equals it, as with ==, but cannot be ordered against it.
+    """
+    value = coerce_value(column.type, value)
+    if isinstance(value, pa.Array):
+        try:
+            return pc.is_in(column, value_set=value, skip_nulls=False)
+        except (pa.ArrowTypeError, pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            # Values of another type never equal the column's values, as with ==, but a missing value still matches
+            return pc.and_(pc.is_null(column), value.null_count > 0)
+    if value is None or value is pd.NA:
+        return pc.is_null(column) if flag & int(ComparisonFlag.SAME) else pc.and_(pc.is_null(column), False)
+
+    if flag == int(ComparisonFlag.SAME):
+        try:
+            return pc.equal(column, value)
+        except (pa.ArrowTypeError, pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            return pc.and_(pc.is_valid(column), False)
+    try:
+        return ORDER_KERNELS[flag](column, value)
+    except (pa.ArrowTypeError, pa.ArrowInvalid, pa.ArrowNotImplementedError) as ex:
+        raise TypeError('Cannot compare {0} values with {1!r}: {2}'.format(column.type, value, ex)) from None
+
+
+def coerce_value(data_type: pa.DataType, value: Any) -> Any:
+    """ value converted to data_type when it is text (or a set of text values) and the column is not, as filters
+    entered in the filter panel hold every value as text. Text that does not convert is returned as is.
+    """
+    if pa.types.is_dictionary(data_type):
+        data_type = data_type.value_type
+    if __is_text(data_type):
+        return value
+    try:
+        if isinstance(value, str):
+            return pa.scalar(value).cast(data_type)
+        if isinstance(value, pa.Array) and __is_text(value.type):
+            return value.cast(data_type)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        pass
+    return value
+
+
+def get_column(data: Union[pd.DataFrame, pa.Table], column_name: str) -> pa.ChunkedArray:
+    """ A column of data as Arrow. Arrow backed DataFrame columns hand over their buffers without a copy. """
+    if isinstance(data, pa.Table):
+        return data.column(column_name)
+    column = data[column_name]
+    if hasattr(column.array, '__arrow_array__'):
+        array = column.array.__arrow_array__()
+    else:
+        array = pa.array(column, from_pandas=True)
+    return array if isinstance(array, pa.ChunkedArray) else pa.chunked_array([array])
+
+
+def get_constant(data: Union[pd.DataFrame, pa.Table], value: bool) -> pa.ChunkedArray:
+    rows = data.num_rows if isinstance(data, pa.Table) else len(data)
+    return pa.chunked_array([pa.repeat(pa.scalar(value), rows)], type=pa.bool_())
 
-    for column_name in instruction.columns:
-        column = pd.Series(dataframe[column_name])
-        value = instruction.value
-        if instruction.flag == int(ComparisonFlag.SAME):
-            output = output | is_the_same(column, value)
-        elif instruction.flag == int(ComparisonFlag.MORE):
-            output = output | is_more(column, value)
-        elif instruction.flag == int(ComparisonFlag.LESS):
-            output = output | is_less(column, value)
-        elif instruction.flag == int(ComparisonFlag.SAME + ComparisonFlag.MORE):
-            output = output | is_the_same_or_more(column, value)
-        elif instruction.flag == int(ComparisonFlag.SAME + ComparisonFlag.LESS):
-            output = output | is_the_same_or_less(column, value)
-        elif instruction.flag == int(ComparisonFlag.BETWEEN):
-            output = output | (is_the_same_or_more(column, value[0]) & is_the_same_or_less(column, value[1]))
-        else:
-            pass
-    return output
+
+def get_value_set(values) -> pa.Array:
+    """ Distinct values for is_in, built once per filter instruction. pd.NA in values matches missing rows. """
+    return pc.unique(pa.array(list(values), from_pandas=True))
 
 
 def is_the_same(column: pd.Series, value: Any) -> pd.Series:
-    if value is pd.NA:
-        return column.isna().convert_dtypes(dtype_backend='pyarrow')
-    output = column == value
-    output.replace(pd.NA, False, inplace=True)
-    return output
+    return __compare_series(column, int(ComparisonFlag.SAME), value)
+
+
+def is_in(column: pd.Series, value_set: pa.Array) -> pd.Series:
+    return __compare_series(column, int(ComparisonFlag.SAME), value_set)
 
 
 def is_more(column: pd.Series, value: Any) -> pd.Series:
-    output = column > value
-    output.replace(pd.NA, False, inplace=True)
-    return output
+    return __compare_series(column, int(ComparisonFlag.MORE), value)
 
 
 def is_less(column: pd.Series, value: Any) -> pd.Series:
-    output = column < value
-    output.replace(pd.NA, False, inplace=True)
-    return output
+    return __compare_series(column, int(ComparisonFlag.LESS), value)
 
 
 def is_the_same_or_more(column: pd.Series, value: Any) -> pd.Series:
-    return is_the_same(column, value) | is_more(column, value)
+    return __compare_series(column, int(ComparisonFlag.SAME + ComparisonFlag.MORE), value)
 
 
 def is_the_same_or_less(column: pd.Series, value: Any) -> pd.Series:
-    return is_the_same(column, value) | is_less(column, value)
+    return __compare_series(column, int(ComparisonFlag.SAME + ComparisonFlag.LESS), value)
+
+
+"""
+Private helper functions
+"""
+
+
+def __any_of(children: list) -> FilterExpression:
+    return children[0] if len(children) == 1 else Or(children)
+
+
+def __is_text(data_type: pa.DataType) -> bool:
+    return pa.types.is_string(data_type) or pa.types.is_large_string(data_type)
+
+
+def __compare_series(column: pd.Series, flag: int, value: Any) -> pd.Series:
+    frame = pd.DataFrame({'column': column})
+    return __to_series(evaluate_filter(frame, Predicate('column', flag, value)), column.index)
+
+
+def __to_series(selection: pa.BooleanArray, index: pd.Index) -> pd.Series:
+    return pd.Series(selection.to_numpy(zero_copy_only=False), index=index)
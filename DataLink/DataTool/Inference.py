@@ -0,0 +1,64 @@
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from DataLink.DataTool.Parallel import map_columns
+
+
+# Text columns are categorical when their sample holds at most CATEGORICAL_MAX_VALUES distinct values, and no more
+# than CATEGORICAL_CARDINALITY_RATIO distinct values per non-missing row
+CATEGORICAL_MAX_VALUES = 100
+CATEGORICAL_CARDINALITY_RATIO = 0.5
+CATEGORICAL_NA_FILL = 'Missing'
+TIME_FORMATS = ['%H:%M:%S', '%H:%M']
+# Candidate types are first tried on this many rows: a failed conversion is far slower than a successful one
+PROBE_ROWS = 64
+# Values with leading zeros are codes (ZIP codes, identifiers) that lose them when read as numbers
+LEADING_ZEROS = r'^[+-]?0[0-9]'
+
+
+def infer_column_types(sample: pa.Table, workers: int = 1) -> list:
+    """ Schema type and NA fill for every column of a sample of text columns, in column order.
+
+    Each column takes the first of integer, float, date and time that every non-missing sampled value parses as,
+    except that a column with a value with leading zeros is never numeric. Otherwise it is categorical or text
+    depending on its distinct count. Rows after the sample may not fit the inferred types, so the schema is a
+    starting point to review rather than a guarantee. Numeric, date and time columns keep missing
+    values as NA (their Arrow types are nullable); categorical columns with missing values fill them with an explicit
+    CATEGORICAL_NA_FILL category.
+    """
+    return map_columns(__infer_column_type, sample.columns, workers)
+
+
+"""
+Private helper functions
+"""
+
+
+def __infer_column_type(column: pa.ChunkedArray) -> tuple:
+    if column.null_count == len(column):
+        return 'text', 'NA'
+
+    candidates = [('date', pa.date32())]
+    if not pc.any(pc.match_substring_regex(column, LEADING_ZEROS)).as_py():
+        candidates = [('integer', pa.int64()), ('float', pa.float64())] + candidates
+    for type_name, data_type in candidates:
+        if __parses(column, lambda values: pc.cast(values, data_type)):
+            return type_name, 'NA'
+    for time_format in TIME_FORMATS:
+        if __parses(column, lambda values: pc.strptime(values, format=time_format, unit='s')):
+            return 'time', 'NA'
+
+    distinct = pc.count_distinct(column).as_py()
+    valid = len(column) - column.null_count
+    if distinct <= CATEGORICAL_MAX_VALUES and distinct <= valid * CATEGORICAL_CARDINALITY_RATIO:
+        return 'categorical', CATEGORICAL_NA_FILL if column.null_count > 0 else 'NA'
+    return 'text', 'NA'
+
+
+def __parses(column: pa.ChunkedArray, function) -> bool:
+    try:
+        function(column.slice(0, PROBE_ROWS))
+        function(column)
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        return False
+    return True
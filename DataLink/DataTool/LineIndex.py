@@ -0,0 +1,170 @@
+import pyarrow as pa
+import pyarrow.compute as pc
+
+import os
+
+from DataLink.DataTool.Progress import ImportProgress
+
+
+# Bump when the layout of stored line indexes changes
+LINE_INDEX_VERSION = 2
+LINE_INDEX_STRIDE = 1024
+LINE_INDEX_SUFFIX = '.lineindex'
+# Bytes scanned for line breaks at a time while an index is built
+SCAN_BLOCK_SIZE = 16 * 1024 * 1024
+
+
+class LineIndex:
+    """ Byte offsets of every stride-th row of a csv file, so any range of rows can be read without scanning the file
+    up to it.
+
+    The file is memory-mapped. Finding a row costs one lookup in offsets and a scan of at most stride rows, whatever
+    its position in the file. Rows are the records after the header: a line break inside a quoted value does not end a
+    row. A blank line is a row here, while the csv reader skips it.
+    """
+    def __init__(self, filepath: str, offsets: pa.Array, rows: int, stride: int = LINE_INDEX_STRIDE):
+        self.filepath = filepath
+        self.offsets = offsets
+        self.rows = rows
+        self.stride = stride
+        self.source = pa.memory_map(filepath)
+        self.size = self.source.size()
+
+    def get_offset(self, row: int) -> int:
+        """ Byte offset of the start of row, or the file size for rows past the end """
+        if row >= self.rows:
+            return self.size
+        block, skip = divmod(row, self.stride)
+        begin = self.offsets[block].as_py()
+        if skip == 0:
+            return begin
+        end = self.offsets[block + 1].as_py() if block + 1 < len(self.offsets) else self.size
+        return begin + find_row_breaks(self.source, begin, end)[0][skip - 1].as_py() + 1
+
+    def get_range(self, start: int, rows: int) -> tuple:
+        """ Byte range (begin, end) holding rows start to start + rows """
+        return self.get_offset(start), self.get_offset(min(start + rows, self.rows))
+
+    def read(self, begin: int, end: int) -> pa.Buffer:
+        """ The bytes from begin to end, sliced from the mapped file without copying """
+        self.source.seek(begin)
+        return self.source.read_buffer(end - begin)
+
+    def close(self) -> None:
+        self.source.close()
+
+
+def open_line_index(filepath: str, stride: int = LINE_INDEX_STRIDE, progress: ImportProgress = None) -> LineIndex:
+    """ The line index of a csv file, read from beside the file if it was stored there for the file's current size and
+    modification time, otherwise built (reporting the bytes scanned to progress) and stored there when possible.
+    """
+    stat = os.stat(filepath)
+    index_path = get_index_path(filepath)
+    line_index = __load_line_index(filepath, index_path, stat, stride)
+    if line_index is None:
+        line_index = build_line_index(filepath, stride, progress)
+        try:
+            __store_line_index(line_index, index_path, stat)
+        except OSError:
+            pass
+    return line_index
+
+
+def build_line_index(filepath: str, stride: int = LINE_INDEX_STRIDE, progress: ImportProgress = None) -> LineIndex:
+    offsets = []
+    rows = 0
+    with pa.memory_map(filepath) as source:
+        size = source.size()
+        header, _ = find_row_breaks(source, 0, min(size, SCAN_BLOCK_SIZE))
+        begin = header[0].as_py() + 1 if len(header) > 0 else size
+        if begin < size:
+            offsets.append(pa.array([begin], pa.int64()))
+            rows = 1
+
+        in_quotes = False
+        for block_begin in range(begin, size, SCAN_BLOCK_SIZE):
+            block_end = min(block_begin + SCAN_BLOCK_SIZE, size)
+            breaks, in_quotes = find_row_breaks(source, block_begin, block_end, in_quotes)
+            starts = pc.add(breaks.cast(pa.int64()), block_begin + 1)
+            if block_end == size and len(starts) > 0 and starts[-1].as_py() == size:
+                starts = starts[:-1]
+            offsets.append(starts[(-rows) % stride::stride])
+            rows += len(starts)
+            if progress is not None:
+                progress.update(bytes_read=block_end)
+
+    offsets = pa.concat_arrays(offsets) if offsets else pa.array([], pa.int64())
+    return LineIndex(filepath, offsets, rows, stride)
+
+
+def get_index_path(filepath: str) -> str:
+    return filepath + LINE_INDEX_SUFFIX
+
+
+def find_row_breaks(source: pa.NativeFile, begin: int, end: int, in_quotes: bool = False) -> tuple:
+    """ Positions of the line breaks from begin to end (relative to begin) that end a row, and whether end is inside a
+    quoted value. in_quotes is whether begin is. A line break ends a row unless an odd number of quotes precede it in
+    the row, which also holds for quotes escaped by doubling them.
+    """
+    source.seek(begin)
+    buffer = source.read_buffer(end - begin)
+    data = pa.Array.from_buffers(pa.uint8(), len(buffer), [None, buffer])
+    breaks = pc.indices_nonzero(pc.equal(data, ord('\n')))
+    quotes = pc.indices_nonzero(pc.equal(data, ord('"')))
+    if len(quotes) == 0:
+        return (breaks[:0] if in_quotes else breaks), in_quotes
+
+    # Quotes before each line break, counted over the breaks and quotes merged in file order
+    positions = pa.concat_arrays([breaks, quotes])
+    is_quote = pa.concat_arrays([
+        pa.repeat(pa.scalar(0, pa.int64()), len(breaks)), pa.repeat(pa.scalar(1, pa.int64()), len(quotes))
+    ])
+    order = pc.sort_indices(positions)
+    is_quote = pc.take(is_quote, order)
+    quoted = pc.equal(pc.bit_wise_and(pc.cumulative_sum(is_quote), 1), 0 if in_quotes else 1)
+    row_breaks = pc.filter(pc.take(positions, order), pc.and_(pc.equal(is_quote, 0), pc.invert(quoted)))
+    return row_breaks, in_quotes != (len(quotes) % 2 == 1)
+
+
+"""
+Private helper functions
+"""
+
+
+def __load_line_index(filepath: str, index_path: str, stat: os.stat_result, stride: int):
+    try:
+        with pa.OSFile(index_path) as source:
+            table = pa.ipc.open_file(source).read_all()
+    except (OSError, pa.ArrowInvalid):
+        return None
+
+    metadata = table.schema.metadata or {}
+    expected = {
+        b'version': LINE_INDEX_VERSION,
+        b'size': stat.st_size,
+        b'modified': stat.st_mtime_ns,
+        b'stride': stride
+    }
+    if any(metadata.get(key) != str(value).encode() for key, value in expected.items()):
+        return None
+    return LineIndex(filepath, table.column('offset').combine_chunks(), int(metadata[b'rows']), stride)
+
+
+def __store_line_index(line_index: LineIndex, index_path: str, stat: os.stat_result) -> None:
+    metadata = {
+        'version': str(LINE_INDEX_VERSION),
+        'size': str(stat.st_size),
+        'modified': str(stat.st_mtime_ns),
+        'stride': str(line_index.stride),
+        'rows': str(line_index.rows)
+    }
+    table = pa.table({'offset': line_index.offsets}).replace_schema_metadata(metadata)
+    temporary_path = '{0}.{1}.tmp'.format(index_path, os.getpid())
+    try:
+        with pa.OSFile(temporary_path, 'wb') as file:
+            with pa.ipc.new_file(file, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(temporary_path, index_path)
+    finally:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
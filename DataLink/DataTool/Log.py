@@ -0,0 +1,31 @@
+import sys
+import threading
+
+from typing import Any
+
+
+class ImportLog:
+    """ Message channel of a single import, passed through read_data and the validation, fill and compaction stages
+    instead of redirecting sys.stdout.
+
+    write may be called from any thread. Messages are printed to sink, any object with a write(string) method such as
+    a file or the GUI Logger, one complete line per call. Without a sink they are printed to the current sys.stdout.
+    """
+    def __init__(self, name: str = '', sink: Any = None):
+        self.name = name
+        self.sink = sink
+        self.messages = 0
+        self._lock = threading.Lock()
+
+    def write(self, message: str) -> None:
+        with self._lock:
+            self.messages += 1
+            sink = sys.stdout if self.sink is None else self.sink
+            sink.write(message + '\n')
+
+
+def get_import_log(log: Any = None, name: str = '') -> ImportLog:
+    """ log itself when it is an ImportLog, otherwise a new ImportLog writing to log (or to sys.stdout if None) """
+    if isinstance(log, ImportLog):
+        return log
+    return ImportLog(name, log)
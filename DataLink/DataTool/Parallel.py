@@ -0,0 +1,31 @@
+import os
+
+from typing import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+
+
+def get_worker_count(workers: int = None) -> int:
+    """ None selects one worker per available core """
+    if workers is None:
+        return get_core_count()
+    return max(int(workers), 1)
+
+
+def get_core_count() -> int:
+    """ The cores this process may run on, which can be fewer than the machine has """
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+
+def map_columns(function: Callable, items: Iterable, workers: int = 1) -> list:
+    """ Applies function to every item, in a thread pool when more than one worker is requested.
+
+    Intended for per-column pyarrow.compute work, which releases the GIL. Results keep the order of items.
+    """
+    items = list(items)
+    workers = min(get_worker_count(workers), len(items))
+    if workers <= 1:
+        return [function(item) for item in items]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(function, items))
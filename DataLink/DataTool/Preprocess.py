@@ -1,8 +1,45 @@
 import pandas as pd
 import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.compute as pc
 
 import re
-import sys
+import os
+import csv
+import itertools
+
+from typing import Union, Any, Callable
+from functools import lru_cache
+
+from DataLink.DataTool.Validation import ValidationPlan, compile_validation, apply_validation
+from DataLink.DataTool.Parallel import map_columns
+from DataLink.DataTool.Compaction import compact_table
+from DataLink.DataTool.Inference import infer_column_types
+from DataLink.DataTool.Progress import ImportProgress
+from DataLink.DataTool.Log import ImportLog, get_import_log
+from DataLink.DataTool.Report import ValidationReport
+from DataLink.DataTool.Preview import ImportPreview
+from DataLink.DataTool.LineIndex import LineIndex
+
+
+DEFAULT_MEMORY_LIMIT = 256 * 1024 * 1024
+DEFAULT_SAMPLE_ROWS = 10000
+# Bytes parsed for the first batch of a previewed streaming import
+PREVIEW_BLOCK_SIZE = 1024 * 1024
+
+# Null markers recognised by pandas' pyarrow csv engine, reproduced so the streaming reader parses identically
+NA_VALUES = [
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA',
+    'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'
+]
+
+
+class ColumnParseError(ValueError):
+    """ pyarrow could not convert the typed csv column at position column, see error """
+    def __init__(self, column: int, error: pa.ArrowInvalid):
+        super().__init__(str(error))
+        self.column = column
+        self.error = error
 
 
 def version():
@@ -48,36 +85,129 @@ def convert_validation(validation_data: pd.DataFrame) -> dict:
     return output
 
 
-def read_data(filepath: str, config: pd.DataFrame, validation: dict = None, logger: object = None) -> pd.DataFrame:
-    old_stdout = sys.stdout
-    if logger:
-        sys.stdout = logger
-
-    dataset = pd.read_csv(filepath, dtype='string[pyarrow]', engine='pyarrow', dtype_backend='pyarrow')
-    dataset = dataset.apply(lambda x: x.str.strip())
-    dataset = dataset.apply(lambda x: x.replace(r'^\s*$', pd.NA, regex=True))
-
-    if validation:
-        dataset = __validate_data(dataset, validation)
-    dataset = __fill_missing(dataset, config)
-
-    if logger:
-        sys.stdout = old_stdout
-
-    return dataset.astype(__get_type_conversion(config))
-
-
-def read_csv(filepath: str) -> pd.DataFrame:
-    dataset = pd.read_csv(filepath, dtype='string[pyarrow]', engine='pyarrow', dtype_backend='pyarrow')
-    dataset = dataset.apply(lambda x: x.str.strip())
-    dataset = dataset.apply(lambda x: x.replace(r'^\s*$', pd.NA, regex=True))
-    return dataset
-
-
-def create_schema(columns: list) -> pd.DataFrame:
+def read_validation_plan(filepath: str) -> ValidationPlan:
+    """ Compiled validation plan for a validation file, cached until the file is modified """
+    stat = os.stat(filepath)
+    return __read_validation_plan(os.path.abspath(filepath), stat.st_mtime_ns, stat.st_size)
+
+
+def read_data(
+        filepath: str,
+        config: pd.DataFrame,
+        validation: Union[dict, ValidationPlan] = None,
+        logger: Any = None,
+        streaming: bool = False,
+        memory_limit: int = DEFAULT_MEMORY_LIMIT,
+        workers: int = 1,
+        compact_types: bool = False,
+        progress: ImportProgress = None,
+        report: ValidationReport = None,
+        preview: ImportPreview = None
+) -> pd.DataFrame:
+    """ Reads, validates, fills and types a csv dataset.
+
+    streaming processes the file one record batch at a time, with batches sized from memory_limit (bytes). workers
+    is the number of threads used to validate, fill and cast independent columns (None uses every core).
+    compact_types narrows integer columns and dictionary encodes categorical and low cardinality text columns once
+    the whole dataset is read, and logs the memory saved per column. progress receives the bytes read, batches
+    validated and current column, and cancelling it stops the import with ImportCancelled. Messages go to logger, an
+    ImportLog or any object with a write method, and to sys.stdout when it is None. report collects the violation
+    counts, top offending values and sample offending rows of every validation rule, and is reset when a column that
+    fails to parse is read as text and the import starts over. preview receives every batch as soon as it is
+    validated, filled and cast; a streamed import then parses only the first PREVIEW_BLOCK_SIZE bytes for its first
+    batch so the first rows arrive without waiting for a full block.
+    """
+    log = get_import_log(logger, filepath)
+    if isinstance(validation, dict):
+        validation = compile_validation(validation)
+
+    columns = __read_header(filepath)
+    column_types = __get_column_types(columns, config, validation)
+    while True:
+        try:
+            return __read_data(
+                filepath,
+                config,
+                validation,
+                column_types,
+                streaming,
+                memory_limit,
+                workers,
+                compact_types,
+                progress,
+                log,
+                report,
+                preview
+            )
+        except ColumnParseError as ex:
+            column_types = __demote_failed_column(columns, column_types, ex, log)
+            if report is not None:
+                report.reset()
+
+
+def read_csv(filepath: str, workers: int = 1) -> pd.DataFrame:
+    columns = __read_header(filepath)
+    column_types = {column: pa.string() for column in columns}
+    table = pa_csv.read_csv(filepath, convert_options=__get_convert_options(column_types))
+    return normalize_text(table, workers).to_pandas(types_mapper=__type_mapper)
+
+
+def normalize_text(table: pa.Table, workers: int = 1) -> pa.Table:
+    """ Trims surrounding whitespace from every string column and turns the resulting empty strings into nulls.
+
+    Columns are processed independently (concurrently when workers > 1). A column without surrounding whitespace or
+    blanks is returned as is, so its buffers are shared with the input table rather than copied.
+    """
+    columns = map_columns(__normalize_column, table.columns, workers)
+    return pa.Table.from_arrays(columns, schema=table.schema)
+
+
+def read_sample(filepath: str, sample_rows: int = DEFAULT_SAMPLE_ROWS, workers: int = 1) -> pa.Table:
+    """ The first sample_rows rows of a csv file as normalized text. Only the blocks holding them are read. """
+    columns = __read_header(filepath)
+    reader = pa_csv.open_csv(
+        filepath,
+        read_options=pa_csv.ReadOptions(block_size=__get_sample_block_size(filepath, sample_rows)),
+        convert_options=__get_convert_options({column: pa.string() for column in columns})
+    )
+    batches = []
+    rows = 0
+    for batch in reader:
+        batches.append(batch)
+        rows += batch.num_rows
+        if rows >= sample_rows:
+            break
+    table = pa.Table.from_batches(batches, schema=reader.schema).slice(0, sample_rows).combine_chunks()
+    return normalize_text(table, workers)
+
+
+def read_rows(filepath: str, line_index: LineIndex, start: int, rows: int, workers: int = 1) -> pa.Table:
+    """ Rows start to start + rows of a csv file as normalized text, parsed from the byte range line_index finds for
+    them, so the cost does not depend on where the rows are in the file.
+    """
+    columns = __read_header(filepath)
+    begin, end = line_index.get_range(start, rows)
+    if begin >= end:
+        return pa.table({column: pa.array([], pa.string()) for column in columns})
+    table = pa_csv.read_csv(
+        pa.BufferReader(line_index.read(begin, end)),
+        read_options=pa_csv.ReadOptions(column_names=columns, block_size=end - begin + 1),
+        convert_options=__get_convert_options({column: pa.string() for column in columns})
+    )
+    return normalize_text(table, workers)
+
+
+def create_schema(columns: list, sample: pa.Table = None, workers: int = 1) -> pd.DataFrame:
+    """ Schema for the columns. Types and NA fills are inferred from sample (see read_sample) when given, and are
+    text with NA fills otherwise. Sampled columns are inferred concurrently when workers > 1.
+    """
     type_info = {'ColNames': 'string[pyarrow]', 'ColTypes': 'string[pyarrow]', 'NAFill': 'string[pyarrow]'}
     col_types = ['text'] * len(columns)
     na_fill = ['NA'] * len(columns)
+    if sample is not None:
+        inferred = dict(zip(sample.column_names, infer_column_types(sample, workers)))
+        col_types = [inferred.get(column, ('text', 'NA'))[0] for column in columns]
+        na_fill = [inferred.get(column, ('text', 'NA'))[1] for column in columns]
     config = pd.DataFrame({'ColNames': columns, 'ColTypes': col_types, 'NAFill': na_fill}, dtype='string[pyarrow]')
     print(config.dtypes)
     return config.astype(type_info)
@@ -88,156 +218,323 @@ Private helper functions
 """
 
 
-def __get_type_conversion(config: pd.DataFrame) -> dict:
-    config.loc[config.ColTypes == 'integer', 'ColTypes'] = 'int64[pyarrow]'
-    config.loc[config.ColTypes == 'float', 'ColTypes'] = 'float64[pyarrow]'
-    config.loc[config.ColTypes == 'categorical', 'ColTypes'] = 'string[pyarrow]'
-    config.loc[config.ColTypes == 'text', 'ColTypes'] = 'string[pyarrow]'
-    config.loc[config.ColTypes == 'date', 'ColTypes'] = 'date64[pyarrow]'
-    config.loc[config.ColTypes == 'time', 'ColTypes'] = 'time64[us][pyarrow]'
-    return pd.Series(config.ColTypes.values, index=config.ColNames).to_dict()
-
+@lru_cache(maxsize=16)
+def __read_validation_plan(filepath: str, modified: int, size: int) -> ValidationPlan:
+    return compile_validation(convert_validation(read_validation(filepath)))
+
+
+def __read_data(
+        filepath: str,
+        config: pd.DataFrame,
+        validation: ValidationPlan,
+        column_types: dict,
+        streaming: bool,
+        memory_limit: int,
+        workers: int,
+        compact_types: bool,
+        progress: ImportProgress,
+        log: ImportLog,
+        report: ValidationReport,
+        preview: ImportPreview
+) -> pd.DataFrame:
+    if streaming:
+        return __read_data_streaming(
+            filepath,
+            config,
+            validation,
+            column_types,
+            memory_limit,
+            workers,
+            compact_types,
+            progress,
+            log,
+            report,
+            preview
+        )
+
+    if preview is not None:
+        preview.start()
+    table = __parse(pa_csv.read_csv, filepath, convert_options=__get_convert_options(column_types))
+    if progress is not None:
+        progress.update(bytes_read=os.path.getsize(filepath), batches=0)
+    rows_read = table.num_rows
+    table, keep = __prepare_table(table, config, validation, workers, progress, log, report, 0)
+    if preview is not None:
+        preview.add(table, rows_read)
+    if progress is not None:
+        progress.update(batches=1)
+    return __to_dataset([table], [__kept_rows(keep, 0, table.num_rows)], config, compact_types, workers, log)
+
+
+def __read_data_streaming(
+        filepath: str,
+        config: pd.DataFrame,
+        validation: ValidationPlan,
+        column_types: dict,
+        memory_limit: int,
+        workers: int,
+        compact_types: bool,
+        progress: ImportProgress,
+        log: ImportLog,
+        report: ValidationReport,
+        preview: ImportPreview
+) -> pd.DataFrame:
+    """ Runs the read_data pipeline one record batch at a time so only the typed output is held in full.
+
+    The block size is derived from memory_limit: every batch is held at most a few times over (raw strings, the
+    trimmed copy, and the validated copy) before it is cast down to its final types. With a preview the first batch
+    is read from the complete rows of the first PREVIEW_BLOCK_SIZE bytes and the reader continues after them.
+    """
+    if preview is not None:
+        preview.start()
+
+    tables = []
+    rows = []
+    offset = 0
+    with pa.OSFile(filepath) as source:
+        head = __read_head(source, column_types) if preview is not None else None
+        if head is None:
+            reader = __parse(__open_reader, source, column_types, memory_limit)
+            batches = reader
+        else:
+            reader = None
+            batches = itertools.chain(head.to_batches(), __read_rest(source, column_types, memory_limit, head))
+
+        for batch_number, batch in enumerate(__parse_batches(batches)):
+            last_row = offset + batch.num_rows - 1
+            log.write('Processing batch {0} (rows {1} to {2})'.format(batch_number, offset, last_row))
+            if progress is not None:
+                progress.update(bytes_read=source.tell(), batches=batch_number)
+            table, keep = __prepare_table(
+                pa.Table.from_batches([batch]), config, validation, workers, progress, log, report, offset
+            )
+            if preview is not None:
+                preview.add(table, batch.num_rows)
+            tables.append(table)
+            rows.append(__kept_rows(keep, offset, batch.num_rows))
+            offset += batch.num_rows
+        if progress is not None:
+            progress.update(bytes_read=source.tell(), batches=len(tables))
+
+    if len(tables) == 0:
+        table, keep = __prepare_table(reader.schema.empty_table(), config, None, workers, None, log, None, 0)
+        return __to_dataset([table], [__kept_rows(keep, 0, 0)], config, compact_types, workers, log)
+    return __to_dataset(tables, rows, config, compact_types, workers, log)
+
+
+def __read_head(source: pa.NativeFile, column_types: dict):
+    """ The complete rows in the first PREVIEW_BLOCK_SIZE bytes of source as a single batch table, leaving source
+    positioned after them. None, with source rewound, when that block does not hold a complete row after the header.
+    """
+    head = source.read(PREVIEW_BLOCK_SIZE)
+    end = head.rfind(b'\n') + 1
+    if end <= head.find(b'\n') + 1:
+        source.seek(0)
+        return None
+
+    source.seek(end)
+    table = __parse(
+        pa_csv.read_csv,
+        pa.BufferReader(head[:end]),
+        read_options=pa_csv.ReadOptions(block_size=PREVIEW_BLOCK_SIZE),
+        convert_options=__get_convert_options(column_types)
+    )
+    return table.combine_chunks()
+
+
+def __read_rest(source: pa.NativeFile, column_types: dict, memory_limit: int, head: pa.Table):
+    """ Batches of the rows after head. Opening a reader parses its first block, so it is only opened once the head
+    batch has been processed.
+    """
+    if source.tell() < source.size():
+        yield from __open_reader(source, column_types, memory_limit, head.column_names)
+
+
+def __open_reader(
+        source: pa.NativeFile,
+        column_types: dict,
+        memory_limit: int,
+        column_names: list = None
+) -> pa_csv.CSVStreamingReader:
+    return pa_csv.open_csv(
+        source,
+        read_options=pa_csv.ReadOptions(block_size=__get_block_size(memory_limit), column_names=column_names),
+        convert_options=__get_convert_options(column_types)
+    )
+
+
+def __prepare_table(
+        table: pa.Table,
+        config: pd.DataFrame,
+        validation: ValidationPlan,
+        workers: int,
+        progress: ImportProgress,
+        log: ImportLog,
+        report: ValidationReport,
+        row_offset: int
+) -> tuple:
+    table = normalize_text(table, workers)
+    keep = None
+    if validation:
+        table, keep = apply_validation(validation, table, workers, progress, log, report, row_offset)
+    table = __fill_and_cast(table, config, workers)
+    if keep is not None:
+        table = table.filter(keep)
+    return table, keep
+
+
+def __normalize_column(column: pa.ChunkedArray) -> pa.ChunkedArray:
+    if not (pa.types.is_string(column.type) or pa.types.is_large_string(column.type)):
+        return column
+
+    lengths = pc.binary_length(column)
+    trimmed = pc.utf8_trim_whitespace(column)
+    trimmed_lengths = pc.binary_length(trimmed)
+    if not pc.any(pc.not_equal(lengths, trimmed_lengths)).as_py():
+        trimmed, trimmed_lengths = column, lengths
+
+    blank = pc.equal(trimmed_lengths, 0)
+    if pc.any(blank).as_py():
+        return pc.if_else(blank, pa.scalar(None, type=column.type), trimmed)
+    return trimmed
+
+
+def __kept_rows(keep: pa.ChunkedArray, offset: int, num_rows: int) -> pd.Index:
+    if keep is None:
+        return pd.RangeIndex(offset, offset + num_rows)
+    return pd.Index(pc.indices_nonzero(keep).to_numpy().astype('int64') + offset)
+
+
+def __to_dataset(
+        tables: list,
+        rows: list,
+        config: pd.DataFrame,
+        compact_types: bool,
+        workers: int,
+        log: ImportLog
+) -> pd.DataFrame:
+    table = pa.concat_tables(tables)
+    if compact_types:
+        categorical = set(config.ColNames[config.ColTypes == 'categorical'])
+        table = compact_table(table, categorical, workers, log)
+    dataset = table.to_pandas(types_mapper=__type_mapper)
+    if all(isinstance(index, pd.RangeIndex) for index in rows):
+        dataset.index = pd.RangeIndex(0, len(dataset))
+    else:
+        dataset.index = rows[0].append(rows[1:])
+    return dataset
 
-def __fill_missing(dataset: pd.DataFrame, config: pd.DataFrame) -> pd.DataFrame:
-    replacement_values = pd.Series(config.NAFill.values, index=config.ColNames).to_dict()
 
-    for key, value in replacement_values.items():
-        if value == 'NA':
-            dataset.loc[dataset[key].isnull(), key] = pd.NA
+def __get_column_types(columns: list, config: pd.DataFrame, validation: ValidationPlan) -> dict:
+    """ Columns whose schema type has an Arrow equivalent are parsed straight into it, unless a string based
+    validation rule (character removal, numeric, value or date format checks) has to see the raw text first.
+    """
+    type_conversion = __get_type_conversion(config)
+    column_types = {}
+    for column in columns:
+        column_type = pd.api.types.pandas_dtype(type_conversion.get(column, 'string[pyarrow]'))
+        if isinstance(column_type, pd.ArrowDtype) and not (validation and validation.needs_text(column)):
+            column_types[column] = column_type.pyarrow_dtype
         else:
-            dataset.loc[dataset[key].isnull(), key] = str(value)
+            column_types[column] = pa.string()
+    return column_types
 
-    return dataset
 
+def __demote_failed_column(columns: list, column_types: dict, error: ColumnParseError, log: ImportLog) -> dict:
+    """ Re-reads the column pyarrow failed to convert (e.g. whitespace only cells) through the text path. A column
+    already read as text cannot fail to convert, so its error is re-raised.
+    """
+    column = columns[error.column] if error.column < len(columns) else None
+    if column is None or column_types[column] == pa.string():
+        raise error.error
+    log.write('Column {0} could not be parsed as {1}, reading it as text'.format(column, column_types[column]))
+    column_types = column_types.copy()
+    column_types[column] = pa.string()
+    return column_types
 
-def __validate_data(dataset: pd.DataFrame, validation_instruction: dict) -> pd.DataFrame:
-    for key, value in validation_instruction.items():
-        if value['Remove Characters']:
-            for character in value['Remove Characters']:
-                dataset[key] = __remove_character(dataset[key], character)
-        if value['Numeric Check']:
-            __check_numeric(dataset[key])
-            dataset[key] = __enforce_numeric(dataset[key])
-        if value['Bound Check']:
-            __check_bounds(dataset[key], value['Bound Check'][0], value['Bound Check'][1])
-            dataset[key] = __enforce_bounds(dataset[key], value['Bound Check'][0], value['Bound Check'][1])
-        if value['Value Check']:
-            __check_values(dataset[key], value['Value Check'])
-            dataset[key] = __enforce_values(dataset[key], value['Value Check'])
-        if value['Date Format Check']:
-            __check_date_format(dataset[key], value['Date Format Check'])
-            dataset[key] = __enforce_date_format(dataset[key], value['Date Format Check'])
-        if value['Remove Missing']:
-            dataset = __remove_missing(dataset, key)
 
-    return dataset
+def __parse(read: Callable, *args, **kwargs):
+    """ Calls read, which parses csv data, turning the errors pyarrow raises for a column it could not convert into
+    ColumnParseError. Every other error propagates as is.
+    """
+    try:
+        return read(*args, **kwargs)
+    except pa.ArrowInvalid as ex:
+        match = re.match(r'In CSV column #(\d+)', str(ex))
+        if match is None:
+            raise
+        raise ColumnParseError(int(match.group(1)), ex) from ex
 
 
-def __check_bounds(column: pd.Series, lower_bound: int, upper_bound: int):
-    column_copy = pd.to_numeric(column)
-    if column[(column_copy < lower_bound) | (column_copy > upper_bound)].shape[0] > 0:
-        print('Bounds check for column {0}'.format(column.name))
-        data = column[(column_copy < lower_bound) | (column_copy > upper_bound)].value_counts()
-        data.columns = ['count']
-        print('Distribution:', data.to_string())
-        print('Number of rows detected: {0}'.format(((column_copy < lower_bound) | (column_copy > upper_bound)).sum()))
-
-
-def __check_values(column: pd.Series, values: list):
-    selection = pd.Series(False, index=range(column.size), dtype='bool[pyarrow]')
-    for value in values:
-        selection = selection | (column == value)
-    if column.loc[~selection].shape[0] > 0:
-        print('Value check for column {0}'.format(column.name))
-        data = column.loc[~selection].value_counts()
-        data.columns = ['count']
-        print('Distribution:', data.to_string())
-        print('Number of rows detected: {0}'.format((~selection).sum()))
-
-
-def __check_numeric(column: pd.Series):
-    if column.loc[~column.str.isnumeric()].shape[0] > 0:
-        print('Numeric check for column {0}'.format(column.name))
-        data = column.loc[~column.str.isnumeric()].value_counts()
-        data.columns = ['count']
-        print('Distribution:', data.to_string())
-        print('Number of rows detected: {0}'.format((~column.str.isnumeric()).sum()))
-
-
-def __check_date_format(column: pd.Series, date_format: str):
-    selection = pd.isnull(pd.to_datetime(column, format=date_format, errors='coerce'))
-    if column.loc[selection].shape[0] > 0:
-        print('DateTime check for column {0}'.format(column.name))
-        data = column.loc[selection].value_counts()
-        data.columns = ['count']
-        print('Distribution:', data.to_string())
-        print('Number of rows detected: {0}'.format(selection.sum()))
-
-
-def __enforce_bounds(column: pd.Series, lower_bound: int, upper_bound: int) -> pd.Series:
-    column_copy = pd.to_numeric(column)
-    output = column.copy()
-    if column[(column_copy < lower_bound) | (column_copy > upper_bound)].shape[0] > 0:
-        print('Enforcing bounds check on column {0}'.format(column.name))
-        print('Number of rows converted to NA: {0}'.format(((column_copy < lower_bound) |
-                                                            (column_copy > upper_bound)).sum()))
-        output = column.copy()
-        if ((column_copy < lower_bound) | (column_copy > upper_bound)).sum() > 0:
-            output.loc[((column_copy < lower_bound) | (column_copy > upper_bound))] = pd.NA
-    return output
+def __parse_batches(batches):
+    """ The record batches of batches, read through __parse """
+    batches = iter(batches)
+    while True:
+        batch = __parse(next, batches, None)
+        if batch is None:
+            return
+        yield batch
 
 
-def __enforce_values(column: pd.Series, values: list) -> pd.Series:
-    selection = pd.Series(False, index=range(column.size), dtype='bool[pyarrow]')
-    for value in values:
-        selection = selection | (column == value)
-    output = column.copy()
-    if column.loc[~selection].shape[0] > 0:
-        print('Enforcing value check on column {0}'.format(column.name))
-        print('Number of rows converted to NA: {0}'.format((~selection).sum()))
-        if (~selection).sum() > 0:
-            output.loc[~selection] = pd.NA
-    return output
+def __get_convert_options(column_types: dict) -> pa_csv.ConvertOptions:
+    return pa_csv.ConvertOptions(column_types=column_types, null_values=NA_VALUES, strings_can_be_null=True)
 
 
-def __enforce_numeric(column: pd.Series) -> pd.Series:
-    output = column.copy()
-    if column.loc[~column.str.isnumeric()].shape[0] > 0:
-        print('Enforcing numeric check on column {0}'.format(column.name))
-        print('Number of rows converted to NA: {0}'.format((~column.str.isnumeric()).sum()))
-        if (~column.str.isnumeric()).sum() > 0:
-            output.loc[~column.str.isnumeric()] = pd.NA
-    return output
+def __read_header(filepath: str) -> list:
+    with open(filepath, newline='', encoding='utf-8') as file:
+        return next(csv.reader(file), [])
 
 
-def __enforce_date_format(column: pd.Series, date_format: str) -> pd.Series:
-    output = column.copy()
-    selection = pd.isnull(pd.to_datetime(column, format=date_format, errors='coerce'))
-    if column.loc[selection].shape[0] > 0:
-        print('Enforcing DateTime check on column {0}'.format(column.name))
-        print('Number of rows converted to NA: {0}'.format(selection.sum()))
-        if selection.sum() > 0:
-            output.loc[selection] = pd.NA
-    return output
+def __get_block_size(memory_limit: int) -> int:
+    return max(memory_limit // 8, 1024 * 1024)
 
 
-def __change_value(column: pd.Series, input_value, output_value) -> pd.Series:
-    selection = column == input_value
-    output = column.copy()
-    if selection.sum() > 0:
-        print('Changing entries with value {0} in column {1}'.format(input_value, column.name))
-        print('Number of rows converted to {0}: {1}'.format(output_value, selection.sum()))
-        output.loc[selection].copy = output_value
-    return output
+def __get_sample_block_size(filepath: str, sample_rows: int) -> int:
+    """ Block size expected to hold sample_rows rows, estimated from the row length in the first megabyte """
+    with open(filepath, 'rb') as file:
+        head = file.read(1024 * 1024)
+    row_size = len(head) / max(head.count(b'\n'), 1)
+    return int(min(max(row_size * sample_rows * 1.1, 1024 * 1024), DEFAULT_MEMORY_LIMIT // 4))
 
 
-def __remove_character(column: pd.Series, character: str):
-    if column.str.contains(character).sum() > 0:
-        print('Number of rows converted: {0}'.format(column.str.contains(character).sum()))
-    return column.strip(character)
+def __type_mapper(data_type: pa.DataType):
+    if pa.types.is_dictionary(data_type):
+        return None
+    if pa.types.is_string(data_type) or pa.types.is_large_string(data_type):
+        return pd.StringDtype('pyarrow')
+    return pd.ArrowDtype(data_type)
 
 
-def __remove_missing(dataset: pd.DataFrame, column: str):
-    if dataset[column].isnull().sum() > 0:
-        print('Removing {0} rows with missing values in column {1}'.format(dataset[column].isnull().sum(), column))
-    return dataset.drop(dataset[dataset[column].isnull()].index)
+def __get_type_conversion(config: pd.DataFrame) -> dict:
+    type_names = {
+        'integer': 'int64[pyarrow]',
+        'float': 'float64[pyarrow]',
+        'categorical': 'string[pyarrow]',
+        'text': 'string[pyarrow]',
+        'date': 'date64[pyarrow]',
+        'time': 'time64[us][pyarrow]'
+    }
+    return {name: type_names.get(col_type, col_type) for name, col_type in zip(config.ColNames, config.ColTypes)}
+
+
+def __fill_and_cast(table: pa.Table, config: pd.DataFrame, workers: int) -> pa.Table:
+    type_conversion = __get_type_conversion(config)
+    fill_values = dict(zip(config.ColNames, config.NAFill))
+    keys = list(type_conversion.keys())
+    columns = map_columns(
+        lambda key: __fill_and_cast_column(table.column(key), fill_values[key], type_conversion[key]),
+        keys,
+        workers
+    )
+    for key, column in zip(keys, columns):
+        table = table.set_column(table.schema.get_field_index(key), key, column)
+    return table
+
+
+def __fill_and_cast_column(column: pa.ChunkedArray, fill_value, type_name: str) -> pa.ChunkedArray:
+    if not (pd.isna(fill_value) or fill_value == 'NA'):
+        column = pc.fill_null(column, pa.scalar(str(fill_value)).cast(column.type))
+    column_type = pd.api.types.pandas_dtype(type_name)
+    if isinstance(column_type, pd.ArrowDtype) and column.type != column_type.pyarrow_dtype:
+        column = pc.cast(column, column_type.pyarrow_dtype)
+    return column
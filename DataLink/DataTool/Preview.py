@@ -0,0 +1,31 @@
+import pyarrow as pa
+
+from typing import Callable
+
+
+class ImportPreview:
+    """ Validated rows of a running import, handed to an observer one batch at a time as they become ready.
+
+    The import calls start before every read of the file (a typed parse that has to be retried starts over) and add
+    with every batch once it has been validated, filled and cast. callback(preview, table) runs on the importing
+    thread after each call, with table None on start so the observer can discard what it has shown.
+    """
+    def __init__(self, callback: Callable = None):
+        self.callback = callback
+        self.rows_read = 0
+        self.rows_kept = 0
+        self.batches = 0
+
+    def start(self) -> None:
+        self.rows_read = 0
+        self.rows_kept = 0
+        self.batches = 0
+        if self.callback is not None:
+            self.callback(self, None)
+
+    def add(self, table: pa.Table, rows_read: int) -> None:
+        self.rows_read += rows_read
+        self.rows_kept += table.num_rows
+        self.batches += 1
+        if self.callback is not None:
+            self.callback(self, table)
@@ -0,0 +1,46 @@
+import threading
+
+from typing import Callable
+
+
+class ImportCancelled(Exception):
+    """ Raised inside an import once its ImportProgress has been cancelled """
+
+
+class ImportProgress:
+    """ Progress of a running import, shared by the threads running it and the thread observing it.
+
+    The import reports the bytes it has read, the batches it has validated and the column it is working on through
+    update, which raises ImportCancelled once cancel has been called, so work stops at the next batch or column.
+    callback(progress) runs after every update on the reporting thread.
+    """
+    def __init__(self, total_bytes: int = 0, callback: Callable = None):
+        self.total_bytes = total_bytes
+        self.bytes_read = 0
+        self.batches = 0
+        self.column = ''
+        self.callback = callback
+        self._cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def update(self, bytes_read: int = None, batches: int = None, column: str = None) -> None:
+        if self.is_cancelled():
+            raise ImportCancelled()
+        if bytes_read is not None:
+            self.bytes_read = bytes_read
+        if batches is not None:
+            self.batches = batches
+        if column is not None:
+            self.column = column
+        if self.callback is not None:
+            self.callback(self)
+
+    def get_fraction(self) -> float:
+        if self.total_bytes <= 0:
+            return 0.0
+        return min(self.bytes_read / self.total_bytes, 1.0)
@@ -0,0 +1,89 @@
+import json
+
+import pandas as pd
+
+from dataclasses import dataclass, field
+
+
+REPORT_TOP_K = 10
+REPORT_SAMPLE_ROWS = 20
+# Values tracked per rule by the heavy hitters summary
+HEAVY_HITTER_CAPACITY = 4 * REPORT_TOP_K
+
+
+class HeavyHitters:
+    """ Weighted Space-Saving summary of the most frequent values, holding at most capacity counters.
+
+    A value that arrives when the summary is full replaces the value with the smallest count and inherits that count,
+    so the counts of the values kept are approximate upper bounds and every value more frequent than total / capacity
+    is kept.
+    """
+    def __init__(self, capacity: int = HEAVY_HITTER_CAPACITY):
+        self.capacity = capacity
+        self.counters = {}
+
+    def update(self, values: list, counts: list) -> None:
+        for value, count in zip(values, counts):
+            if value in self.counters:
+                self.counters[value] += count
+            elif len(self.counters) < self.capacity:
+                self.counters[value] = count
+            else:
+                smallest = min(self.counters, key=self.counters.get)
+                self.counters[value] = self.counters.pop(smallest) + count
+
+    def top(self, k: int = REPORT_TOP_K) -> list:
+        return sorted(self.counters.items(), key=lambda item: item[1], reverse=True)[:k]
+
+
+@dataclass
+class RuleReport:
+    column: str
+    check: str
+    violations: int = 0
+    heavy_hitters: HeavyHitters = field(default_factory=HeavyHitters)
+    sample_rows: list = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {
+            'Column': self.column,
+            'Check': self.check,
+            'Violations': self.violations,
+            'TopValues': [[value, count] for value, count in self.heavy_hitters.top()],
+            'SampleRows': list(self.sample_rows)
+        }
+
+
+@dataclass
+class ValidationReport:
+    """ Violations found by the validation rules of an import, one RuleReport per column and check. Streamed imports
+    add every batch to the same report, so counts, top values and sample rows cover the whole file.
+    """
+    rules: dict = field(default_factory=dict)
+
+    def reset(self) -> None:
+        """ Forgets every violation, for an import that starts over """
+        self.rules.clear()
+
+    def add(self, column: str, check: str, violations: int, values: list, counts: list, rows: list) -> None:
+        rule_report = self.rules.setdefault((column, check), RuleReport(column, check))
+        rule_report.violations += violations
+        rule_report.heavy_hitters.update(values, counts)
+        rule_report.sample_rows.extend(rows[:REPORT_SAMPLE_ROWS - len(rule_report.sample_rows)])
+
+    def get_violations(self) -> list:
+        """ (column, check, violations) of every rule with violations, most violated first """
+        violations = [
+            (rule_report.column, rule_report.check, rule_report.violations)
+            for rule_report in self.rules.values() if rule_report.violations > 0
+        ]
+        return sorted(violations, key=lambda item: item[2], reverse=True)
+
+    def to_dict(self) -> list:
+        return [rule_report.to_dict() for rule_report in self.rules.values()]
+
+    def to_json(self, indent: int = 2) -> str:
+        return json.dumps(self.to_dict(), indent=indent, default=str)
+
+    def to_dataframe(self) -> pd.DataFrame:
+        return pd.DataFrame(self.to_dict(), columns=['Column', 'Check', 'Violations', 'TopValues', 'SampleRows'])
@@ -0,0 +1,256 @@
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from dataclasses import dataclass, field
+
+from DataLink.DataTool.Parallel import map_columns
+from DataLink.DataTool.Progress import ImportProgress
+from DataLink.DataTool.Log import ImportLog, get_import_log
+from DataLink.DataTool.Report import ValidationReport, REPORT_TOP_K, REPORT_SAMPLE_ROWS, HEAVY_HITTER_CAPACITY
+
+
+# String columns whose first DOMAIN_SAMPLE_SIZE rows hold at most DOMAIN_CARDINALITY_RATIO distinct values per row are
+# dictionary encoded, and their rules are evaluated once per distinct value instead of once per row
+DOMAIN_SAMPLE_SIZE = 10000
+DOMAIN_CARDINALITY_RATIO = 0.1
+DOMAIN_MIN_ROWS = 4096
+
+
+class Rule:
+    """ A single validation rule. violations returns a boolean mask without nulls that marks the offending rows. """
+    check_name = ''
+    enforce_name = ''
+
+    def violations(self, column: pa.ChunkedArray) -> pa.ChunkedArray:
+        raise NotImplementedError
+
+
+@dataclass
+class NumericRule(Rule):
+    check_name = 'Numeric'
+    enforce_name = 'numeric'
+
+    def violations(self, column: pa.ChunkedArray) -> pa.ChunkedArray:
+        return pc.fill_null(pc.invert(pc.utf8_is_numeric(column)), False)
+
+
+@dataclass
+class BoundRule(Rule):
+    lower_bound: int
+    upper_bound: int
+    check_name = 'Bounds'
+    enforce_name = 'bounds'
+
+    def violations(self, column: pa.ChunkedArray) -> pa.ChunkedArray:
+        if not (pa.types.is_integer(column.type) or pa.types.is_floating(column.type)):
+            column = pc.cast(column, pa.float64())
+        outside = pc.or_(pc.less(column, self.lower_bound), pc.greater(column, self.upper_bound))
+        return pc.fill_null(outside, False)
+
+
+@dataclass
+class ValueRule(Rule):
+    values: pa.Array
+    check_name = 'Value'
+    enforce_name = 'value'
+
+    def __post_init__(self):
+        # Deduplicated once per rule; is_in hashes it and does one lookup per row, whatever the number of values
+        self.value_set = pc.unique(self.values)
+
+    def violations(self, column: pa.ChunkedArray) -> pa.ChunkedArray:
+        return pc.and_(pc.invert(pc.is_in(column, value_set=self.value_set)), pc.is_valid(column))
+
+
+@dataclass
+class DateFormatRule(Rule):
+    date_format: str
+    check_name = 'DateTime'
+    enforce_name = 'DateTime'
+
+    def violations(self, column: pa.ChunkedArray) -> pa.ChunkedArray:
+        parsed = pc.strptime(column, format=self.date_format, unit='s', error_is_null=True)
+        return pc.and_(pc.is_null(parsed), pc.is_valid(column))
+
+
+@dataclass
+class ColumnPlan:
+    column: str
+    remove_characters: list = field(default_factory=list)
+    rules: list = field(default_factory=list)
+    remove_missing: bool = False
+
+    def needs_text(self) -> bool:
+        return len(self.remove_characters) > 0 or any(not isinstance(rule, BoundRule) for rule in self.rules)
+
+    def has_costly_rules(self) -> bool:
+        """ True when some rule parses or copies every string, so evaluating it per distinct value pays off """
+        costly = (BoundRule, DateFormatRule)
+        return len(self.remove_characters) > 0 or any(isinstance(rule, costly) for rule in self.rules)
+
+
+@dataclass
+class ValidationPlan:
+    """ Validation instructions compiled once per validation file. Each rule's mask is computed a single time and
+    reused for reporting, NA enforcement and the merged Remove Missing row mask.
+    """
+    columns: list
+
+    def needs_text(self, column: str) -> bool:
+        return any(column_plan.needs_text() for column_plan in self.columns if column_plan.column == column)
+
+
+def compile_validation(validation_instruction: dict) -> ValidationPlan:
+    columns = []
+    for key, value in validation_instruction.items():
+        column_plan = ColumnPlan(key)
+        if value['Remove Characters']:
+            column_plan.remove_characters = list(value['Remove Characters'])
+        if value['Numeric Check']:
+            column_plan.rules.append(NumericRule())
+        if value['Bound Check']:
+            column_plan.rules.append(BoundRule(value['Bound Check'][0], value['Bound Check'][1]))
+        if value['Value Check']:
+            column_plan.rules.append(ValueRule(pa.array(value['Value Check'], type=pa.string())))
+        if value['Date Format Check']:
+            column_plan.rules.append(DateFormatRule(value['Date Format Check']))
+        column_plan.remove_missing = bool(value['Remove Missing'])
+        columns.append(column_plan)
+    return ValidationPlan(columns)
+
+
+def apply_validation(
+        plan: ValidationPlan,
+        table: pa.Table,
+        workers: int = 1,
+        progress: ImportProgress = None,
+        log: ImportLog = None,
+        report: ValidationReport = None,
+        row_offset: int = 0
+) -> tuple:
+    """ Returns the validated table and a boolean mask of the rows to keep, or None when no row is removed.
+
+    Columns are validated independently, concurrently when workers > 1. Messages are printed in plan order and the
+    Remove Missing rules are merged into one row mask, so the output does not depend on the worker count. Each column
+    is reported to progress before it is validated. Messages go to log (sys.stdout when None). Violation counts, the
+    most frequent offending values and sample offending rows (numbered from row_offset) are added to report.
+    """
+    log = get_import_log(log)
+
+    def validate(column_plan: ColumnPlan) -> tuple:
+        if progress is not None:
+            progress.update(column=column_plan.column)
+        return __apply_column_plan(column_plan, table.column(column_plan.column))
+
+    results = map_columns(validate, plan.columns, workers)
+
+    keep = None
+    for column_plan, (column, messages, findings) in zip(plan.columns, results):
+        table = table.set_column(table.schema.get_field_index(column_plan.column), column_plan.column, column)
+        for message in messages:
+            log.write(message)
+        if report is not None:
+            for check, detected, values, counts, rows in findings:
+                report.add(column_plan.column, check, detected, values, counts, [row + row_offset for row in rows])
+
+        if column_plan.remove_missing and column.null_count > 0:
+            log.write('Removing {0} rows with missing values in column {1}'.format(
+                column.null_count, column_plan.column
+            ))
+            keep = pc.is_valid(column) if keep is None else pc.and_(keep, pc.is_valid(column))
+    return table, keep
+
+
+"""
+Private helper functions
+"""
+
+
+def __apply_column_plan(column_plan: ColumnPlan, column: pa.ChunkedArray) -> tuple:
+    """ Rules run on values; indices maps every row to its entry in values, or is None when values are the rows """
+    messages = []
+    findings = []
+    values, indices = column, None
+    if column_plan.has_costly_rules():
+        values, indices = __encode_domain(column)
+    changed = False
+
+    for character in column_plan.remove_characters:
+        converted = pc.sum(__broadcast(pc.match_substring(values, character), indices)).as_py() or 0
+        if converted > 0:
+            messages.append('Removing character {0} from column {1}'.format(character, column_plan.column))
+            messages.append('Number of rows converted: {0}'.format(converted))
+            values = pc.replace_substring(values, character, '')
+            changed = True
+            if indices is not None:
+                encoded = pc.dictionary_encode(values)
+                values, indices = encoded.dictionary, pc.take(encoded.indices, indices)
+
+    for rule in column_plan.rules:
+        violations = rule.violations(values)
+        mask = __broadcast(violations, indices)
+        detected = pc.sum(mask).as_py() or 0
+        if detected > 0:
+            offending, counts, distinct = __count_offending(values, indices, mask)
+            messages.extend(__report(rule, column_plan.column, offending, counts, distinct, detected))
+            rows = pc.indices_nonzero(mask).slice(0, REPORT_SAMPLE_ROWS).to_pylist()
+            findings.append((rule.check_name, detected, offending, counts, rows))
+            values = pc.if_else(violations, pa.scalar(None, type=values.type), values)
+            changed = True
+
+    if indices is None:
+        return values, messages, findings
+    if not changed:
+        return column, messages, findings
+    return pc.take(values, indices), messages, findings
+
+
+def __encode_domain(column: pa.ChunkedArray) -> tuple:
+    if not pa.types.is_string(column.type) or len(column) < DOMAIN_MIN_ROWS:
+        return column, None
+
+    sample = column.slice(0, DOMAIN_SAMPLE_SIZE)
+    if pc.count_distinct(sample).as_py() > len(sample) * DOMAIN_CARDINALITY_RATIO:
+        return column, None
+
+    encoded = pc.dictionary_encode(column)
+    dictionary = encoded.chunk(0).dictionary
+    if not all(chunk.dictionary.equals(dictionary) for chunk in encoded.chunks[1:]):
+        return column, None
+    return dictionary, pa.chunked_array([chunk.indices for chunk in encoded.chunks], type=encoded.type.index_type)
+
+
+def __broadcast(mask: pa.Array, indices: pa.ChunkedArray):
+    if indices is None:
+        return mask
+    return pc.fill_null(pc.take(mask, indices), False)
+
+
+def __count_offending(values: pa.ChunkedArray, indices: pa.ChunkedArray, mask: pa.ChunkedArray) -> tuple:
+    """ The HEAVY_HITTER_CAPACITY most frequent offending values and their counts, most frequent first, and the
+    number of distinct offending values
+    """
+    if indices is None:
+        counts = pc.value_counts(pc.filter(values, mask))
+        offending = counts.field('values')
+    else:
+        counts = pc.value_counts(pc.filter(indices, mask))
+        offending = pc.take(values, counts.field('values'))
+    order = pc.array_sort_indices(counts.field('counts'), order='descending').slice(0, HEAVY_HITTER_CAPACITY)
+    return pc.take(offending, order).to_pylist(), pc.take(counts.field('counts'), order).to_pylist(), len(counts)
+
+
+def __report(rule: Rule, name: str, offending: list, counts: list, distinct: int, detected: int) -> list:
+    data = pd.Series(
+        counts[:REPORT_TOP_K],
+        index=pd.Index(offending[:REPORT_TOP_K], name=name),
+        name='count'
+    )
+    return [
+        '{0} check for column {1}'.format(rule.check_name, name),
+        'Distribution (top {0} of {1} values): {2}'.format(len(data), distinct, data.to_string()),
+        'Number of rows detected: {0}'.format(detected),
+        'Enforcing {0} check on column {1}'.format(rule.enforce_name, name),
+        'Number of rows converted to NA: {0}'.format(detected)
+    ]
@@ -11,7 +11,9 @@ if __name__ == '__main__':
     run()
 """
 
-from PyQt6.QtWidgets import QApplication, QMainWindow, QMenuBar, QWidget, QMenu, QVBoxLayout, QHBoxLayout
+from PyQt6.QtWidgets import (
+    QApplication, QMainWindow, QMenuBar, QWidget, QMenu, QVBoxLayout, QHBoxLayout, QFileDialog
+)
 from PyQt6.QtGui import QIcon
 import sys
 
@@ -64,10 +66,33 @@ class ApplicationWindow(QMainWindow):
         menu_bar = QMenuBar(self)
         file_menu = QMenu('&File', self)
         help_menu = QMenu('&Help', self)
+        file_menu.addAction('Save Graph...', self.save_graph)
+        file_menu.addAction('Run Graph', self.run_graph)
         menu_bar.addMenu(file_menu)
         menu_bar.addMenu(help_menu)
         self.setMenuBar(menu_bar)
 
+    def save_graph(self) -> None:
+        """ Saves the node graph as JSON, to be run without the GUI by python -m DataLink.Pipeline.Run """
+        filepath, _ = QFileDialog.getSaveFileName(self, 'Save Graph', '', 'Graph (*.json)')
+        if filepath:
+            self.node_editor.save_graph(filepath)
+
+    def run_graph(self) -> None:
+        """ Runs the node graph in the background, independent branches at the same time """
+        if self.node_editor.run_graph(self.graph_finished):
+            self.statusBar().showMessage('Running graph...')
+
+    def graph_finished(self, worker) -> None:
+        if worker.error is not None:
+            self.statusBar().showMessage('Run failed: {0}'.format(worker.error))
+        else:
+            self.statusBar().showMessage('Ran {0} nodes ({1} reused) in {2:.2f} s'.format(
+                len(worker.timings),
+                sum(timing.cached for timing in worker.timings),
+                max((timing.start + timing.seconds for timing in worker.timings), default=0.0)
+            ))
+
     def create_ui(self) -> QHBoxLayout:
         """ Ensures the correct placement of ui elements within the application interface using
         PyQT layouts
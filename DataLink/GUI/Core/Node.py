@@ -13,6 +13,7 @@ from PyQt6.QtGui import QPainterPath, QPen, QBrush, QColor, QFont, QPainter, QPi
 from PyQt6.QtCore import Qt, QPointF, QRectF
 from typing import Any
 
+from DataLink.Pipeline.Graph import NodeSpec
 from DataLink.GUI.Core.Sockets import SocketType
 from DataLink.GUI.Core.NodeProperties import NodeProperties
 from DataLink.GUI.Support.Helper import get_absolute_filepath
@@ -37,12 +38,18 @@ class Node:
     node_view: An instance of NodeView that represents the graphical view of the node in the node editor.
     inputs: A list to hold input sockets for the node.
     outputs: A list to hold output sockets for the node.
+    dirty: Whether the node has to run again on the next run of the graph, set when its properties or inputs change.
     socket_spacing: The distance between each socket on the node (default: 22).
 
     Node Methods
     ------------
     __init__: Initializes the Node with its properties and graphical view.
     get_socket_position: Returns the x, y position of a socket on the node.
+    get_name: Returns the name the node is saved under in a graph file.
+    get_input_names: Returns the names of the nodes connected to the input sockets, in socket order.
+    get_spec: Returns the node as a NodeSpec of a saved graph, None for nodes the headless runner cannot run.
+    get_output: Returns the dataset the node produced in the last run of the graph, None before a run.
+    mark_dirty: Marks the node and every node downstream of it dirty.
     """
     def __init__(
             self,
@@ -64,6 +71,7 @@ class Node:
         self.node_view = NodeView(node, position, title, width, height, 10.0, icon_path)
         self.inputs = []
         self.outputs = []
+        self.dirty = True
         self.socket_spacing = 22
 
     def get_socket_position(self, index: int, socket_type: SocketType) -> tuple:
@@ -90,6 +98,35 @@ class Node:
         )
         return x, y
 
+    def get_name(self) -> str:
+        return '{0} {1}'.format(self.title, self.index)
+
+    def get_input_names(self) -> list:
+        edges = [
+            edge for edge in self.node_editor.edges if edge.end_socket is not None and edge.end_socket.node is self
+        ]
+        return [edge.start_socket.node.get_name() for edge in sorted(edges, key=lambda edge: edge.end_socket.index)]
+
+    def get_spec(self) -> NodeSpec:
+        return None
+
+    def get_output(self):
+        return self.node_editor.get_output(self)
+
+    def mark_dirty(self) -> None:
+        # Edges drawn by the user may form a cycle, so each node is visited once
+        visited = set()
+        pending = [self]
+        while pending:
+            node = pending.pop()
+            if id(node) in visited:
+                continue
+            visited.add(id(node))
+            node.dirty = True
+            for edge in node.node_editor.edges:
+                if edge.start_socket is not None and edge.start_socket.node is node and edge.end_socket is not None:
+                    pending.append(edge.end_socket.node)
+
 
 class NodeView(QGraphicsItem):
     """
@@ -3,7 +3,12 @@ from PyQt6.QtCore import Qt, QRectF, QLine, QPointF
 from PyQt6.QtGui import QPainter, QColor, QPen, QMouseEvent, QDragEnterEvent, QDropEvent, QDragMoveEvent
 import math
 
+from DataLink.Pipeline.Graph import Graph, save_graph
+from DataLink.Pipeline.Results import NodeResults
+from DataLink.Pipeline.Store import get_result_store
+from DataLink.Pipeline.View import to_dataframe
 from DataLink.GUI.Support.Enums import State
+from DataLink.GUI.Support.Worker import GraphWorker
 from DataLink.GUI.Core.Node import Node
 from DataLink.GUI.NodeFunction.ImportNodes import CSVInputNode
 from DataLink.GUI.NodeFunction.CleanerNodes import ReplaceNode
@@ -20,6 +25,9 @@ class NodeEditor:
         self.node_properties = node_properties
         self.state = State.NO_OPERATION
         self.node_index = 1
+        self.graph_worker = None
+        self.graph_finished = None
+        self.node_results = NodeResults(result_store=get_result_store())
 
         self.nodes = []
         self.edges = []
@@ -41,16 +49,65 @@ class NodeEditor:
     def add_edge(self, edge: Edge):
         self.edges.append(edge)
         self.node_editor_scene.addItem(edge.edge_view)
+        edge.end_socket.node.mark_dirty()
 
     def remove_node(self, node: Node):
         self.nodes.remove(node)
 
     def remove_edge(self, edge: Edge):
+        if edge.end_socket is not None:
+            edge.end_socket.node.mark_dirty()
         self.edges.remove(edge)
 
     def get_node_editor(self):
         return self.node_editor_view
 
+    def get_graph(self) -> Graph:
+        """ The nodes the headless runner can run, as a graph it reads with DataLink.Pipeline.Run """
+        specs = [node.get_spec() for node in self.nodes]
+        return Graph([spec for spec in specs if spec is not None])
+
+    def save_graph(self, filepath: str) -> None:
+        save_graph(self.get_graph(), filepath)
+
+    def run_graph(self, on_finished=None) -> bool:
+        """ Runs the graph on a GraphWorker unless a run is already going, and calls on_finished with the worker
+        when it ends. The outputs are kept in node_results, see get_output.
+
+        Nodes whose fingerprint changed run again, every other node reuses its output of the last run from
+        node_results, or of an earlier session from the result store. Dirty nodes are invalidated in node_results
+        before the run, so a failed run leaves them to run again next time.
+        """
+        if self.graph_worker is not None:
+            return False
+        self.node_properties.save_ui()
+        self.node_results.invalidate(node.get_name() for node in self.nodes if node.dirty)
+        for node in self.nodes:
+            node.dirty = False
+        self.graph_finished = on_finished
+        self.graph_worker = GraphWorker(self.get_graph(), results=self.node_results)
+        self.graph_worker.finished.connect(self.run_finished)
+        self.graph_worker.start()
+        return True
+
+    def get_output(self, node: Node):
+        """ The dataset node produced in the last run of the graph, None before a run. Outputs spilled to disk to
+        keep node_results within its memory budget are read back here, and the rows selected by filter and replace
+        nodes copied out of the table they select from.
+        """
+        output = self.node_results.load(node.get_name())
+        return to_dataframe(output) if output is not None else None
+
+    def run_finished(self) -> None:
+        """ Shows the new output of the node whose properties are open, then calls on_finished of run_graph """
+        worker = self.graph_worker
+        worker.worker_thread.wait()
+        self.graph_worker = None
+        if isinstance(self.node_properties.node, ReplaceNode):
+            self.node_properties.node.set_property_ui()
+        if self.graph_finished is not None:
+            self.graph_finished(worker)
+
     def handle_node(self, node_name: str, node_position: QPointF):
         if node_name == 'CSV Importer':
             self.add_node(CSVInputNode(self, self.node_index, self.node_properties, node_position))
@@ -2,7 +2,7 @@ from PyQt6.QtWidgets import QWidget, QFrame, QVBoxLayout, QStackedLayout, QLabel
 
 from DataLink.GUI.Support.Enums import PropertyUI
 from DataLink.GUI.NodeUI.ImportUI import ImportUI
-from DataLink.GUI.NodeUI.FilterUI import FilterUI
+from DataLink.GUI.NodeUI.FilterUI import ReplaceUI
 
 
 class NodeProperties:
@@ -10,17 +10,36 @@ class NodeProperties:
         self.frame = PropertyFrame()
         self.ui_list = [PropertyUI.NO_UI]
         self.old_args = []
+        self.node = None
+        self.node_spec = None
 
     def get_node_properties(self):
         return self.frame
 
-    def set_ui(self, ui_type: PropertyUI, *args):
-        self.frame.save_panel(*self.old_args)
+    def set_ui(self, ui_type: PropertyUI, *args, node=None):
+        """ Shows the panel of ui_type for node, after saving the panel shown before. node is the Node whose
+        properties the panel edits, marked dirty when saving the panel changed its settings.
+        """
+        self.save_ui()
         if ui_type == PropertyUI.NO_UI:
             self.old_args = []
+            self.node = None
         else:
             self.old_args = [*args]
+            self.node = node
         self.frame.set_panel(self.ui_list.index(ui_type), *args)
+        self.node_spec = self.node.get_spec() if self.node is not None else None
+
+    def save_ui(self):
+        """ Saves the panel shown into its node and marks the node and every node downstream of it dirty if its
+        settings changed since the panel was shown or last saved
+        """
+        self.frame.save_panel(*self.old_args)
+        if self.node is not None:
+            node_spec = self.node.get_spec()
+            if node_spec != self.node_spec:
+                self.node.mark_dirty()
+            self.node_spec = node_spec
 
     def create_ui(self, ui_type: PropertyUI):
         if ui_type not in self.ui_list:
@@ -28,7 +47,7 @@ class NodeProperties:
             if ui_type == PropertyUI.IMPORT_CSV_UI:
                 self.frame.create_panel(int(ui_type), ImportUI())
             if ui_type == PropertyUI.CLEANER_REPLACE_UI:
-                self.frame.create_panel(int(ui_type), FilterUI())
+                self.frame.create_panel(int(ui_type), ReplaceUI())
 
 
 class PropertyFrame(QFrame):
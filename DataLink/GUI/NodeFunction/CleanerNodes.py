@@ -1,9 +1,11 @@
 from PyQt6.QtCore import QPointF
 
+from DataLink.Pipeline.Graph import NodeSpec
+from DataLink.Pipeline.Nodes import COMPARISONS
 from DataLink.GUI.Core.Node import Node
 from DataLink.GUI.Core.Sockets import Socket
 from DataLink.GUI.Core.NodeProperties import NodeProperties
-from DataLink.GUI.Support.DataStorage import FilterStorage, PandasStorage
+from DataLink.GUI.Support.DataStorage import FilterStorage, ArrowStorage
 from DataLink.GUI.Support.Enums import SocketType, PropertyUI
 
 
@@ -31,7 +33,8 @@ class ReplaceNode(Node):
         )
         self.filter_storage = FilterStorage()
         self.filter_storage.add_new_filter()
-        self.pandas_storage = PandasStorage()
+        self.data_storage = ArrowStorage()
+        self.replacement = None
         self.setup()
         self.setup_sockets()
 
@@ -45,20 +48,34 @@ class ReplaceNode(Node):
         self.outputs.append(Socket(self, 0, SocketType.OUTPUT))
 
     def on_edge_connect(self, socket: Socket):
-        self.pandas_storage = socket.node.csv_manager
+        # The storage of the import, only read here for its columns
+        self.data_storage = socket.node.csv_manager.storage
 
     def set_property_ui(self):
-        if self.pandas_storage is not None:
-            self.node_properties.set_ui(
-                PropertyUI.CLEANER_REPLACE_UI,
-                self.filter_storage,
-                self.pandas_storage.get_columns()
-            )
-        else:
-            self.node_properties.set_ui(
-                PropertyUI.CLEANER_REPLACE_UI,
-                self.filter_storage
-            )
+        columns = self.data_storage.get_columns() if self.data_storage is not None else None
+        self.node_properties.set_ui(PropertyUI.CLEANER_REPLACE_UI, self.filter_storage, columns, self, node=self)
 
     def remove_property_ui(self):
         self.node_properties.set_ui(PropertyUI.NO_UI)
+
+    def get_spec(self) -> NodeSpec:
+        # Until a replacement is entered the node is left out of saved and run graphs, rather than replacing the
+        # matching values with missing values; 'missing' asks for that explicitly, as in the filter values
+        if self.replacement is None:
+            return None
+        comparisons = list(COMPARISONS)
+        filters = [
+            {
+                'columns': list(filter_data.selected_columns),
+                'comparison': comparisons[filter_data.comparison_index],
+                'value': None if filter_data.value1_string == 'missing' else filter_data.value1_string,
+                'value2': None if filter_data.value2_string == 'missing' else filter_data.value2_string
+            }
+            for filter_data in self.filter_storage.data
+        ]
+        return NodeSpec(
+            self.get_name(),
+            'replace',
+            self.get_input_names(),
+            {'filters': filters, 'value': None if self.replacement == 'missing' else self.replacement}
+        )
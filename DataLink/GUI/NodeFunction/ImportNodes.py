@@ -1,5 +1,6 @@
 from PyQt6.QtCore import QPointF
 
+from DataLink.Pipeline.Graph import NodeSpec
 from DataLink.GUI.Core.Node import Node
 from DataLink.GUI.Core.Sockets import Socket
 from DataLink.GUI.Support.Enums import PropertyUI
@@ -49,8 +50,18 @@ class CSVInputNode(Node):
             PropertyUI.IMPORT_CSV_UI,
             self.csv_manager,
             self.schema_manager,
-            self.validation_manager
+            self.validation_manager,
+            node=self
         )
 
     def remove_property_ui(self):
         self.node_properties.set_ui(PropertyUI.NO_UI)
+
+    def get_spec(self) -> NodeSpec:
+        settings = {
+            'dataset': self.csv_manager.filename,
+            'schema': self.schema_manager.filename,
+            'validation': self.validation_manager.filename,
+            'streaming': True
+        }
+        return NodeSpec(self.get_name(), 'csv_import', [], settings)
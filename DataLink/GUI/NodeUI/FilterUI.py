@@ -1,9 +1,12 @@
+import pandas as pd
+
 from PyQt6.QtWidgets import (
-    QWidget, QLabel, QPushButton, QComboBox, QTextEdit, QDialog, QTableWidget, QTableWidgetItem, QLineEdit, QVBoxLayout, QHBoxLayout)
+    QWidget, QLabel, QPushButton, QComboBox, QTextEdit, QDialog, QTableWidget, QTableWidgetItem, QLineEdit, QVBoxLayout, QHBoxLayout,
+    QTableView)
 from PyQt6.QtCore import Qt
 from typing import Any
 
-from DataLink.GUI.Support.Helper import horizontal_line
+from DataLink.GUI.Support.Helper import horizontal_line, PandasModel
 from DataLink.GUI.Support.DataStorage import FilterData, FilterStorage
 
 
@@ -258,3 +261,45 @@ class FilterUI(QWidget):
         self.add_panel(len(self.filters) - 1)
         self.filters[len(self.filters) - 1].set_filter(filters[len(filters) - 1], column_list)
         self.update()
+
+
+class ReplaceUI(FilterUI):
+    """ Filters of a Replace node and the value it puts in the rows they match. The value is typed as text, like the
+    filter values, and 'missing' replaces with missing values. The node is left out of graphs while it is empty.
+    Below them is the output of the node in the last run of the graph.
+    """
+    def __init__(self):
+        self.replacement_input = QLineEdit()
+        self.output_label = QLabel()
+        self.output_table = QTableView()
+        super().__init__()
+
+    def setup(self):
+        super().setup()
+        replacement_layout = QHBoxLayout()
+        replacement_layout.addWidget(QLabel('Replace with:'))
+        replacement_layout.addWidget(self.replacement_input)
+        self.layout().insertLayout(1, replacement_layout)
+        self.replacement_input.setPlaceholderText('value, or missing')
+        self.layout().addWidget(horizontal_line())
+        self.layout().addWidget(self.output_label)
+        self.layout().addWidget(self.output_table)
+
+    def set_panel(self, filter_storage: FilterStorage, column_list: list = None, node: Any = None) -> None:
+        super().set_panel(filter_storage, column_list)
+        replacement = node.replacement if node is not None else None
+        self.replacement_input.setText(replacement if replacement is not None else '')
+        self.show_output(node.get_output() if node is not None else None)
+
+    def save_panel(self, filter_storage: FilterStorage, column_list: list = None, node: Any = None) -> None:
+        super().save_panel(filter_storage, column_list)
+        if node is not None:
+            node.replacement = self.replacement_input.text().strip() or None
+
+    def show_output(self, dataset: pd.DataFrame = None) -> None:
+        if dataset is None:
+            self.output_label.setText('Run the graph to see the output')
+            self.output_table.setModel(None)
+        else:
+            self.output_label.setText('Output: {0} rows, {1} columns'.format(*dataset.shape))
+            self.output_table.setModel(PandasModel(dataset))
@@ -1,15 +1,26 @@
+import pyarrow as pa
+
+import os
+
 from PyQt6.QtWidgets import (
-    QMainWindow, QWidget, QLineEdit, QVBoxLayout, QGridLayout, QPushButton, QLabel, QTableView
+    QMainWindow, QWidget, QLineEdit, QVBoxLayout, QHBoxLayout, QGridLayout, QPushButton, QLabel, QTableView,
+    QProgressBar
 )
 from PyQt6.QtGui import QIcon
+import DataLink.DataTool.Preprocess as pr
 from DataLink.GUI.Support.DataManager import CSVImportManager, SchemaManager, ValidationManager
+from DataLink.GUI.Support.Worker import ImportWorker, IndexWorker
 from DataLink.GUI.Support.Helper import (
-    horizontal_line, Logger, error_dialog, creator_options, create_file_dialog, csv_search,
+    DEFAULT_LOG_FILE, horizontal_line, Logger, error_dialog, creator_options, create_file_dialog, csv_search,
     directory_search_button,  edit_button, create_button, save_data_button,
-    PandasModel, ComboBoxSelection, DTypeEnforcer
+    PandasModel, PreviewModel, FileModel, ComboBoxSelection, DTypeEnforcer
 )
 
 
+# Rules listed in the live validation summary of an import
+PREVIEW_SUMMARY_RULES = 5
+
+
 """
 Import specific data structure definitions
 """
@@ -109,8 +120,19 @@ class ImportUI(QWidget):
         self.schema_editor = None
         self.validation_editor = None
         self.logger = Logger()
+        self.set_log_file(DEFAULT_LOG_FILE)
+        self.import_worker = None
+        self.index_worker = None
+        self.indexed_filepath = ''
 
         self.import_button = QPushButton('Import Data')
+        self.cancel_button = QPushButton('Cancel')
+        self.progress_bar = QProgressBar()
+        self.progress_label = QLabel()
+        self.preview_label = QLabel()
+        self.preview_model = PreviewModel()
+        self.preview_table = QTableView()
+        self.preview_table.setModel(self.preview_model)
 
         self.dataset_search_button = directory_search_button()
 
@@ -127,6 +149,8 @@ class ImportUI(QWidget):
         self.validation_filepath_input = QLineEdit()
 
         self.setup()
+        self.cancel_button.clicked.connect(self.cancel_import)
+        self.dataset_filepath_input.editingFinished.connect(self.index_dataset)
 
     def setup(self):
         panel_layout = QVBoxLayout()
@@ -134,10 +158,18 @@ class ImportUI(QWidget):
         panel_layout.addLayout(self.create_panel())
         panel_layout.addSpacing(5)
         panel_layout.addWidget(self.import_button)
+        progress_layout = QHBoxLayout()
+        progress_layout.addWidget(self.progress_bar)
+        progress_layout.addWidget(self.cancel_button)
+        panel_layout.addLayout(progress_layout)
+        panel_layout.addWidget(self.progress_label)
+        panel_layout.addWidget(self.preview_label)
+        panel_layout.addWidget(self.preview_table)
         panel_layout.addWidget(horizontal_line())
         panel_layout.addWidget(self.logger.log)
         panel_layout.addStretch()
         self.setLayout(panel_layout)
+        self.show_progress(False)
 
     def create_panel(self):
         import_layout = QGridLayout()
@@ -189,7 +221,7 @@ class ImportUI(QWidget):
             schema_manager,
             validation_manager
         ))
-        self.dataset_search_button.clicked.connect(lambda: csv_search(self.dataset_filepath_input))
+        self.dataset_search_button.clicked.connect(self.search_dataset)
         self.validation_search_button.clicked.connect(lambda: csv_search(self.validation_filepath_input))
         self.schema_search_button.clicked.connect(lambda: csv_search(self.schema_filepath_input))
 
@@ -210,6 +242,7 @@ class ImportUI(QWidget):
         self.dataset_filepath_input.setText(csv_import_manager.filename)
         self.schema_filepath_input.setText(schema_manager.filename)
         self.validation_filepath_input.setText(validation_manager.filename)
+        self.index_dataset()
 
     def save_panel(
             self,
@@ -227,13 +260,132 @@ class ImportUI(QWidget):
             schema_manager: SchemaManager,
             validation_manager: ValidationManager
     ) -> None:
+        if self.import_worker is not None:
+            return
+
         csv_import_manager.filename = self.dataset_filepath_input.text()
         schema_manager.filename = self.schema_filepath_input.text()
         validation_manager.filename = self.validation_filepath_input.text()
-        csv_import_manager.import_data(schema_manager, validation_manager)
-        self.handle_import_error(schema_manager.bad_filename,
-                                 validation_manager.bad_filename,
-                                 csv_import_manager.bad_filename,)
+
+        self.import_worker = ImportWorker(csv_import_manager, schema_manager, validation_manager)
+        self.import_worker.progress.connect(self.update_progress)
+        self.import_worker.preview.connect(self.update_preview)
+        self.import_worker.finished.connect(self.import_finished)
+        self.import_button.setEnabled(False)
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setValue(0)
+        self.progress_label.setText('Importing {0}'.format(csv_import_manager.filename))
+        self.preview_label.setText('')
+        self.preview_model.clear()
+        self.preview_table.setModel(self.preview_model)
+        self.show_progress(True)
+        self.import_worker.start()
+
+    def cancel_import(self) -> None:
+        if self.import_worker is not None:
+            self.import_worker.cancel()
+            self.progress_label.setText('Cancelling import')
+
+    def update_progress(self, bytes_read: int, total_bytes: int, batches: int, column: str) -> None:
+        if total_bytes > 0:
+            self.progress_bar.setValue(int(100 * min(bytes_read / total_bytes, 1.0)))
+        self.progress_label.setText('Read {0:.1f} of {1:.1f} MB, {2} batches validated{3}'.format(
+            bytes_read / 1024 ** 2,
+            total_bytes / 1024 ** 2,
+            batches,
+            ', column {0}'.format(column) if column else ''
+        ))
+
+    def update_preview(self, table: pa.Table, rows_read: int, rows_kept: int, violations: list) -> None:
+        if table is None:
+            self.preview_model.clear()
+        else:
+            self.preview_model.append(table)
+        summary = ', '.join(
+            '{0} {1} ({2})'.format(column, check, count) for column, check, count in violations[:PREVIEW_SUMMARY_RULES]
+        )
+        self.preview_label.setText('{0} of {1} rows kept, {2} violations{3}'.format(
+            rows_kept,
+            rows_read,
+            sum(count for _, _, count in violations),
+            ': {0}'.format(summary) if summary else ''
+        ))
+
+    def show_dataset(self, dataset) -> None:
+        """ Replaces the preview batches with the imported dataset, or clears them if the import did not finish """
+        self.preview_model.clear()
+        if dataset is not None:
+            self.preview_model.append(pa.Table.from_pandas(dataset, preserve_index=False))
+
+    def import_finished(self) -> None:
+        worker = self.import_worker
+        worker.worker_thread.wait()
+        self.import_worker = None
+        self.logger.flush()
+        dataset = worker.csv_import_manager.get_dataset()
+        self.show_dataset(dataset)
+        if dataset is not None and worker.import_preview.rows_kept != len(dataset):
+            self.preview_label.setText('{0} rows loaded from the import cache'.format(len(dataset)))
+        self.import_button.setEnabled(True)
+        self.show_progress(False)
+        self.handle_import_error(worker.schema_manager.bad_filename,
+                                 worker.validation_manager.bad_filename,
+                                 worker.csv_import_manager.bad_filename,)
+
+    def search_dataset(self) -> None:
+        csv_search(self.dataset_filepath_input)
+        self.index_dataset()
+
+    def index_dataset(self) -> None:
+        """ Indexes the dataset file in the background, then shows its raw rows in the preview table """
+        filepath = self.dataset_filepath_input.text()
+        if filepath == self.indexed_filepath:
+            return
+        self.indexed_filepath = filepath
+        if self.index_worker is not None:
+            self.index_worker.cancel()
+            return
+        if self.import_worker is None:
+            self.preview_label.setText('')
+            self.preview_model.clear()
+            self.preview_table.setModel(self.preview_model)
+        if not os.path.isfile(filepath):
+            return
+
+        self.index_worker = IndexWorker(filepath)
+        self.index_worker.progress.connect(self.update_index_progress)
+        self.index_worker.finished.connect(self.index_finished)
+        self.index_worker.start()
+
+    def update_index_progress(self, bytes_read: int, total_bytes: int) -> None:
+        if self.import_worker is None:
+            self.preview_label.setText('Indexing {0}: {1:.0f}%'.format(
+                self.index_worker.filepath, 100 * bytes_read / max(total_bytes, 1)
+            ))
+
+    def index_finished(self) -> None:
+        worker = self.index_worker
+        worker.worker_thread.wait()
+        self.index_worker = None
+        if worker.filepath != self.indexed_filepath or worker.index_progress.is_cancelled():
+            self.indexed_filepath = ''
+            self.index_dataset()
+            return
+        if worker.line_index is not None and self.import_worker is None:
+            self.preview_table.setModel(FileModel(worker.line_index))
+            self.preview_label.setText('{0} rows in {1}'.format(worker.line_index.rows, worker.filepath))
+
+    def show_progress(self, visible: bool) -> None:
+        self.progress_bar.setVisible(visible)
+        self.cancel_button.setVisible(visible)
+        self.progress_label.setVisible(visible)
+
+    def set_log_file(self, filepath: str) -> None:
+        """ Keeps the complete import log in filepath; the panel still shows the log if the file cannot be opened """
+        try:
+            self.logger.set_log_file(filepath)
+        except OSError as ex:
+            self.logger.write('Could not open the log file {0}: {1}'.format(filepath, ex))
 
     def create_schema_editor(
             self,
@@ -280,14 +432,19 @@ class ImportUI(QWidget):
         schema_manager._schema = None
 
         filepath = {}
-        dialog = create_file_dialog('Create Schema', filepath)
+        dialog = create_file_dialog(
+            'Create Schema',
+            filepath,
+            'Infer column types from the first {0} rows (every column is text otherwise)'.format(pr.DEFAULT_SAMPLE_ROWS)
+        )
         dialog.exec()
 
-        if len(filepath) == 0:
+        if 'path' not in filepath:
             return
 
+        infer_types = filepath.get('option', False)
         filepath = filepath['path'] + filepath['name']
-        schema_manager.create_schema(filepath, csv_import_manager)
+        schema_manager.create_schema(filepath, csv_import_manager, infer_types)
 
         if csv_import_manager.bad_filename:
             error_message = 'missing/ incorrect dataset filename\n'
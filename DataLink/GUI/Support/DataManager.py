@@ -1,10 +1,15 @@
 """
 
 """
-import sys
 from typing import Any
 
 import DataLink.DataTool.Preprocess as pr
+from DataLink.DataTool.Cache import KeyLookup, get_import_cache
+from DataLink.DataTool.Progress import ImportProgress, ImportCancelled
+from DataLink.DataTool.Log import get_import_log
+from DataLink.DataTool.Report import ValidationReport
+from DataLink.DataTool.Preview import ImportPreview
+from DataLink.GUI.Support.DataStorage import ArrowStorage
 
 
 class DataManager:
@@ -18,11 +23,8 @@ class DataManager:
 
     def log_message(self, type_name: str, args: Any):
         message = 'An exception of type {0} occurred. Arguments:\n{1!r}'.format(type_name, args)
-        self.logger.log.clear()
-        old_stdout = sys.stdout
-        sys.stdout = self.logger
-        print(message)
-        sys.stdout = old_stdout
+        self.logger.clear()
+        self.logger.write(message)
 
 
 class SchemaManager(DataManager):
@@ -44,12 +46,22 @@ class SchemaManager(DataManager):
             self.log_message(type(ex).__name__, ex.args)
             return
 
-    def create_schema(self, filepath: str, csv_import_manager):
-        csv_import_manager.read_csv()
-        if csv_import_manager.bad_filename:
+    def create_schema(
+            self,
+            filepath: str,
+            csv_import_manager,
+            infer_types: bool = False,
+            sample_rows: int = pr.DEFAULT_SAMPLE_ROWS,
+            workers: int = None
+    ):
+        """ Writes a schema of the dataset of csv_import_manager to filepath: every column as text, or with types and
+        NA fills inferred from its first sample_rows rows when infer_types is set.
+        """
+        sample = csv_import_manager.read_sample(sample_rows if infer_types else 1)
+        if sample is None:
             return
 
-        schema = pr.create_schema(list(csv_import_manager.get_columns()))
+        schema = pr.create_schema(sample.column_names, sample if infer_types else None, workers)
 
         try:
             schema.to_csv(filepath, index=False)
@@ -110,11 +122,14 @@ class CSVImportManager(DataManager):
         super().__init__()
         self._dataset = None
         self.filename = ""
+        self.import_cache = get_import_cache()
+        self.validation_report = None
+        self.storage = ArrowStorage()
 
     def read_csv(self):
         self.bad_filename = False
         try:
-            self._dataset = pr.read_csv(self.filename)
+            self.set_dataset(pr.read_csv(self.filename))
         except OSError:
             self.bad_filename = True
             return
@@ -122,7 +137,28 @@ class CSVImportManager(DataManager):
             self.log_message(type(ex).__name__, ex.args)
             return
 
-    def import_data(self, schema_manager: SchemaManager = None, validation_manager: ValidationManager = None):
+    def read_sample(self, sample_rows: int = pr.DEFAULT_SAMPLE_ROWS):
+        self.bad_filename = False
+        try:
+            return pr.read_sample(self.filename, sample_rows)
+        except OSError:
+            self.bad_filename = True
+            return None
+        except Exception as ex:
+            self.log_message(type(ex).__name__, ex.args)
+            return None
+
+    def import_data(
+            self,
+            schema_manager: SchemaManager = None,
+            validation_manager: ValidationManager = None,
+            streaming: bool = False,
+            memory_limit: int = pr.DEFAULT_MEMORY_LIMIT,
+            workers: int = 1,
+            compact_types: bool = False,
+            progress: ImportProgress = None,
+            preview: ImportPreview = None
+    ):
         self.bad_filename = False
 
         schema_manager.read_schema()
@@ -131,24 +167,81 @@ class CSVImportManager(DataManager):
             return
 
         try:
-            self.logger.log.clear()
+            self.logger.clear()
+            log = get_import_log(self.logger, self.filename)
+            self.validation_report = None
             if validation_manager.get_validation() is not None:
-                self._dataset = pr.read_data(self.filename,
-                                             schema_manager.get_schema(),
-                                             pr.convert_validation(validation_manager.get_validation()),
-                                             self.logger)
+                validation_filename = validation_manager.filename
+                validation = pr.read_validation_plan(validation_filename)
             else:
-                self._dataset = pr.read_data(self.filename,
-                                             schema_manager.get_schema(),
-                                             None,
-                                             self.logger)
+                validation_filename = None
+                validation = None
+
+            cache_key = None
+            key_lookup = None
+            if self.import_cache is not None:
+                cache_files = (self.filename, schema_manager.filename, validation_filename)
+                cache_options = 'compact' if compact_types else ''
+                if preview is None:
+                    cache_key = self.import_cache.get_key(*cache_files, options=cache_options)
+                    if self.load_cached(cache_key, log):
+                        return
+                else:
+                    # A previewed import starts reading at once; if the file turns out to be cached it is cancelled
+                    progress = progress if progress is not None else ImportProgress()
+                    key_lookup = KeyLookup(self.import_cache, cache_files, cache_options, progress.cancel)
+
+            self.validation_report = ValidationReport()
+            self.set_dataset(pr.read_data(self.filename,
+                                          schema_manager.get_schema(),
+                                          validation,
+                                          log,
+                                          streaming,
+                                          memory_limit,
+                                          workers,
+                                          compact_types,
+                                          progress,
+                                          self.validation_report,
+                                          preview))
+            if key_lookup is not None:
+                cache_key = key_lookup.get_key()
         except OSError:
             self.bad_filename = True
             return
+        except ImportCancelled:
+            if key_lookup is not None and key_lookup.is_hit() and self.load_cached(key_lookup.get_key(), log):
+                self.validation_report = None
+                return
+            self.set_dataset(None)
+            log.write('Import of {0} cancelled'.format(self.filename))
+            return
         except Exception as ex:
             self.log_message(type(ex).__name__, ex.args)
             return
 
+        if self.import_cache is not None:
+            try:
+                self.import_cache.store(cache_key, self._dataset)
+            except OSError as ex:
+                log.write('Could not write to the import cache: {0}'.format(ex))
+            log.write(self.import_cache.summary())
+
+    def load_cached(self, cache_key: str, log: Any) -> bool:
+        self.set_dataset(self.import_cache.load(cache_key))
+        if self._dataset is None:
+            return False
+        log.write('Loaded {0} from the import cache'.format(self.filename))
+        log.write(self.import_cache.summary())
+        return True
+
     def get_columns(self):
         if self._dataset is not None:
             return self._dataset.columns
+
+    def get_dataset(self):
+        return self._dataset
+
+    def set_dataset(self, dataset) -> None:
+        """ Sets the imported dataset, also added as a version of storage, from which downstream nodes branch """
+        self._dataset = dataset
+        self.storage.set_data(dataset)
@@ -1,6 +1,7 @@
 import pandas as pd
+import pyarrow as pa
 
-from typing import Any
+from typing import Any, Union
 from dataclasses import dataclass
 
 from DataLink.DataTool.Filter import FilterInstruction, filter_data_by
@@ -20,10 +21,27 @@ class PandasStorage(DataStorage):
 
     def get_columns(self) -> list:
         if self.data is not None:
-            return list(data.columns)
+            return list(self.data.columns)
         return []
 
 
+class ArrowStorage(DataStorage):
+    """ Storage of a dataset as an immutable Arrow table, read by the nodes downstream of it but never changed by them:
+    their changes are outputs of the graph run, views of the table of their input (see TableView).
+    """
+    def __init__(self):
+        super().__init__()
+
+    def set_data(self, data: Union[pd.DataFrame, pa.Table, None]) -> None:
+        """ Replaces the dataset with data. Arrow backed DataFrame columns are not copied. """
+        if isinstance(data, pd.DataFrame):
+            data = pa.Table.from_pandas(data, preserve_index=False)
+        self.data = data
+
+    def get_columns(self) -> list:
+        return self.data.column_names if self.data is not None else []
+
+
 @dataclass
 class FilterData:
     column_string: str
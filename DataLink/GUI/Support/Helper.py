@@ -1,16 +1,29 @@
 import pandas as pd
+import pyarrow as pa
 
 from PyQt6.QtGui import QPainter, QIcon
-from PyQt6.QtCore import Qt, QAbstractTableModel, QAbstractItemModel, QVariant, QModelIndex
+from PyQt6.QtCore import Qt, QAbstractTableModel, QAbstractItemModel, QVariant, QModelIndex, QTimer
 from PyQt6.QtWidgets import (
     QLabel, QPushButton, QFrame, QDialog, QVBoxLayout, QHBoxLayout, QGridLayout, QLineEdit, QFileDialog, QTextEdit,
-    QWidget, QStyledItemDelegate, QStyleOptionViewItem, QComboBox, QApplication, QStyle, QSizePolicy
+    QWidget, QStyledItemDelegate, QStyleOptionViewItem, QComboBox, QApplication, QStyle, QSizePolicy, QCheckBox
 )
 
+import csv
+import bisect
+import threading
+
 from io import TextIOBase
+from collections import deque, OrderedDict
 from pathlib import Path
 from typing import Callable, Any
 
+from DataLink.DataTool.LineIndex import LineIndex
+from DataLink.DataTool.Preprocess import read_rows
+
+
+# File the import panels keep their complete log in
+DEFAULT_LOG_FILE = str(Path.home() / '.cache' / 'DataLink' / 'logs' / 'import.log')
+
 
 """
 Additional data structures
@@ -18,35 +31,148 @@ Additional data structures
 
 
 class Logger(TextIOBase):
-    def __init__(self):
+    """ Import log shown in a QTextEdit.
+
+    write and clear may be called from any thread. Each write is one message, without its trailing newline, so the
+    logger can also be printed to. Messages are buffered in a ring of at most max_messages entries
+    and a GUI thread timer appends them to the widget in one block every flush_interval milliseconds. Messages that
+    overflow the ring between two flushes are coalesced into a single line that reports how many were left out. The
+    widget keeps at most max_lines lines; set_log_file keeps the complete log on disk as well.
+    """
+    def __init__(self, flush_interval: int = 100, max_messages: int = 1000, max_lines: int = 10000):
         self.log = QTextEdit()
         self.log.setReadOnly(True)
+        self.log.document().setMaximumBlockCount(max_lines)
+        self.buffer = deque(maxlen=max_messages)
+        self.coalesced = 0
+        self.log_file = None
+        self._pending_coalesced = 0
+        self._pending_clear = False
+        self._lock = threading.Lock()
+
+        self.timer = QTimer()
+        self.timer.setInterval(flush_interval)
+        self.timer.timeout.connect(self.flush)
+        self.timer.start()
 
     def write(self, string):
-        self.log.append(string)
+        message = string.rstrip('\n')
+        if not message:
+            return len(string)
+        with self._lock:
+            if len(self.buffer) == self.buffer.maxlen:
+                self._pending_coalesced += 1
+            self.buffer.append(message)
+            if self.log_file is not None:
+                self.log_file.write(message + '\n')
+        return len(string)
+
+    def clear(self):
+        with self._lock:
+            self.buffer.clear()
+            self._pending_coalesced = 0
+            self._pending_clear = True
+
+    def set_log_file(self, filepath: str = None) -> None:
+        """ Also appends every message to filepath, creating its directory, or stops doing so when filepath is None """
+        log_file = None
+        if filepath:
+            Path(filepath).parent.mkdir(parents=True, exist_ok=True)
+            log_file = open(filepath, 'a', encoding='utf-8')
+        with self._lock:
+            if self.log_file is not None:
+                self.log_file.close()
+            self.log_file = log_file
+
+    def flush(self):
+        """ Moves the buffered messages to the widget. Runs on the GUI thread. """
+        with self._lock:
+            messages = list(self.buffer)
+            self.buffer.clear()
+            coalesced, self._pending_coalesced = self._pending_coalesced, 0
+            clear, self._pending_clear = self._pending_clear, False
+            if self.log_file is not None:
+                self.log_file.flush()
+
+        if clear:
+            self.log.clear()
+        if coalesced > 0:
+            self.coalesced += coalesced
+            location = ' (full log in {0})'.format(self.log_file.name) if self.log_file is not None else ''
+            messages.insert(0, '[{0} messages coalesced{1}]'.format(coalesced, location))
+        if messages:
+            self.log.append('\n'.join(messages))
 
 
 class PandasModel(QAbstractTableModel):
-    def __init__(self, data: pd.DataFrame, custom_header: list = None):
+    """ Table model over a DataFrame that only formats the cells a view asks for.
+
+    Row and column counts are cached, and cells are read from each column's own array (sliced, never copied) one
+    page of page_size rows at a time. Formatted pages are kept in an LRU cache of cache_pages entries, so the cost of a
+    cell does not depend on the width or length of the frame. Rows are handed to the view fetch_size at a time through
+    canFetchMore / fetchMore.
+    """
+    def __init__(
+            self,
+            data: pd.DataFrame,
+            custom_header: list = None,
+            page_size: int = 256,
+            cache_pages: int = 1024,
+            fetch_size: int = 10000
+    ):
         super().__init__()
         self._data = data
         if custom_header:
             self.header = custom_header
         else:
             self.header = list(data.columns)
+        self.page_size = page_size
+        self.cache_pages = cache_pages
+        self.fetch_size = fetch_size
+        self._row_count, self._column_count = data.shape
+        self._loaded_rows = min(self._row_count, fetch_size)
+        self._arrays = [None] * self._column_count
+        self._pages = OrderedDict()
 
     def rowCount(self, parent=None):
-        return len(self._data.values)
+        return self._loaded_rows
 
     def columnCount(self, parent=None):
-        return self._data.columns.size
+        return self._column_count
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return self._loaded_rows < self._row_count
+
+    def fetchMore(self, parent=QModelIndex()) -> None:
+        rows = min(self.fetch_size, self._row_count - self._loaded_rows)
+        if rows <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded_rows, self._loaded_rows + rows - 1)
+        self._loaded_rows += rows
+        self.endInsertRows()
 
     def data(self, index, role=Qt.ItemDataRole.DisplayRole):
         if index.isValid():
             if role == Qt.ItemDataRole.DisplayRole or role == Qt.ItemDataRole.EditRole:
-                return QVariant(str(self._data.iloc[index.row()][index.column()]))
+                page, offset = divmod(index.row(), self.page_size)
+                return QVariant(self.get_page(index.column(), page)[offset])
         return QVariant()
 
+    def get_page(self, column: int, page: int) -> list:
+        key = (column, page)
+        if key in self._pages:
+            self._pages.move_to_end(key)
+            return self._pages[key]
+
+        if self._arrays[column] is None:
+            self._arrays[column] = self._data.iloc[:, column].array
+        start = page * self.page_size
+        formatted = [str(value) for value in self._arrays[column][start:start + self.page_size]]
+        self._pages[key] = formatted
+        if len(self._pages) > self.cache_pages:
+            self._pages.popitem(last=False)
+        return formatted
+
     def headerData(self, section: int, orientation: Qt.Orientation, role: int = ...) -> Any:
         if role == Qt.ItemDataRole.DisplayRole:
             if orientation == Qt.Orientation.Horizontal:
@@ -57,6 +183,9 @@ class PandasModel(QAbstractTableModel):
     def setData(self, index: QModelIndex, value: Any, role: int = ...) -> bool:
         if role == Qt.ItemDataRole.EditRole:
             self._data.iloc[index.row(), index.column()] = value
+            self._arrays[index.column()] = None
+            self._pages.pop((index.column(), index.row() // self.page_size), None)
+            self.dataChanged.emit(index, index)
             return True
         return False
 
@@ -67,6 +196,141 @@ class PandasModel(QAbstractTableModel):
         return flags
 
 
+class PreviewModel(QAbstractTableModel):
+    """ Read only table model over the validated Arrow batches of an import that is still running.
+
+    append adds the rows of a batch below the rows already shown, so the view fills in as the import progresses.
+    Cells are formatted a page at a time into an LRU cache like PandasModel, with missing values shown as <NA>.
+    """
+    def __init__(self, page_size: int = 256, cache_pages: int = 1024):
+        super().__init__()
+        self.header = []
+        self.page_size = page_size
+        self.cache_pages = cache_pages
+        self._tables = []
+        self._offsets = []
+        self._row_count = 0
+        self._pages = OrderedDict()
+
+    def append(self, table: pa.Table) -> None:
+        if not self.header:
+            self.beginResetModel()
+            self.header = table.column_names
+            self.endResetModel()
+        if table.num_rows == 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._row_count, self._row_count + table.num_rows - 1)
+        self._tables.append(table)
+        self._offsets.append(self._row_count)
+        self._row_count += table.num_rows
+        self.endInsertRows()
+
+    def clear(self) -> None:
+        self.beginResetModel()
+        self.header = []
+        self._tables = []
+        self._offsets = []
+        self._row_count = 0
+        self._pages.clear()
+        self.endResetModel()
+
+    def rowCount(self, parent=None):
+        return self._row_count
+
+    def columnCount(self, parent=None):
+        return len(self.header)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if index.isValid():
+            if role == Qt.ItemDataRole.DisplayRole:
+                table = bisect.bisect_right(self._offsets, index.row()) - 1
+                page, offset = divmod(index.row() - self._offsets[table], self.page_size)
+                return QVariant(self.get_page(table, index.column(), page)[offset])
+        return QVariant()
+
+    def get_page(self, table: int, column: int, page: int) -> list:
+        key = (table, column, page)
+        if key in self._pages:
+            self._pages.move_to_end(key)
+            return self._pages[key]
+
+        values = self._tables[table].column(column).slice(page * self.page_size, self.page_size).to_pylist()
+        formatted = ['<NA>' if value is None else str(value) for value in values]
+        self._pages[key] = formatted
+        if len(self._pages) > self.cache_pages:
+            self._pages.popitem(last=False)
+        return formatted
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = ...) -> Any:
+        if role == Qt.ItemDataRole.DisplayRole:
+            if orientation == Qt.Orientation.Horizontal:
+                return self.header[section]
+            else:
+                return section + 1
+
+
+class FileModel(QAbstractTableModel):
+    """ Read only table model over the raw rows of a csv file that has not been imported.
+
+    Rows are parsed a page of page_size rows at a time from the byte range the file's LineIndex gives for them, and
+    cache_pages formatted pages are kept in an LRU cache, so scrolling to any row reads only the rows shown. A page
+    pyarrow cannot parse, such as one with a row of the wrong number of values, is shown split on commas as is, with
+    the values a short row lacks left empty.
+    """
+    def __init__(self, line_index: LineIndex, page_size: int = 64, cache_pages: int = 64):
+        super().__init__()
+        self.line_index = line_index
+        self.page_size = page_size
+        self.cache_pages = cache_pages
+        self.header = read_rows(line_index.filepath, line_index, 0, 0).column_names
+        self._pages = OrderedDict()
+
+    def rowCount(self, parent=None):
+        return self.line_index.rows
+
+    def columnCount(self, parent=None):
+        return len(self.header)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if index.isValid():
+            if role == Qt.ItemDataRole.DisplayRole:
+                page, offset = divmod(index.row(), self.page_size)
+                columns = self.get_page(page)
+                if index.column() < len(columns) and offset < len(columns[index.column()]):
+                    return QVariant(columns[index.column()][offset])
+        return QVariant()
+
+    def get_page(self, page: int) -> list:
+        if page in self._pages:
+            self._pages.move_to_end(page)
+            return self._pages[page]
+
+        try:
+            table = read_rows(self.line_index.filepath, self.line_index, page * self.page_size, self.page_size)
+            formatted = [
+                ['<NA>' if value is None else value for value in column.to_pylist()] for column in table.columns
+            ]
+        except pa.ArrowInvalid:
+            formatted = self.get_raw_page(page)
+        self._pages[page] = formatted
+        if len(self._pages) > self.cache_pages:
+            self._pages.popitem(last=False)
+        return formatted
+
+    def get_raw_page(self, page: int) -> list:
+        begin, end = self.line_index.get_range(page * self.page_size, self.page_size)
+        text = self.line_index.read(begin, end).to_pybytes().decode('utf-8', errors='replace')
+        rows = list(csv.reader(text.splitlines(keepends=True)))
+        return [[row[column] if column < len(row) else '' for row in rows] for column in range(len(self.header))]
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = ...) -> Any:
+        if role == Qt.ItemDataRole.DisplayRole:
+            if orientation == Qt.Orientation.Horizontal:
+                return self.header[section]
+            else:
+                return section + 1
+
+
 class ComboBoxSelection(QStyledItemDelegate):
     def __init__(self, parent: QWidget = None):
         super().__init__(parent)
@@ -146,7 +410,10 @@ def error_dialog(message: str) -> QDialog:
     return dialog
 
 
-def create_file_dialog(title: str, file_path: dict) -> QDialog:
+def create_file_dialog(title: str, file_path: dict, option: str = None) -> QDialog:
+    """ Dialog asking for the name and folder of a new file, set in file_path. With option, a check box labelled
+    option sets file_path['option'].
+    """
     dialog = QDialog()
     layout = QGridLayout()
 
@@ -166,7 +433,11 @@ def create_file_dialog(title: str, file_path: dict) -> QDialog:
     layout.addWidget(label_directory, 1, 0)
     layout.addWidget(input_path, 1, 1)
     layout.addWidget(search_button, 1, 2)
-    layout.addWidget(create_file, 2, 0)
+    if option is not None:
+        option_box = QCheckBox(option)
+        option_box.toggled.connect(lambda checked: file_path.update(option=checked))
+        layout.addWidget(option_box, 2, 0, 1, 3)
+    layout.addWidget(create_file, 3, 0)
 
     dialog.setWindowTitle(title)
     dialog.setWindowIcon(QIcon("icon.jpg"))
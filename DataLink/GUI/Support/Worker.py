@@ -0,0 +1,145 @@
+import os
+
+from PyQt6.QtCore import QObject, QThread, pyqtSignal
+
+from DataLink.DataTool.Progress import ImportProgress, ImportCancelled
+from DataLink.DataTool.LineIndex import open_line_index
+from DataLink.DataTool.Preview import ImportPreview
+from DataLink.Pipeline.Graph import Graph
+from DataLink.Pipeline.Engine import run_graph
+from DataLink.Pipeline.Results import NodeResults
+from DataLink.GUI.Support.DataManager import CSVImportManager, SchemaManager, ValidationManager
+
+
+class ImportWorker(QObject):
+    """ Runs CSVImportManager.import_data on its own QThread so the GUI stays responsive.
+
+    The pyarrow kernels release the GIL, so a thread gets the parallelism of a process without pickling the result:
+    the dataset is left on the CSVImportManager the node already holds and only finished is sent back. progress
+    carries the bytes read, the total bytes, the batches validated and the current column. The file is streamed and
+    preview carries every validated batch as an Arrow table (None when the import starts over), the rows read and
+    kept so far, and the (column, check, violations) found so far.
+    """
+    progress = pyqtSignal('qint64', 'qint64', int, str)
+    preview = pyqtSignal(object, 'qint64', 'qint64', list)
+    finished = pyqtSignal()
+
+    def __init__(
+            self,
+            csv_import_manager: CSVImportManager,
+            schema_manager: SchemaManager,
+            validation_manager: ValidationManager
+    ):
+        super().__init__()
+        self.csv_import_manager = csv_import_manager
+        self.schema_manager = schema_manager
+        self.validation_manager = validation_manager
+        self.import_progress = ImportProgress(self.get_file_size(), self.report_progress)
+        self.import_preview = ImportPreview(self.report_preview)
+        self.worker_thread = QThread()
+        self.moveToThread(self.worker_thread)
+        self.worker_thread.started.connect(self.run)
+        self.finished.connect(self.worker_thread.quit)
+
+    def get_file_size(self) -> int:
+        try:
+            return os.path.getsize(self.csv_import_manager.filename)
+        except OSError:
+            return 0
+
+    def start(self) -> None:
+        self.worker_thread.start()
+
+    def run(self) -> None:
+        try:
+            self.csv_import_manager.import_data(
+                self.schema_manager,
+                self.validation_manager,
+                streaming=True,
+                progress=self.import_progress,
+                preview=self.import_preview
+            )
+        finally:
+            self.finished.emit()
+
+    def cancel(self) -> None:
+        self.import_progress.cancel()
+
+    def report_progress(self, progress: ImportProgress) -> None:
+        self.progress.emit(progress.bytes_read, progress.total_bytes, progress.batches, progress.column)
+
+    def report_preview(self, preview: ImportPreview, table) -> None:
+        report = self.csv_import_manager.validation_report
+        violations = report.get_violations() if report is not None else []
+        self.preview.emit(table, preview.rows_read, preview.rows_kept, violations)
+
+
+class IndexWorker(QObject):
+    """ Opens the LineIndex of a csv file on its own QThread, building it when the file has no current index stored
+    beside it. The index is left on line_index (None if the file could not be read or the worker was cancelled) and
+    progress carries the bytes scanned and the file size.
+    """
+    progress = pyqtSignal('qint64', 'qint64')
+    finished = pyqtSignal()
+
+    def __init__(self, filepath: str):
+        super().__init__()
+        self.filepath = filepath
+        self.line_index = None
+        self.index_progress = ImportProgress(os.path.getsize(filepath), self.report_progress)
+        self.worker_thread = QThread()
+        self.moveToThread(self.worker_thread)
+        self.worker_thread.started.connect(self.run)
+        self.finished.connect(self.worker_thread.quit)
+
+    def start(self) -> None:
+        self.worker_thread.start()
+
+    def run(self) -> None:
+        try:
+            self.line_index = open_line_index(self.filepath, progress=self.index_progress)
+        except (OSError, ImportCancelled):
+            self.line_index = None
+        finally:
+            self.finished.emit()
+
+    def cancel(self) -> None:
+        self.index_progress.cancel()
+
+    def report_progress(self, progress: ImportProgress) -> None:
+        self.progress.emit(progress.bytes_read, progress.total_bytes)
+
+
+class GraphWorker(QObject):
+    """ Runs a node graph with Engine.run_graph on its own QThread. run_graph runs independent branches on its own
+    thread pool, one thread per core, so this thread only waits on them. The outputs by node name and the NodeTiming
+    of every node are left on outputs and timings, or the exception that stopped the run on error, and only finished
+    is sent back. Given results, only the nodes whose output is not stored there are run, and the outputs are left in
+    results alone so its memory budget holds once the run is over.
+    """
+    finished = pyqtSignal()
+
+    def __init__(self, graph: Graph, log=None, results: NodeResults = None):
+        super().__init__()
+        self.graph = graph
+        self.log = log
+        self.results = results
+        self.outputs = {}
+        self.timings = []
+        self.error = None
+        self.worker_thread = QThread()
+        self.moveToThread(self.worker_thread)
+        self.worker_thread.started.connect(self.run)
+        self.finished.connect(self.worker_thread.quit)
+
+    def start(self) -> None:
+        self.worker_thread.start()
+
+    def run(self) -> None:
+        try:
+            outputs, self.timings = run_graph(self.graph, os.cpu_count() or 1, self.log, results=self.results)
+            self.outputs = outputs if self.results is None else {}
+        except Exception as ex:
+            self.error = ex
+        finally:
+            self.finished.emit()
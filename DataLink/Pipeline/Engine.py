@@ -0,0 +1,250 @@
+import os
+import json
+import time
+import hashlib
+
+from dataclasses import dataclass
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from DataLink.DataTool.Log import ImportLog, get_import_log
+from DataLink.DataTool.Parallel import get_worker_count
+from DataLink.Pipeline.Graph import Graph, NodeSpec
+from DataLink.Pipeline.Nodes import RunContext, get_node_type
+from DataLink.Pipeline.Results import NodeResults
+
+
+@dataclass
+class NodeTiming:
+    """ How a node ran: start is the seconds from the start of the run to the start of the node, and cached whether
+    its output was reused from an earlier run instead.
+    """
+    name: str
+    type: str
+    seconds: float
+    start: float = 0.0
+    rows: int = 0
+    columns: int = 0
+    cached: bool = False
+
+    def to_dict(self) -> dict:
+        return {
+            'Node': self.name, 'Type': self.type, 'Start': self.start, 'Seconds': self.seconds, 'Rows': self.rows,
+            'Columns': self.columns, 'Cached': self.cached
+        }
+
+
+def run_graph(
+        graph: Graph,
+        workers: int = 1,
+        log: ImportLog = None,
+        branches: int = None,
+        results: NodeResults = None
+) -> tuple:
+    """ Runs every node of graph after the nodes it reads and returns the outputs by node name with one NodeTiming
+    per node, in the order the nodes finished.
+
+    A node starts as soon as all of its inputs are done, so independent branches (such as two imports feeding
+    separate filters) run at the same time on a pool of branches threads. By default there is one thread per usable
+    core, but no more than the nodes that can run at once, so a chain of nodes or a single core runs one node at a
+    time without a pool. The pyarrow kernels release the GIL, so the branches use separate cores. workers is the
+    thread count of each import.
+
+    With results, nodes whose fingerprint matches their stored output are not run again (their timing is marked
+    cached) and results is updated with the outputs of this run. A reused output is only read from results when a
+    node that runs needs it or its node type writes files from it (such as the validation report of an import), and
+    is left out of the returned outputs. Nodes without an output, such as exports, always run. Once the run is over,
+    results is brought back within its memory budget.
+    """
+    order = check_graph(graph)
+    log = get_import_log(log)
+    context = RunContext(graph, log, workers)
+    branches = min(get_worker_count(branches), __get_width(order))
+    fingerprints = {}
+    for node in order:
+        fingerprints[node.name] = get_fingerprint(graph, node, [fingerprints[name] for name in node.inputs])
+    if results is not None:
+        results.retain(fingerprints)
+
+    start = time.perf_counter()
+    outputs = {}
+    timings = []
+
+    def get_inputs(node: NodeSpec) -> list:
+        return [get_output(name) for name in node.inputs]
+
+    def get_output(name: str):
+        if name in outputs:
+            return outputs[name]
+        output = results.load(name)
+        if output is None:
+            # A reused view dropped to keep results within its memory budget is computed again from its inputs
+            node = graph.get_node(name)
+            output, _ = __run_node(node, get_inputs(node), context, start)
+            results.store(name, fingerprints[name], output, node.type, node.inputs)
+        return output
+
+    def finish(node: NodeSpec, output, timing: NodeTiming) -> None:
+        timings.append(timing)
+        if timing.cached:
+            return
+        outputs[node.name] = output
+        if results is not None and get_node_type(node).output:
+            results.store(node.name, fingerprints[node.name], output, node.type, node.inputs)
+
+    if branches == 1:
+        for node in order:
+            timing = __find_cached(node, fingerprints[node.name], results, context, start)
+            if timing is not None:
+                finish(node, None, timing)
+            else:
+                finish(node, *__run_node(node, get_inputs(node), context, start))
+        if results is not None:
+            results.evict()
+        return outputs, timings
+
+    waiting = {node.name: len(set(node.inputs)) for node in order}
+    readers = {node.name: [] for node in order}
+    for node in order:
+        for name in set(node.inputs):
+            readers[name].append(node)
+
+    with ThreadPoolExecutor(max_workers=branches, thread_name_prefix='DataLinkNode') as executor:
+        running = {}
+        ready = [node for node in order if waiting[node.name] == 0]
+        while ready or running:
+            done = []
+            for node in ready:
+                timing = __find_cached(node, fingerprints[node.name], results, context, start)
+                if timing is not None:
+                    done.append((node, (None, timing)))
+                else:
+                    running[executor.submit(__run_node, node, get_inputs(node), context, start)] = node
+            ready = []
+
+            if not done:
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    node = running.pop(future)
+                    try:
+                        done.append((node, future.result()))
+                    except BaseException:
+                        for pending in running:
+                            pending.cancel()
+                        raise
+            for node, result in done:
+                finish(node, *result)
+                for reader in readers[node.name]:
+                    waiting[reader.name] -= 1
+                    if waiting[reader.name] == 0:
+                        ready.append(reader)
+    if results is not None:
+        results.evict()
+    return outputs, timings
+
+
+def get_fingerprint(graph: Graph, node: NodeSpec, inputs: list) -> str:
+    """ Digest of what the output of node depends on: its type and settings, the size and modification time of the
+    files its type reads, and the fingerprints of its inputs. A change anywhere upstream changes the fingerprint of
+    every node downstream of it.
+    """
+    files = {}
+    for setting in get_node_type(node).files:
+        filepath = graph.resolve_path(node.settings.get(setting))
+        if filepath:
+            try:
+                stat = os.stat(filepath)
+                files[setting] = [filepath, stat.st_size, stat.st_mtime_ns]
+            except OSError:
+                files[setting] = [filepath]
+    content = json.dumps(
+        {'type': node.type, 'settings': node.settings, 'files': files, 'inputs': inputs},
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.blake2b(content.encode('utf-8'), digest_size=20).hexdigest()
+
+
+def check_graph(graph: Graph) -> list:
+    """ Checks that every node reads as many datasets as its type declares, only from nodes that produce one, and
+    returns the run order of get_run_order.
+    """
+    order = get_run_order(graph)
+    for node in order:
+        node_type = get_node_type(node)
+        if len(node.inputs) != node_type.inputs:
+            raise ValueError('Node {0} reads {1} inputs, but {2} nodes read {3}'.format(
+                node.name, len(node.inputs), node.type, node_type.inputs
+            ))
+        for name in node.inputs:
+            if not get_node_type(graph.get_node(name)).output:
+                raise ValueError('Node {0} reads {1}, which has no output'.format(node.name, name))
+    return order
+
+
+def get_run_order(graph: Graph) -> list:
+    """ The nodes of graph ordered so every node comes after its inputs, otherwise in the order they were saved """
+    order = []
+    visited = set()
+    for node in graph.nodes:
+        __visit(graph, node, visited, [], order)
+    return order
+
+
+"""
+Private helper functions
+"""
+
+
+def __find_cached(
+        node: NodeSpec,
+        fingerprint: str,
+        results: NodeResults,
+        context: RunContext,
+        run_start: float
+) -> NodeTiming:
+    node_type = get_node_type(node)
+    if results is None or not node_type.output:
+        return None
+    entry = results.find(node.name, fingerprint)
+    if entry is None:
+        return None
+    if node_type.reuse is not None:
+        node_type.reuse(node, lambda: results.load(node.name), context)
+    return NodeTiming(node.name, node.type, 0.0, time.perf_counter() - run_start, *entry.shape, cached=True)
+
+
+def __run_node(node: NodeSpec, inputs: list, context: RunContext, run_start: float) -> tuple:
+    context.log.write('Running {0} ({1})'.format(node.name, node.type))
+    start = time.perf_counter()
+    output = get_node_type(node).function(node, inputs, context)
+    timing = NodeTiming(node.name, node.type, time.perf_counter() - start, start - run_start)
+    if output is not None:
+        timing.rows, timing.columns = output.shape
+    return output, timing
+
+
+def __get_width(order: list) -> int:
+    """ The most nodes that can run at once, counted as the largest set of nodes at the same depth of the graph """
+    depths = {}
+    for node in order:
+        depths[node.name] = max((depths[name] + 1 for name in node.inputs), default=0)
+    return max(Counter(depths.values()).values(), default=1)
+
+
+def __visit(graph: Graph, node: NodeSpec, visited: set, path: list, order: list) -> None:
+    if node.name in visited:
+        return
+    if node.name in path:
+        raise ValueError('The graph has a cycle: {0}'.format(' -> '.join(path[path.index(node.name):] + [node.name])))
+
+    path.append(node.name)
+    for name in node.inputs:
+        try:
+            input_node = graph.get_node(name)
+        except KeyError:
+            raise ValueError('Node {0} reads {1}, which is not in the graph'.format(node.name, name)) from None
+        __visit(graph, input_node, visited, path, order)
+    path.pop()
+    visited.add(node.name)
+    order.append(node)
@@ -0,0 +1,69 @@
+import os
+import json
+
+from dataclasses import dataclass, field
+
+
+# Bump when the layout of saved graphs changes
+GRAPH_FORMAT_VERSION = 1
+
+
+@dataclass
+class NodeSpec:
+    """ A node of a saved graph: its unique name, its type (a key of Nodes.NODE_TYPES), the names of the nodes whose
+    outputs it reads in order, and the settings of its type.
+    """
+    name: str
+    type: str
+    inputs: list = field(default_factory=list)
+    settings: dict = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return {'name': self.name, 'type': self.type, 'inputs': list(self.inputs), 'settings': dict(self.settings)}
+
+
+@dataclass
+class Graph:
+    """ A node graph saved as JSON. Relative file paths in node settings are resolved against directory, the folder
+    of the graph file.
+    """
+    nodes: list = field(default_factory=list)
+    directory: str = ''
+
+    def get_node(self, name: str) -> NodeSpec:
+        for node in self.nodes:
+            if node.name == name:
+                return node
+        raise KeyError(name)
+
+    def resolve_path(self, filepath: str) -> str:
+        if not filepath:
+            return filepath
+        return os.path.join(self.directory, os.path.expanduser(filepath))
+
+    def to_dict(self) -> dict:
+        return {'version': GRAPH_FORMAT_VERSION, 'nodes': [node.to_dict() for node in self.nodes]}
+
+
+def load_graph(filepath: str) -> Graph:
+    with open(filepath, encoding='utf-8') as file:
+        data = json.load(file)
+    if data.get('version', GRAPH_FORMAT_VERSION) > GRAPH_FORMAT_VERSION:
+        raise ValueError('{0} was saved in graph format {1}, newer than the supported {2}'.format(
+            filepath, data['version'], GRAPH_FORMAT_VERSION
+        ))
+
+    nodes = [
+        NodeSpec(node['name'], node['type'], list(node.get('inputs', [])), dict(node.get('settings', {})))
+        for node in data.get('nodes', [])
+    ]
+    names = [node.name for node in nodes]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError('Node names must be unique, repeated: {0}'.format(', '.join(duplicates)))
+    return Graph(nodes, os.path.dirname(os.path.abspath(filepath)))
+
+
+def save_graph(graph: Graph, filepath: str) -> None:
+    with open(filepath, 'w', encoding='utf-8') as file:
+        json.dump(graph.to_dict(), file, indent=2)
@@ -0,0 +1,196 @@
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+from typing import Any, Callable
+from dataclasses import dataclass
+
+import DataLink.DataTool.Preprocess as pr
+from DataLink.DataTool.Filter import (
+    ComparisonFlag, FilterInstruction, FilterExpression, Not, Or, compile_instruction, evaluate_filter
+)
+from DataLink.DataTool.Log import ImportLog
+from DataLink.DataTool.Report import ValidationReport
+from DataLink.Pipeline.Graph import Graph, NodeSpec
+from DataLink.Pipeline.View import TableView, get_view, to_table
+
+
+# Comparisons offered by the filter panel, as the flags of a FilterInstruction and whether the match is inverted
+COMPARISONS = {
+    'is': ([ComparisonFlag.SAME], False),
+    'is not': ([ComparisonFlag.SAME], True),
+    'more than': ([ComparisonFlag.MORE], False),
+    'less than': ([ComparisonFlag.LESS], False),
+    'the same or more than': ([ComparisonFlag.SAME, ComparisonFlag.MORE], False),
+    'the same or less than': ([ComparisonFlag.SAME, ComparisonFlag.LESS], False),
+    'between': ([ComparisonFlag.BETWEEN], False)
+}
+# Key of the validation report JSON in the attrs of an import output
+REPORT_ATTRIBUTE = 'datalink.report'
+
+
+@dataclass(frozen=True)
+class NodeType:
+    """ What a node type declares to the engine: the function that runs it, the number of datasets it reads, one per
+    input socket, whether it produces a dataset other nodes can read, and the settings naming files it reads (their
+    size and modification time are part of the node's fingerprint). reuse is called in place of function when the
+    output of the node is reused from an earlier run, with the node, a function loading that output and the context,
+    to write again the files the node writes besides its output.
+    """
+    function: Callable
+    inputs: int
+    output: bool = True
+    files: tuple = ()
+    reuse: Callable = None
+
+
+@dataclass
+class RunContext:
+    """ Settings shared by every node of a run. workers is the thread count given to the import pipeline of each
+    node, on top of the nodes the engine runs at once.
+    """
+    graph: Graph
+    log: ImportLog
+    workers: int = 1
+
+
+def run_csv_import(node: NodeSpec, inputs: list, context: RunContext) -> pd.DataFrame:
+    """ settings: dataset, schema and validation (optional) csv paths, streaming, memory_limit, compact_types, and
+    report, a path the validation report is written to as JSON. The report is also kept in the attrs of the output,
+    so it is stored with it and written again when the output is reused.
+    """
+    settings = node.settings
+    validation = None
+    if settings.get('validation'):
+        validation = pr.read_validation_plan(context.graph.resolve_path(settings['validation']))
+    report = ValidationReport() if settings.get('report') else None
+
+    dataset = pr.read_data(
+        context.graph.resolve_path(settings['dataset']),
+        pr.read_config(context.graph.resolve_path(settings['schema'])),
+        validation,
+        context.log,
+        streaming=settings.get('streaming', False),
+        memory_limit=settings.get('memory_limit', pr.DEFAULT_MEMORY_LIMIT),
+        workers=context.workers,
+        compact_types=settings.get('compact_types', False),
+        report=report
+    )
+    if report is not None:
+        dataset.attrs[REPORT_ATTRIBUTE] = report.to_json()
+        __write_report(node, dataset, context)
+    return dataset
+
+
+def reuse_csv_import(node: NodeSpec, load: Callable, context: RunContext) -> None:
+    if node.settings.get('report'):
+        __write_report(node, load(), context)
+
+
+def run_filter(node: NodeSpec, inputs: list, context: RunContext) -> TableView:
+    """ settings: filters (see get_selection), and keep, whether the matching rows are kept (the default) or dropped.
+    The output is a view of the rows of the input, which are not copied.
+    """
+    dataset = get_view(inputs[0])
+    selection = evaluate_filter(dataset.table, compile_selection(node.settings.get('filters', [])))
+    if not node.settings.get('keep', True):
+        selection = pc.invert(selection)
+    return dataset.select(selection)
+
+
+def run_replace(node: NodeSpec, inputs: list, context: RunContext) -> TableView:
+    """ settings: filters (see get_selection), value, and columns, the columns replaced in the matching rows (the
+    columns of the filters by default). The output is a view of the input in which only the replaced columns are new.
+    """
+    dataset = get_view(inputs[0])
+    filters = node.settings.get('filters', [])
+    columns = node.settings.get('columns') or list(dict.fromkeys(
+        column for instruction in filters for column in instruction['columns']
+    ))
+    selection = evaluate_filter(dataset.table, compile_selection(filters))
+    return dataset.replace(columns, selection, __get_value(node.settings.get('value')))
+
+
+def run_export(node: NodeSpec, inputs: list, context: RunContext) -> None:
+    """ settings: path, written as csv, Parquet (.parquet) or Arrow IPC (.arrow, .feather) by its extension """
+    filepath = __make_parent(context.graph.resolve_path(node.settings['path']))
+    table = to_table(inputs[0])
+    extension = os.path.splitext(filepath)[1].lower()
+    if extension == '.parquet':
+        pq.write_table(table, filepath)
+    elif extension in ('.arrow', '.feather'):
+        with pa.OSFile(filepath, 'wb') as file:
+            with pa.ipc.new_file(file, table.schema) as writer:
+                writer.write_table(table)
+    else:
+        pa_csv.write_csv(table, filepath)
+    context.log.write('Wrote {0} rows to {1}'.format(table.num_rows, filepath))
+    return None
+
+
+NODE_TYPES = {
+    'csv_import': NodeType(run_csv_import, 0, files=('dataset', 'schema', 'validation'), reuse=reuse_csv_import),
+    'filter': NodeType(run_filter, 1),
+    'replace': NodeType(run_replace, 1),
+    'export': NodeType(run_export, 1, output=False)
+}
+
+
+def get_node_type(node: NodeSpec) -> NodeType:
+    if node.type not in NODE_TYPES:
+        raise ValueError('Node {0} has unknown type {1}, expected one of: {2}'.format(
+            node.name, node.type, ', '.join(NODE_TYPES)
+        ))
+    return NODE_TYPES[node.type]
+
+
+def get_selection(dataset: pd.DataFrame, filters: list) -> pd.Series:
+    """ Rows matching any of filters, each a dict of columns, comparison (as worded in the filter panel), value, and
+    value2 for 'between'. A null value stands for a missing value.
+    """
+    selection = evaluate_filter(dataset, compile_selection(filters))
+    return pd.Series(selection.to_numpy(zero_copy_only=False), index=dataset.index)
+
+
+def compile_selection(filters: list) -> FilterExpression:
+    """ The filters of get_selection as one expression tree, evaluated in a single pass over the Arrow columns """
+    expressions = []
+    for instruction in filters:
+        flags, inverted = COMPARISONS[instruction.get('comparison', 'is')]
+        value = __get_value(instruction.get('value'))
+        if ComparisonFlag.BETWEEN in flags:
+            value = [value, __get_value(instruction.get('value2'))]
+        expression = compile_instruction(FilterInstruction(instruction['columns'], flags, value))
+        expressions.append(Not(expression) if inverted else expression)
+    return Or(expressions)
+
+
+"""
+Private helper functions
+"""
+
+
+def __write_report(node: NodeSpec, dataset: pd.DataFrame, context: RunContext) -> None:
+    report = dataset.attrs.get(REPORT_ATTRIBUTE) if dataset is not None else None
+    if report is not None:
+        with open(__make_parent(context.graph.resolve_path(node.settings['report'])), 'w', encoding='utf-8') as file:
+            file.write(report)
+
+
+def __make_parent(filepath: str) -> str:
+    directory = os.path.dirname(filepath)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    return filepath
+
+
+def __get_value(value: Any) -> Any:
+    if value is None:
+        return pd.NA
+    if isinstance(value, list):
+        return [__get_value(item) for item in value]
+    return value
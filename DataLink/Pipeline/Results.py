@@ -0,0 +1,231 @@
+import pandas as pd
+import pyarrow as pa
+
+import os
+import shutil
+import weakref
+import tempfile
+import threading
+
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from DataLink.Pipeline.Store import ResultStore
+from DataLink.Pipeline.View import TableView
+
+
+DEFAULT_MEMORY_BUDGET = 2 * 1024 * 1024 * 1024
+
+
+@dataclass
+class ResultEntry:
+    """ A stored node output: in memory while output is set, otherwise spilled to the Arrow IPC file at path.
+    stored is whether that file belongs to the ResultStore rather than to the results. inputs names the outputs a view
+    selects from.
+    """
+    fingerprint: str
+    output: pd.DataFrame
+    size: int
+    shape: tuple = (0, 0)
+    path: str = None
+    stored: bool = False
+    inputs: tuple = ()
+
+
+class NodeResults:
+    """ Outputs kept between runs of a graph, by node name, each with the fingerprint of the node that produced it.
+
+    A run given the results of the previous one reuses every output whose node still has the same fingerprint, so
+    only the nodes whose settings, input files or upstream nodes changed are run again. invalidate drops the outputs
+    held for nodes, which then run again unless the result store has their fingerprint.
+
+    The outputs held in memory are kept under memory_budget bytes, counted from the Arrow buffers behind their
+    columns. Past the budget the least recently used outputs are spilled to uncompressed Arrow IPC files in
+    directory (a temporary folder removed with the results by default) and memory-mapped back when next read.
+
+    With a result_store every output is also written to the store, which then holds its spill file, and an output
+    missing from memory is looked up there, so the unchanged stages of a graph are reused across sessions.
+
+    Outputs that are views of another output (see TableView) are neither spilled nor written to the store: they are
+    cheaper to compute again from their fingerprint than to write out, so past the budget they are dropped instead. A
+    view only counts the selection and columns of its own; the buffers it shares with the outputs it selects from are
+    counted once, by their own entries. Those outputs are only spilled once their views are dropped, since the views
+    would otherwise keep the buffers in memory.
+    """
+    def __init__(
+            self,
+            memory_budget: int = DEFAULT_MEMORY_BUDGET,
+            directory: str = None,
+            result_store: ResultStore = None
+    ):
+        self.memory_budget = memory_budget
+        self.directory = directory
+        self.result_store = result_store
+        self.entries = OrderedDict()
+        self.memory_used = 0
+        self.spills = 0
+        self.reloads = 0
+        self._lock = threading.RLock()
+
+    def find(self, name: str, fingerprint: str) -> ResultEntry:
+        """ The entry of name if it was last run with fingerprint, None otherwise. A spilled output is not read back
+        until it is loaded.
+        """
+        with self._lock:
+            entry = self.entries.get(name)
+            if entry is not None and entry.output is None and not os.path.exists(entry.path):
+                self.invalidate([name])
+                entry = None
+            if (entry is None or entry.fingerprint != fingerprint) and self.result_store is not None:
+                entry = self.find_stored(name, fingerprint)
+            if entry is None or entry.fingerprint != fingerprint:
+                return None
+            self.entries.move_to_end(name)
+            return entry
+
+    def find_stored(self, name: str, fingerprint: str) -> ResultEntry:
+        stored = self.result_store.find(fingerprint)
+        if stored is None:
+            return None
+        self.invalidate([name])
+        entry = ResultEntry(fingerprint, None, stored.size, (stored.rows, stored.columns), stored.path, True)
+        self.entries[name] = entry
+        return entry
+
+    def load(self, name: str):
+        """ The stored output of name whatever its fingerprint, None if there is none """
+        with self._lock:
+            entry = self.entries.get(name)
+            return self.use_entry(name, entry) if entry is not None else None
+
+    def store(self, name: str, fingerprint: str, output, node_type: str = '', inputs: list = ()) -> None:
+        """ Keeps output as the output of name. inputs are the nodes it was computed from, which a view selects from """
+        with self._lock:
+            self.invalidate([name])
+            shape = output.shape if output is not None else (0, 0)
+            entry = ResultEntry(fingerprint, output, get_output_size(output), shape)
+            if isinstance(output, TableView):
+                entry.inputs = tuple(inputs)
+            if self.result_store is not None and output is not None and not isinstance(output, TableView):
+                entry.path = self.result_store.store(fingerprint, output, name, node_type)
+                entry.stored = True
+            self.entries[name] = entry
+            self.memory_used += entry.size
+            self.evict(name)
+
+    def invalidate(self, names) -> None:
+        """ Drops the outputs of names along with the views that select from them """
+        with self._lock:
+            pending = list(names)
+            while pending:
+                name = pending.pop()
+                entry = self.entries.pop(name, None)
+                if entry is not None:
+                    self.drop_entry(entry)
+                    pending.extend(view for view, other in self.entries.items() if name in other.inputs)
+
+    def retain(self, names) -> None:
+        """ Drops the outputs of nodes not in names, such as nodes removed from the graph """
+        with self._lock:
+            self.invalidate(set(self.entries) - set(names))
+
+    def clear(self) -> None:
+        self.invalidate(list(self.entries))
+
+    def get_spilled_size(self) -> int:
+        with self._lock:
+            return sum(os.path.getsize(entry.path) for entry in self.entries.values() if entry.path is not None)
+
+    def get_held(self, name: str) -> set:
+        """ name and the outputs it selects from, directly or through other views """
+        with self._lock:
+            held = set()
+            pending = [name] if name is not None else []
+            while pending:
+                name = pending.pop()
+                if name not in held:
+                    held.add(name)
+                    entry = self.entries.get(name)
+                    pending.extend(entry.inputs if entry is not None else ())
+            return held
+
+    def get_usage(self) -> int:
+        """ Bytes of the outputs held in memory """
+        return self.memory_used
+
+    def summary(self) -> str:
+        return 'Node results: {0} outputs, {1:.1f} of {2:.1f} MB in memory, {3:.1f} MB spilled'.format(
+            len(self.entries), self.memory_used / 1024 ** 2, self.memory_budget / 1024 ** 2,
+            self.get_spilled_size() / 1024 ** 2
+        ) + ', {0} spills, {1} reloads'.format(self.spills, self.reloads)
+
+    def use_entry(self, name: str, entry: ResultEntry):
+        """ Marks name as the most recently used and returns its output, read back from its spill file if needed """
+        self.entries.move_to_end(name)
+        if entry.output is None and entry.path is not None:
+            entry.output = pa.ipc.open_file(pa.memory_map(entry.path)).read_all().to_pandas()
+            entry.size = get_output_size(entry.output)
+            self.memory_used += entry.size
+            self.reloads += 1
+            self.evict(name)
+        return entry.output
+
+    def evict(self, keep: str = None) -> None:
+        """ Frees the least recently used outputs other than keep and those it selects from until the memory used is
+        within the budget. Views are dropped, along with the views that select from them, and other outputs are
+        spilled once the views that select from them are dropped.
+        """
+        with self._lock:
+            if self.memory_used <= self.memory_budget:
+                return
+            held = self.get_held(keep)
+            for name, entry in list(self.entries.items()):
+                if self.memory_used <= self.memory_budget:
+                    break
+                if name in held or self.entries.get(name) is not entry or entry.output is None:
+                    continue
+                if isinstance(entry.output, TableView):
+                    self.invalidate([name])
+                elif entry.size > 0:
+                    self.invalidate([view for view, other in self.entries.items() if name in other.inputs])
+                    self.spill(name, entry)
+
+    def spill(self, name: str, entry: ResultEntry) -> None:
+        if entry.path is None:
+            handle, entry.path = tempfile.mkstemp('.arrow', 'node-', self.get_directory())
+            os.close(handle)
+            table = pa.Table.from_pandas(entry.output)
+            with pa.OSFile(entry.path, 'wb') as file:
+                with pa.ipc.new_file(file, table.schema) as writer:
+                    writer.write_table(table)
+            self.spills += 1
+        entry.output = None
+        self.memory_used -= entry.size
+
+    def drop_entry(self, entry: ResultEntry) -> None:
+        if entry.output is not None:
+            self.memory_used -= entry.size
+        if entry.path is not None and not entry.stored:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+    def get_directory(self) -> str:
+        if self.directory is None:
+            self.directory = tempfile.mkdtemp(prefix='DataLink-results-')
+            weakref.finalize(self, shutil.rmtree, self.directory, True)
+        else:
+            os.makedirs(self.directory, exist_ok=True)
+        return self.directory
+
+
+def get_output_size(output) -> int:
+    """ Bytes held by a node output. Arrow backed columns report the size of their Arrow buffers, and views the size
+    of what they add to the table they select from.
+    """
+    if output is None:
+        return 0
+    if isinstance(output, TableView):
+        return output.get_size()
+    return int(output.memory_usage(deep=True).sum())
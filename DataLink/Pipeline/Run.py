@@ -0,0 +1,77 @@
+""" Headless runner: executes a saved node graph from the command line, without a display
+
+Neither PyQt6 nor any other DataLink.GUI module is imported, so the runner starts in the time it takes to import
+pandas and pyarrow. Node messages are printed as the graph runs, followed by a timing summary of every node. Independent
+branches of the graph run at the same time. Node outputs are kept in the result store (see DataLink.Pipeline.Store),
+so running a graph again only runs the nodes that changed since.
+
+Example
+-------
+python -m DataLink.Pipeline.Run pipeline.json --workers 4 --branches 2 --timings timings.json
+"""
+
+import time
+
+START = time.perf_counter()
+
+import sys
+import json
+import argparse
+
+from DataLink.Pipeline.Graph import load_graph
+from DataLink.Pipeline.Engine import run_graph
+from DataLink.Pipeline.Results import NodeResults
+from DataLink.Pipeline.Store import DEFAULT_STORE_DIRECTORY, ResultStore
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description='Run a saved DataLink node graph without the GUI')
+    parser.add_argument('graph', help='node graph saved as JSON')
+    parser.add_argument('--workers', type=int, default=None, help='threads per import (default: one per core)')
+    parser.add_argument('--branches', type=int, default=None, help='nodes run at once (default: one per core)')
+    parser.add_argument('--store', default=DEFAULT_STORE_DIRECTORY, help='folder of the stored node outputs')
+    parser.add_argument('--no-store', action='store_true', help='run every node instead of reusing stored outputs')
+    parser.add_argument('--timings', default=None, help='write the timing summary to this file as JSON')
+    args = parser.parse_args(argv)
+
+    graph = load_graph(args.graph)
+    results = NodeResults(result_store=ResultStore(args.store)) if not args.no_store else None
+    startup = time.perf_counter() - START
+    try:
+        _, timings = run_graph(graph, args.workers, branches=args.branches, results=results)
+    except Exception as ex:
+        print('Run failed: {0}: {1}'.format(type(ex).__name__, ex), file=sys.stderr)
+        return 1
+    total = time.perf_counter() - START
+
+    print(format_summary(timings, startup, total))
+    if args.timings:
+        with open(args.timings, 'w', encoding='utf-8') as file:
+            json.dump({
+                'Startup': startup,
+                'Total': total,
+                'Nodes': [timing.to_dict() for timing in timings]
+            }, file, indent=2)
+    return 0
+
+
+def format_summary(timings: list, startup: float, total: float) -> str:
+    """ One line per node in the order they finished, Start counted from the end of the startup. Nodes of separate
+    branches overlap, so Total is the wall time of the run rather than the sum of the node times. Nodes reused from
+    the result store are marked stored.
+    """
+    lines = ['{0:<24} {1:<12} {2:>10} {3:>10} {4:>12} {5:>8}'.format(
+        'Node', 'Type', 'Start', 'Seconds', 'Rows', 'Columns'
+    )]
+    lines.append('{0:<24} {1:<12} {2:>10} {3:>10.3f}'.format('(startup)', '', '', startup))
+    for timing in timings:
+        lines.append('{0:<24} {1:<12} {2:>10.3f} {3:>10.3f} {4:>12} {5:>8} {6}'.format(
+            timing.name, timing.type, timing.start, timing.seconds, timing.rows, timing.columns,
+            'stored' if timing.cached else ''
+        ).rstrip())
+    lines.append('{0:<24} {1:<12} {2:>10} {3:>10.3f}'.format('Total', '', '', total))
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
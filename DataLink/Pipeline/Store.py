@@ -0,0 +1,179 @@
+""" Persistent store of node outputs, shared by the GUI and the headless runner across sessions
+
+Outputs are written under a key derived from the node fingerprint (its type, settings, input files and the
+fingerprints of its inputs), so an unchanged stage of any graph is found again after a restart and memory-mapped
+instead of being recomputed. The store is kept under a total size and entries unused for too long are removed.
+
+Example
+-------
+python -m DataLink.Pipeline.Store inspect
+python -m DataLink.Pipeline.Store gc --max-age 7 --max-size 2048
+"""
+
+import pandas as pd
+import pyarrow as pa
+
+import os
+import sys
+import time
+import argparse
+
+from pathlib import Path
+from functools import lru_cache
+from dataclasses import dataclass
+
+from DataLink.DataTool.Cache import ArrowStore
+
+
+# Bump when a change to the node types alters the outputs they produce
+STORE_FORMAT_VERSION = 2
+
+DEFAULT_STORE_DIRECTORY = str(Path.home() / '.cache' / 'DataLink' / 'results')
+DEFAULT_STORE_SIZE = 8 * 1024 * 1024 * 1024
+DEFAULT_STORE_AGE = 30 * 24 * 60 * 60
+
+
+@dataclass
+class StoreEntry:
+    """ An output in the store: used is the time it was last written or read, node and type the node that wrote it """
+    key: str
+    path: str
+    size: int
+    used: float
+    node: str = ''
+    type: str = ''
+    rows: int = 0
+    columns: int = 0
+
+
+class ResultStore(ArrowStore):
+    """ Content addressed store of node outputs.
+
+    Entries are keyed by a hash of the node fingerprint and written as Arrow IPC files that a hit memory-maps (see
+    ArrowStore). The node, its type and the shape of the output are kept in the schema metadata for inspection.
+    collect removes the entries unused for more than max_age seconds, then the least recently used ones until the
+    store fits in max_size bytes.
+    """
+    name = 'Result store'
+    format_version = STORE_FORMAT_VERSION
+
+    def __init__(
+            self,
+            directory: str = DEFAULT_STORE_DIRECTORY,
+            max_size: int = DEFAULT_STORE_SIZE,
+            max_age: float = DEFAULT_STORE_AGE
+    ):
+        super().__init__(directory, max_size, max_age)
+
+    def find(self, fingerprint: str) -> StoreEntry:
+        """ The entry written for fingerprint, None if the store has none """
+        return self.use(self.get_key(fingerprint), read_entry)
+
+    def store(self, fingerprint: str, output: pd.DataFrame, node: str = '', node_type: str = '') -> str:
+        """ Writes output under fingerprint and returns the path of its file """
+        table = pa.Table.from_pandas(output)
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}),
+            b'datalink.node': node.encode(),
+            b'datalink.type': node_type.encode(),
+            b'datalink.rows': str(output.shape[0]).encode(),
+            b'datalink.columns': str(output.shape[1]).encode()
+        })
+        return self.write(self.get_key(fingerprint), table)
+
+    def get_entries(self) -> list:
+        """ Every entry of the store, most recently used first """
+        entries = []
+        for entry in self.scan():
+            try:
+                entries.append(read_entry(entry.path))
+            except (OSError, pa.ArrowInvalid):
+                continue
+        return sorted(entries, key=lambda entry: entry.used, reverse=True)
+
+
+def read_entry(path: str) -> StoreEntry:
+    """ The StoreEntry of the file at path, read from its footer without loading the data """
+    with pa.memory_map(path) as source:
+        metadata = pa.ipc.open_file(source).schema.metadata or {}
+    stat = os.stat(path)
+    return StoreEntry(
+        os.path.basename(path)[:-len('.arrow')],
+        path,
+        stat.st_size,
+        stat.st_mtime,
+        metadata.get(b'datalink.node', b'').decode(),
+        metadata.get(b'datalink.type', b'').decode(),
+        int(metadata.get(b'datalink.rows', 0)),
+        int(metadata.get(b'datalink.columns', 0))
+    )
+
+
+def get_result_store() -> ResultStore:
+    """ The result store shared by every graph run in the session """
+    return __get_result_store()
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description='Inspect or clean the DataLink store of node outputs')
+    parser.add_argument('--directory', default=DEFAULT_STORE_DIRECTORY, help='store folder')
+    commands = parser.add_subparsers(dest='command', required=True)
+    inspect_parser = commands.add_parser('inspect', help='show the store usage and its entries')
+    inspect_parser.add_argument('--limit', type=int, default=20, help='entries listed (default: 20)')
+    gc_parser = commands.add_parser('gc', help='remove old entries and shrink the store')
+    gc_parser.add_argument('--max-age', type=float, default=None, help='days an unused entry is kept')
+    gc_parser.add_argument('--max-size', type=float, default=None, help='megabytes the store is kept under')
+    args = parser.parse_args(argv)
+
+    store = ResultStore(args.directory)
+    if args.command == 'gc':
+        removed, freed = store.collect(
+            args.max_age * 24 * 60 * 60 if args.max_age is not None else None,
+            int(args.max_size * 1024 ** 2) if args.max_size is not None else None
+        )
+        print('Removed {0} entries, {1:.1f} MB freed, {2:.1f} MB left'.format(
+            removed, freed / 1024 ** 2, store.get_usage() / 1024 ** 2
+        ))
+        return 0
+
+    print(format_entries(store, store.get_entries(), args.limit))
+    return 0
+
+
+def format_entries(store: ResultStore, entries: list, limit: int) -> str:
+    lines = ['{0}: {1} entries, {2:.1f} MB of {3:.1f} MB'.format(
+        store.directory, len(entries), sum(entry.size for entry in entries) / 1024 ** 2, store.max_size / 1024 ** 2
+    )]
+    sizes = {}
+    for entry in entries:
+        count, size = sizes.get(entry.type, (0, 0))
+        sizes[entry.type] = (count + 1, size + entry.size)
+    for node_type, (count, size) in sorted(sizes.items(), key=lambda item: -item[1][1]):
+        lines.append('  {0:<12} {1:>6} entries {2:>10.1f} MB'.format(node_type or '(unknown)', count, size / 1024 ** 2))
+    if entries:
+        lines.append('')
+        lines.append('{0:<24} {1:<12} {2:>12} {3:>8} {4:>10} {5:<19} {6}'.format(
+            'Node', 'Type', 'Rows', 'Columns', 'MB', 'Last used', 'Key'
+        ))
+    for entry in entries[:limit]:
+        lines.append('{0:<24} {1:<12} {2:>12} {3:>8} {4:>10.1f} {5:<19} {6}'.format(
+            entry.node, entry.type, entry.rows, entry.columns, entry.size / 1024 ** 2,
+            time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(entry.used)), entry.key
+        ))
+    if len(entries) > limit:
+        lines.append('... {0} more'.format(len(entries) - limit))
+    return '\n'.join(lines)
+
+
+"""
+Private helper functions
+"""
+
+
+@lru_cache(maxsize=None)
+def __get_result_store() -> ResultStore:
+    return ResultStore()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
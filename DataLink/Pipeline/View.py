@@ -0,0 +1,125 @@
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from typing import Any, Union
+from dataclasses import dataclass
+
+from DataLink.DataTool.Filter import coerce_value
+
+
+@dataclass(frozen=True)
+class TableView:
+    """ Rows of an Arrow table selected without copying them: the rows of table where selection is set, or every row
+    when selection is None. index is the pandas index of every row of table.
+
+    Filter and replace nodes output views of the table of their input, so a chain of them shares one set of column
+    buffers and only adds a selection bitmap (one bit per row of table) or the columns a replace rewrote, named in
+    replaced. The rows are copied out only by to_table and to_pandas, at the nodes that need them contiguous.
+    """
+    table: pa.Table
+    index: pd.Index
+    selection: pa.BooleanArray = None
+    replaced: tuple = ()
+
+    @property
+    def shape(self) -> tuple:
+        rows = self.table.num_rows if self.selection is None else self.selection.true_count
+        return rows, self.table.num_columns
+
+    def select(self, selection: pa.BooleanArray) -> 'TableView':
+        """ The rows of this view also set in selection, a bitmap over the rows of table """
+        if self.selection is not None:
+            selection = pc.and_(self.selection, selection)
+        return TableView(self.table, self.index, selection)
+
+    def replace(self, columns: list, selection: pa.BooleanArray, value: Any) -> 'TableView':
+        """ This view with value in columns at the rows set in selection. Each replaced column is rebuilt over the
+        rows of table; the other columns stay shared.
+        """
+        table = self.table
+        for column_name in columns:
+            position = table.schema.get_field_index(column_name)
+            if position < 0:
+                raise KeyError(column_name)
+            table = table.set_column(
+                position, table.field(position), replace_values(table.column(position), selection, value)
+            )
+        return TableView(table, self.index, self.selection, tuple(columns))
+
+    def to_table(self) -> pa.Table:
+        return self.table if self.selection is None else self.table.filter(self.selection)
+
+    def to_pandas(self) -> pd.DataFrame:
+        dataset = self.to_table().to_pandas()
+        if self.selection is None:
+            dataset.index = self.index
+        else:
+            dataset.index = self.index[self.selection.to_numpy(zero_copy_only=False)]
+        return dataset
+
+    def get_size(self) -> int:
+        """ Bytes held by this view alone: its selection and the columns it replaced """
+        size = self.selection.nbytes if self.selection is not None else 0
+        return size + sum(self.table.column(column_name).nbytes for column_name in self.replaced)
+
+
+def get_view(dataset: Union[pd.DataFrame, TableView]) -> TableView:
+    """ dataset as a view of all its rows. Arrow backed columns are shared with the DataFrame. """
+    if isinstance(dataset, TableView):
+        return dataset
+    return TableView(pa.Table.from_pandas(dataset, preserve_index=False), dataset.index)
+
+
+def to_dataframe(dataset: Union[pd.DataFrame, TableView]) -> pd.DataFrame:
+    return dataset.to_pandas() if isinstance(dataset, TableView) else dataset
+
+
+def to_table(dataset: Union[pd.DataFrame, TableView]) -> pa.Table:
+    return dataset.to_table() if isinstance(dataset, TableView) else pa.Table.from_pandas(dataset, preserve_index=False)
+
+
+def replace_values(column: pa.ChunkedArray, selection: pa.BooleanArray, value: Any) -> pa.ChunkedArray:
+    """ column with value at the rows set in selection, keeping its type. As with a pandas Categorical, a dictionary
+    column only takes a missing value or one of its categories. Text is converted to the type of the column first.
+    """
+    missing = value is None or value is pd.NA
+    value = coerce_value(column.type, value)
+    chunks = []
+    offset = 0
+    for chunk in column.chunks:
+        mask = selection.slice(offset, len(chunk))
+        offset += len(chunk)
+        if isinstance(chunk, pa.DictionaryArray):
+            chunks.append(pa.DictionaryArray.from_arrays(
+                pc.if_else(mask, __get_category(chunk, value, missing), chunk.indices), chunk.dictionary
+            ))
+        else:
+            chunks.append(pc.if_else(mask, __get_scalar(chunk.type, value, missing), chunk))
+    return pa.chunked_array(chunks, type=column.type)
+
+
+"""
+Private helper functions
+"""
+
+
+def __get_scalar(data_type: pa.DataType, value: Any, missing: bool) -> pa.Scalar:
+    try:
+        if isinstance(value, pa.Scalar):
+            return value.cast(data_type)
+        return pa.scalar(None if missing else value, type=data_type)
+    except (pa.ArrowTypeError, pa.ArrowInvalid, TypeError, ValueError) as ex:
+        raise TypeError('Cannot replace {0} values with {1!r}: {2}'.format(data_type, value, ex)) from None
+
+
+def __get_category(chunk: pa.DictionaryArray, value: Any, missing: bool) -> pa.Scalar:
+    if missing:
+        return pa.scalar(None, type=chunk.indices.type)
+    try:
+        position = pc.index(chunk.dictionary, value).as_py()
+    except (pa.ArrowTypeError, pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        position = -1
+    if position < 0:
+        raise TypeError('Cannot replace with {0!r}, which is not one of the categories of the column'.format(value))
+    return pa.scalar(position, type=chunk.indices.type)
@@ -1,2 +1,15 @@
-from .GUI.Core import Main
-from .DataTool import Preprocess
+import importlib
+
+
+# Submodules reachable as attributes of the package, imported on first use so that headless code such as
+# DataLink.Pipeline.Run never loads PyQt6
+LAZY_MODULES = {
+    'Main': 'DataLink.GUI.Core.Main',
+    'Preprocess': 'DataLink.DataTool.Preprocess'
+}
+
+
+def __getattr__(name: str):
+    if name in LAZY_MODULES:
+        return importlib.import_module(LAZY_MODULES[name])
+    raise AttributeError('module {0!r} has no attribute {1!r}'.format(__name__, name))
@@ -0,0 +1,87 @@
+""" Benchmark: validation rules evaluated per distinct value against per row
+
+Builds string columns with a small number of distinct values (50 by default) and validates them with a numeric check,
+a date format check, character removal and a value set check. The dictionary domain path is compared with the per-row
+path by disabling the automatic cardinality threshold.
+
+Example
+-------
+python benchmark/dictionary_domain.py --rows 10000000 --distinct 50
+"""
+
+import argparse
+import contextlib
+import io
+import time
+
+import numpy as np
+import pyarrow as pa
+
+import DataLink.DataTool.Validation as validation
+
+
+def create_column(rows: int, values: list, generator: np.random.Generator) -> pa.Array:
+    indices = pa.array(generator.integers(0, len(values), rows).astype('int32'))
+    return pa.DictionaryArray.from_arrays(indices, pa.array(values, type=pa.string())).dictionary_decode()
+
+
+def create_table(rows: int, distinct: int) -> pa.Table:
+    generator = np.random.default_rng(0)
+    codes = [str(value) for value in range(distinct - 2)] + ['n/a', '9x']
+    dates = ['2023-{0:02d}-{1:02d}'.format(value % 12 + 1, value % 28 + 1) for value in range(distinct - 1)]
+    return pa.table({
+        'code': create_column(rows, codes, generator),
+        'date': create_column(rows, dates + ['2023-13-01'], generator),
+        'amount': create_column(rows, ['{0}$'.format(value) for value in range(distinct)], generator)
+    })
+
+
+def create_plan(distinct: int) -> validation.ValidationPlan:
+    rule = {
+        'Bound Check': None,
+        'Value Check': None,
+        'Numeric Check': False,
+        'Date Format Check': None,
+        'Remove Characters': None,
+        'Remove Missing': False
+    }
+    return validation.compile_validation({
+        'code': dict(rule, **{'Numeric Check': True, 'Value Check': [str(value) for value in range(distinct // 2)]}),
+        'date': dict(rule, **{'Date Format Check': '%Y-%m-%d'}),
+        'amount': dict(rule, **{'Remove Characters': ['$'], 'Numeric Check': True})
+    })
+
+
+def best_of(runs: int, function) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Dictionary domain validation benchmark')
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--distinct', type=int, default=50)
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    table = create_table(args.rows, args.distinct)
+    plan = create_plan(args.distinct)
+
+    domain = best_of(args.runs, lambda: validation.apply_validation(plan, table))
+    threshold = validation.DOMAIN_MIN_ROWS
+    validation.DOMAIN_MIN_ROWS = args.rows + 1
+    per_row = best_of(args.runs, lambda: validation.apply_validation(plan, table))
+    validation.DOMAIN_MIN_ROWS = threshold
+
+    print('Rows: {0}, distinct values per column: {1}'.format(args.rows, args.distinct))
+    print('Per row evaluation:        {0:.3f}s'.format(per_row))
+    print('Dictionary domain:         {0:.3f}s ({1:.1f}x)'.format(domain, per_row / domain))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+""" Benchmark: node graph run one node at a time against independent branches run at the same time
+
+Writes the UNICEF test file (repeated to a configurable size) to a temporary folder and builds a graph of several
+independent branches, each an import of that file followed by a filter and a replace. The graph is run serially and
+with one thread per branch, without a result store, and the best of several runs is printed. run_graph runs branches
+at the same time on one thread per core, so this is the check that they are faster on the machine at hand.
+
+Example
+-------
+python benchmark/graph_branches.py --repeat 20 --count 4
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+
+from DataLink.Pipeline.Graph import Graph, NodeSpec
+from DataLink.Pipeline.Engine import run_graph
+
+
+ROOT = Path(__file__).parent.parent
+DATA = ROOT / 'test' / 'data' / 'UNICEF04 R6 Final.csv'
+SCHEMA = ROOT / 'test' / 'input' / 'import_schema.csv'
+
+
+"""
+Benchmark helpers
+"""
+
+
+def write_dataset(directory: str, repeat: int) -> str:
+    table = pa_csv.read_csv(str(DATA))
+    filepath = os.path.join(directory, 'dataset.csv')
+    pa_csv.write_csv(pa.concat_tables([table] * repeat), filepath)
+    return filepath
+
+
+def create_graph(filepath: str, count: int) -> Graph:
+    nodes = []
+    for branch in range(count):
+        name = 'branch {0}'.format(branch)
+        nodes.append(NodeSpec(name + ' import', 'csv_import', [], {'dataset': filepath, 'schema': str(SCHEMA)}))
+        nodes.append(NodeSpec(name + ' filter', 'filter', [name + ' import'], {
+            'filters': [{'columns': ['Q16'], 'comparison': 'is', 'value': None}], 'keep': False
+        }))
+        nodes.append(NodeSpec(name + ' replace', 'replace', [name + ' filter'], {
+            'filters': [{'columns': ['Q8_2'], 'comparison': 'more than', 'value': 5}], 'value': 5
+        }))
+    return Graph(nodes)
+
+
+def best_of(runs: int, function) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Node graph branch benchmark')
+    parser.add_argument('--repeat', type=int, default=20, help='number of copies of the UNICEF file per import')
+    parser.add_argument('--count', type=int, default=4, help='number of independent branches in the graph')
+    parser.add_argument('--runs', type=int, default=3, help='timed runs per setting')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        graph = create_graph(write_dataset(directory, args.repeat), args.count)
+        serial = best_of(args.runs, lambda: run_graph(graph, branches=1))
+        parallel = best_of(args.runs, lambda: run_graph(graph, branches=args.count))
+
+    print('Cores:                     {0}'.format(os.cpu_count()))
+    print('Branches in graph:         {0}'.format(args.count))
+    print('One node at a time:        {0:.3f}s'.format(serial))
+    print('Branches at the same time: {0:.3f}s ({1:.2f}x)'.format(parallel, serial / parallel))
+
+
+if __name__ == '__main__':
+    main()
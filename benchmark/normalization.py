@@ -0,0 +1,69 @@
+""" Benchmark: Arrow text normalization against the previous pandas lambdas
+
+Builds string columns with surrounding whitespace and blank cells, then times the previous
+dataset.apply(lambda x: x.str.strip()) / x.replace(r'^\\s*$', pd.NA, regex=True) pair against
+Preprocess.normalize_text, serially and with one worker per core.
+
+Example
+-------
+python benchmark/normalization.py --sizes 10000 100000 1000000 10000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+import DataLink.DataTool.Preprocess as pr
+
+
+VALUES = np.array(['1', ' 2', '3 ', '  ', '', 'survey', ' text value ', '42'], dtype=object)
+
+
+def create_table(rows: int, columns: int) -> pa.Table:
+    generator = np.random.default_rng(0)
+    return pa.table({
+        'column_{0}'.format(index): pa.array(VALUES[generator.integers(0, len(VALUES), rows)], type=pa.string())
+        for index in range(columns)
+    })
+
+
+def legacy_normalize(dataset: pd.DataFrame) -> pd.DataFrame:
+    dataset = dataset.apply(lambda x: x.str.strip())
+    dataset = dataset.apply(lambda x: x.replace(r'^\s*$', pd.NA, regex=True))
+    return dataset
+
+
+def best_of(runs: int, function) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Text normalization benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000, 10_000_000])
+    parser.add_argument('--columns', type=int, default=4)
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    print('{0:>10} {1:>12} {2:>12} {3:>12} {4:>9}'.format('rows', 'pandas', 'arrow', 'arrow (mt)', 'speedup'))
+    for rows in args.sizes:
+        table = create_table(rows, args.columns)
+        dataset = table.to_pandas(types_mapper=lambda data_type: pd.StringDtype('pyarrow'))
+
+        legacy = best_of(args.runs, lambda: legacy_normalize(dataset))
+        serial = best_of(args.runs, lambda: pr.normalize_text(table, 1))
+        parallel = best_of(args.runs, lambda: pr.normalize_text(table, None))
+        print('{0:>10} {1:>11.4f}s {2:>11.4f}s {3:>11.4f}s {4:>8.1f}x'.format(
+            rows, legacy, serial, parallel, legacy / min(serial, parallel)
+        ))
+
+
+if __name__ == '__main__':
+    main()
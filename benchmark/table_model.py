@@ -0,0 +1,112 @@
+""" Benchmark: viewport cell access in PandasModel against the previous iloc based model
+
+Builds frames of the same length and increasing width, then times rowCount and the formatting of a 40 x 10 cell
+viewport at random scroll positions, cold (first visit) and warm (second visit). The previous model is timed on one
+viewport row only, and its rowCount (which materialises every cell) only for frames up to --legacy-cells cells.
+
+Example
+-------
+QT_QPA_PLATFORM=offscreen python benchmark/table_model.py --rows 1000000 --widths 5 20 100
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from PyQt6.QtCore import Qt, QAbstractTableModel, QVariant
+from PyQt6.QtWidgets import QApplication
+
+from DataLink.GUI.Support.Helper import PandasModel
+
+
+VIEWPORT_ROWS = 40
+VIEWPORT_COLUMNS = 10
+
+
+class LegacyPandasModel(QAbstractTableModel):
+    def __init__(self, data: pd.DataFrame):
+        super().__init__()
+        self._data = data
+
+    def rowCount(self, parent=None):
+        return len(self._data.values)
+
+    def columnCount(self, parent=None):
+        return self._data.columns.size
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if index.isValid():
+            if role == Qt.ItemDataRole.DisplayRole or role == Qt.ItemDataRole.EditRole:
+                # The previous model indexed the row Series with [column], which pandas 3 treats as a label
+                return QVariant(str(self._data.iloc[index.row()].iloc[index.column()]))
+        return QVariant()
+
+
+def create_frame(rows: int, columns: int) -> pd.DataFrame:
+    generator = np.random.default_rng(0)
+    data = {}
+    for index in range(columns):
+        if index % 2 == 0:
+            data['column_{0}'.format(index)] = pd.array(generator.integers(0, 100, rows), dtype='int64[pyarrow]')
+        else:
+            data['column_{0}'.format(index)] = pd.array(generator.random(rows), dtype='float64[pyarrow]')
+    return pd.DataFrame(data)
+
+
+def time_viewports(model: QAbstractTableModel, columns: int, positions: list, viewport_rows: int) -> float:
+    """ Mean microseconds per cell """
+    cells = 0
+    start = time.perf_counter()
+    for first_row, first_column in positions:
+        for row in range(first_row, first_row + viewport_rows):
+            for column in range(first_column, min(first_column + VIEWPORT_COLUMNS, columns)):
+                model.data(model.index(row, column))
+                cells += 1
+    return (time.perf_counter() - start) / cells * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Table model benchmark')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--widths', type=int, nargs='+', default=[5, 20, 100])
+    parser.add_argument('--viewports', type=int, default=5)
+    parser.add_argument('--legacy-cells', type=int, default=20_000_000)
+    args = parser.parse_args()
+
+    application = QApplication(sys.argv)
+    generator = np.random.default_rng(1)
+    print('{0:>7} {1:>13} {2:>13} {3:>13} {4:>13} {5:>13}'.format(
+        'width', 'rowCount old', 'rowCount new', 'cell old', 'cell cold', 'cell warm'
+    ))
+    for width in args.widths:
+        frame = create_frame(args.rows, width)
+        positions = [
+            (int(generator.integers(0, args.rows - VIEWPORT_ROWS)), int(generator.integers(0, width)))
+            for _ in range(args.viewports)
+        ]
+        legacy = LegacyPandasModel(frame)
+        model = PandasModel(frame, fetch_size=args.rows)
+
+        legacy_count = float('nan')
+        if args.rows * width <= args.legacy_cells:
+            start = time.perf_counter()
+            legacy.rowCount()
+            legacy_count = time.perf_counter() - start
+        start = time.perf_counter()
+        model.rowCount()
+        model_count = time.perf_counter() - start
+
+        legacy_cell = time_viewports(legacy, width, positions[:1], 1)
+        cold = time_viewports(model, width, positions, VIEWPORT_ROWS)
+        warm = time_viewports(model, width, positions, VIEWPORT_ROWS)
+        print('{0:>7} {1:>12.4f}s {2:>12.6f}s {3:>11.1f}us {4:>11.1f}us {5:>11.1f}us'.format(
+            width, legacy_count, model_count, legacy_cell, cold, warm
+        ))
+    application.quit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+""" Benchmark: compiled validation plan against the previous per-rule pandas checks
+
+Runs both implementations over the UNICEF test file (repeated to a configurable size) with the validation
+instructions in test/input/validation_schema.csv and prints the best of several runs.
+
+Example
+-------
+python benchmark/validation_plan.py --repeat 20
+"""
+
+import argparse
+import contextlib
+import io
+import time
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+
+import DataLink.DataTool.Preprocess as pr
+from DataLink.DataTool.Validation import compile_validation, apply_validation
+
+
+ROOT = Path(__file__).parent.parent
+DATA = ROOT / 'test' / 'data' / 'UNICEF04 R6 Final.csv'
+VALIDATION = ROOT / 'test' / 'input' / 'validation_schema.csv'
+
+
+"""
+Previous implementation: every check and enforce pair recomputes its own mask
+"""
+
+
+def legacy_validate(dataset: pd.DataFrame, validation_instruction: dict) -> pd.DataFrame:
+    for key, value in validation_instruction.items():
+        if value['Numeric Check']:
+            legacy_check_numeric(dataset[key])
+            dataset[key] = legacy_enforce_numeric(dataset[key])
+        if value['Bound Check']:
+            legacy_check_bounds(dataset[key], value['Bound Check'][0], value['Bound Check'][1])
+            dataset[key] = legacy_enforce_bounds(dataset[key], value['Bound Check'][0], value['Bound Check'][1])
+        if value['Remove Missing']:
+            dataset = dataset.drop(dataset[dataset[key].isnull()].index)
+    return dataset
+
+
+def legacy_check_numeric(column: pd.Series):
+    if column.loc[~column.str.isnumeric()].shape[0] > 0:
+        print(column.loc[~column.str.isnumeric()].value_counts().to_string())
+        print((~column.str.isnumeric()).sum())
+
+
+def legacy_enforce_numeric(column: pd.Series) -> pd.Series:
+    output = column.copy()
+    if column.loc[~column.str.isnumeric()].shape[0] > 0:
+        print((~column.str.isnumeric()).sum())
+        if (~column.str.isnumeric()).sum() > 0:
+            output.loc[~column.str.isnumeric()] = pd.NA
+    return output
+
+
+def legacy_check_bounds(column: pd.Series, lower_bound: int, upper_bound: int):
+    column_copy = pd.to_numeric(column)
+    if column[(column_copy < lower_bound) | (column_copy > upper_bound)].shape[0] > 0:
+        print(column[(column_copy < lower_bound) | (column_copy > upper_bound)].value_counts().to_string())
+        print(((column_copy < lower_bound) | (column_copy > upper_bound)).sum())
+
+
+def legacy_enforce_bounds(column: pd.Series, lower_bound: int, upper_bound: int) -> pd.Series:
+    column_copy = pd.to_numeric(column)
+    output = column.copy()
+    if column[(column_copy < lower_bound) | (column_copy > upper_bound)].shape[0] > 0:
+        if ((column_copy < lower_bound) | (column_copy > upper_bound)).sum() > 0:
+            output.loc[((column_copy < lower_bound) | (column_copy > upper_bound))] = pd.NA
+    return output
+
+
+"""
+Benchmark helpers
+"""
+
+
+def load_table(repeat: int) -> pa.Table:
+    columns = pa_csv.read_csv(str(DATA)).column_names
+    table = pa_csv.read_csv(str(DATA), convert_options=pa_csv.ConvertOptions(
+        column_types={column: pa.string() for column in columns},
+        null_values=pr.NA_VALUES,
+        strings_can_be_null=True
+    ))
+    for index, column in enumerate(table.columns):
+        column = pc.utf8_trim_whitespace(column)
+        table = table.set_column(index, columns[index], pc.if_else(pc.equal(column, ''), None, column))
+    return pa.concat_tables([table] * repeat)
+
+
+def best_of(runs: int, function) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compiled validation plan benchmark')
+    parser.add_argument('--repeat', type=int, default=20, help='number of copies of the UNICEF file to validate')
+    parser.add_argument('--runs', type=int, default=5, help='timed runs per implementation')
+    args = parser.parse_args()
+
+    instructions = pr.convert_validation(pr.read_validation(str(VALIDATION)))
+    table = load_table(args.repeat)
+    dataset = table.to_pandas(types_mapper=lambda data_type: pd.StringDtype('pyarrow'))
+
+    legacy = best_of(args.runs, lambda: legacy_validate(dataset.copy(), instructions))
+    compiled = best_of(args.runs, lambda: apply_validation(compile_validation(instructions), table))
+    cached_plan = compile_validation(instructions)
+    cached = best_of(args.runs, lambda: apply_validation(cached_plan, table))
+
+    print('Rows validated:            {0}'.format(table.num_rows))
+    print('Per-rule pandas checks:    {0:.3f}s'.format(legacy))
+    print('Validation plan:           {0:.3f}s ({1:.1f}x)'.format(compiled, legacy / compiled))
+    print('Cached validation plan:    {0:.3f}s ({1:.1f}x)'.format(cached, legacy / cached))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import DataLink.DataTool.Preprocess as pr
+from DataLink.Pipeline.Graph import Graph, NodeSpec
+
+
+ROOT = Path(__file__).parent
+
+
+@pytest.fixture(scope='session')
+def data_file() -> Path:
+    return ROOT / 'data' / 'UNICEF04 R6 Final.csv'
+
+
+@pytest.fixture(scope='session')
+def schema_file() -> Path:
+    return ROOT / 'input' / 'import_schema.csv'
+
+
+@pytest.fixture(scope='session')
+def validation_file() -> Path:
+    return ROOT / 'input' / 'validation_schema.csv'
+
+
+@pytest.fixture(scope='session')
+def config(schema_file) -> pd.DataFrame:
+    return pr.read_config(str(schema_file))
+
+
+@pytest.fixture(scope='session')
+def validation(validation_file) -> dict:
+    return pr.convert_validation(pr.read_validation(str(validation_file)))
+
+
+@pytest.fixture
+def pipeline(data_file, schema_file, validation_file) -> Graph:
+    """ An import of the test file, a filter of its rows and a replace in the rows it kept """
+    return Graph([
+        NodeSpec('import', 'csv_import', settings={
+            'dataset': str(data_file), 'schema': str(schema_file), 'validation': str(validation_file)
+        }),
+        NodeSpec('filter', 'filter', ['import'], {
+            'filters': [{'columns': ['Q16'], 'comparison': 'more than', 'value': '0'}]
+        }),
+        NodeSpec('replace', 'replace', ['filter'], {
+            'filters': [{'columns': ['Q16'], 'comparison': 'is', 'value': '2'}], 'value': '5'
+        })
+    ])
@@ -0,0 +1,50 @@
+import io
+import shutil
+
+import pandas as pd
+import pytest
+
+import DataLink.DataTool.Preprocess as pr
+from DataLink.DataTool.Cache import ImportCache, KeyLookup
+
+
+@pytest.fixture(scope='module')
+def dataset(data_file, config, validation) -> pd.DataFrame:
+    return pr.read_data(str(data_file), config, validation, logger=io.StringIO(), compact_types=True)
+
+
+def test_round_trip(tmp_path, dataset, data_file, schema_file, validation_file):
+    cache = ImportCache(str(tmp_path))
+    key = cache.get_key(str(data_file), str(schema_file), str(validation_file))
+    assert cache.load(key) is None
+
+    cache.store(key, dataset)
+    pd.testing.assert_frame_equal(cache.load(key), dataset)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_key_follows_files_and_options(tmp_path, data_file, schema_file, validation_file):
+    cache = ImportCache(str(tmp_path))
+    key = cache.get_key(str(data_file), str(schema_file))
+    assert cache.get_key(str(data_file), str(schema_file)) == key
+    assert cache.get_key(str(data_file), str(schema_file), options='compact') != key
+    assert cache.get_key(str(data_file), str(validation_file)) != key
+
+    copy = tmp_path / 'copy.csv'
+    shutil.copyfile(data_file, copy)
+    assert cache.get_key(str(copy), str(schema_file)) == key
+    copy.write_bytes(data_file.read_bytes() + b'\n')
+    assert cache.get_key(str(copy), str(schema_file)) != key
+
+
+def test_key_lookup_counts_misses_and_reports_hits(tmp_path, dataset, data_file, schema_file):
+    cache = ImportCache(str(tmp_path))
+    hits = []
+    lookup = KeyLookup(cache, (str(data_file), str(schema_file)), on_hit=lambda: hits.append(True))
+    key = lookup.get_key()
+    assert not lookup.is_hit() and (cache.hits, cache.misses) == (0, 1)
+
+    cache.store(key, dataset)
+    lookup = KeyLookup(cache, (str(data_file), str(schema_file)), on_hit=lambda: hits.append(True))
+    assert lookup.get_key() == key and lookup.is_hit() and hits == [True]
+    assert cache.load(key) is not None and (cache.hits, cache.misses) == (1, 1)
@@ -0,0 +1,22 @@
+import pandas as pd
+
+from DataLink.DataTool.Cleaning import replace_value
+from DataLink.DataTool.Filter import ComparisonFlag, FilterInstruction
+
+
+def test_replace_value_matches_any_filter():
+    dataframe = pd.DataFrame({
+        'count': pd.array([1, 2, 3, 4, 5], dtype='int64[pyarrow]'),
+        'code': pd.array(['a', 'b', 'c', 'd', 'e'], dtype='string[pyarrow]')
+    })
+    original = dataframe.copy()
+    main_filter = FilterInstruction(['count'], [ComparisonFlag.LESS], 2)
+    additional_filter = [FilterInstruction(['code'], [ComparisonFlag.SAME], 'd')]
+
+    replaced = replace_value(dataframe, main_filter, 0, additional_filter)
+    assert list(replaced['count']) == [0, 2, 3, 0, 5]
+    assert list(replaced['code']) == list(original['code'])
+    assert len(additional_filter) == 1
+    pd.testing.assert_frame_equal(dataframe, original)
+
+    assert list(replace_value(dataframe, main_filter, 0)['count']) == [0, 2, 3, 4, 5]
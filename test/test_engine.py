@@ -0,0 +1,108 @@
+import io
+import json
+
+import pandas as pd
+import pytest
+
+from DataLink.Pipeline.Engine import check_graph, get_run_order, run_graph
+from DataLink.Pipeline.Graph import Graph, NodeSpec
+from DataLink.Pipeline.Results import NodeResults
+from DataLink.Pipeline.Store import ResultStore
+from DataLink.Pipeline.View import to_dataframe
+
+
+def run(graph: Graph, **options) -> tuple:
+    return run_graph(graph, log=io.StringIO(), **options)
+
+
+def test_run_order_puts_inputs_first(pipeline):
+    graph = Graph(list(reversed(pipeline.nodes)))
+    assert [node.name for node in get_run_order(graph)] == ['import', 'filter', 'replace']
+
+
+@pytest.mark.parametrize('nodes, message', [
+    ([NodeSpec('a', 'filter', ['b']), NodeSpec('b', 'filter', ['a'])], 'cycle: a -> b -> a'),
+    ([NodeSpec('a', 'filter', ['missing'])], 'not in the graph'),
+    ([NodeSpec('a', 'filter')], 'reads 0 inputs'),
+    ([NodeSpec('a', 'export', ['b'], {'path': 'out.csv'}), NodeSpec('b', 'filter', ['a'])], 'cycle'),
+    ([NodeSpec('a', 'unknown')], 'unknown type')
+])
+def test_check_graph_rejects_invalid_graphs(nodes, message):
+    with pytest.raises(ValueError, match=message):
+        check_graph(Graph(nodes))
+
+
+def test_check_graph_rejects_reading_an_export(pipeline):
+    pipeline.nodes.append(NodeSpec('export', 'export', ['replace'], {'path': 'out.csv'}))
+    pipeline.nodes.append(NodeSpec('after', 'filter', ['export']))
+    with pytest.raises(ValueError, match='which has no output'):
+        check_graph(pipeline)
+
+
+def test_outputs_follow_the_graph(pipeline, tmp_path):
+    pipeline.nodes.append(NodeSpec('export', 'export', ['replace'], {'path': str(tmp_path / 'out.csv')}))
+    outputs, timings = run(pipeline)
+    imported, filtered, replaced = (to_dataframe(outputs[name]) for name in ('import', 'filter', 'replace'))
+
+    assert [timing.name for timing in timings] == ['import', 'filter', 'replace', 'export']
+    assert outputs['export'] is None and (tmp_path / 'out.csv').exists()
+    assert (filtered['Q16'] > 0).all() and len(filtered) == (imported['Q16'] > 0).sum()
+    assert (replaced['Q16'] == 5).sum() == (filtered['Q16'] == 2).sum() and not (replaced['Q16'] == 2).any()
+    assert (timings[1].rows, timings[1].columns) == filtered.shape
+
+
+def test_branches_match_serial_run(pipeline):
+    branch = [NodeSpec('second ' + node.name, node.type, ['second ' + name for name in node.inputs], node.settings)
+              for node in pipeline.nodes]
+    graph = Graph(pipeline.nodes + branch)
+    serial, _ = run(graph, branches=1)
+    parallel, timings = run(graph, branches=4)
+
+    assert len(timings) == 6
+    for name in serial:
+        pd.testing.assert_frame_equal(to_dataframe(parallel[name]), to_dataframe(serial[name]))
+    pd.testing.assert_frame_equal(to_dataframe(parallel['second replace']), to_dataframe(serial['replace']))
+
+
+def test_failed_branch_stops_the_run(pipeline, tmp_path):
+    pipeline.nodes.append(NodeSpec('broken', 'csv_import', settings={
+        'dataset': str(tmp_path / 'missing.csv'), 'schema': pipeline.nodes[0].settings['schema']
+    }))
+    with pytest.raises(FileNotFoundError):
+        run(pipeline, branches=2)
+
+
+def test_unchanged_nodes_are_reused(pipeline, data_file, tmp_path):
+    results = NodeResults()
+    outputs, _ = run(pipeline, results=results)
+    assert set(outputs) == {'import', 'filter', 'replace'}
+
+    outputs, timings = run(pipeline, results=results)
+    assert outputs == {} and all(timing.cached for timing in timings)
+
+    pipeline.nodes[2].settings['value'] = '6'
+    outputs, timings = run(pipeline, results=results)
+    assert list(outputs) == ['replace'] and [timing.cached for timing in timings] == [True, True, False]
+    assert (to_dataframe(outputs['replace'])['Q16'] == 6).any()
+
+    copy = tmp_path / 'copy.csv'
+    copy.write_bytes(data_file.read_bytes())
+    pipeline.nodes[0].settings['dataset'] = str(copy)
+    outputs, timings = run(pipeline, results=results)
+    assert not any(timing.cached for timing in timings)
+
+
+def test_reused_import_writes_its_report(pipeline, tmp_path):
+    report = tmp_path / 'report.json'
+    pipeline.nodes[0].settings['report'] = str(report)
+    store = ResultStore(str(tmp_path / 'store'))
+    results = NodeResults(result_store=store)
+    run(pipeline, results=results)
+    expected = json.loads(report.read_text(encoding='utf-8'))
+    assert expected and all(rule['Violations'] > 0 for rule in expected)
+
+    # Reused from memory, then from the store by a new session
+    for results in (results, NodeResults(result_store=store)):
+        report.unlink()
+        _, timings = run(Graph(pipeline.nodes[:1]), results=results)
+        assert timings[0].cached and json.loads(report.read_text(encoding='utf-8')) == expected
@@ -0,0 +1,55 @@
+import io
+
+import pandas as pd
+import pytest
+
+import DataLink.DataTool.Preprocess as pr
+from DataLink.DataTool.Filter import ComparisonFlag, FilterInstruction, filter_by, filter_data_by
+
+
+SAME = ComparisonFlag.SAME
+LESS = ComparisonFlag.LESS
+MORE = ComparisonFlag.MORE
+
+
+@pytest.fixture(scope='module')
+def dataset(data_file, config) -> pd.DataFrame:
+    """ The test file with missing values in an integer, a float and a text column, so the masks cover nulls """
+    dataset = pr.read_data(str(data_file), config, logger=io.StringIO())
+    dataset.index = dataset.index + 100
+    for column_name in ['Province', 'Q8_2', 'Q6_2_1']:
+        dataset.loc[dataset.index[::7], column_name] = pd.NA
+    return dataset
+
+
+def get_mask(mask: pd.Series) -> pd.Series:
+    return mask.fillna(False).astype(bool)
+
+
+@pytest.mark.parametrize('column_name, flags, value, expected', [
+    ('Province', [SAME], 2, lambda column: column == 2),
+    ('Province', [MORE], 5, lambda column: column > 5),
+    ('Province', [LESS], 5, lambda column: column < 5),
+    ('Province', [SAME, MORE], 5, lambda column: column >= 5),
+    ('Province', [SAME, LESS], 5, lambda column: column <= 5),
+    ('Province', [SAME], None, lambda column: column.isna()),
+    ('Province', [SAME], [1, 5, 8], lambda column: column.isin([1, 5, 8])),
+    ('Province', [ComparisonFlag.BETWEEN], [2, 5], lambda column: (column >= 2) & (column <= 5)),
+    ('Q8_2', [MORE], 0.5, lambda column: column > 0.5),
+    ('Q8_2', [MORE], '5', lambda column: column > 5),
+    ('Q6_2_1', [SAME], None, lambda column: column.isna()),
+    ('Q6_2_1', [SAME], '1,3', lambda column: column == '1,3'),
+    ('Q6_2_1', [LESS], '1,2', lambda column: column < '1,2')
+])
+def test_filter_matches_pandas_mask(dataset, column_name, flags, value, expected):
+    selection = filter_by(dataset, FilterInstruction([column_name], flags, value))
+    pd.testing.assert_series_equal(selection, get_mask(expected(dataset[column_name])), check_names=False)
+
+
+def test_filters_match_any_column_and_instruction(dataset):
+    selection = filter_data_by(dataset, [
+        FilterInstruction(['Province', 'Q8_2'], [MORE], 6),
+        FilterInstruction(['Q6_2_1'], [SAME], None)
+    ])
+    expected = get_mask(dataset['Province'] > 6) | get_mask(dataset['Q8_2'] > 6) | dataset['Q6_2_1'].isna()
+    pd.testing.assert_series_equal(selection, expected, check_names=False)
@@ -0,0 +1,46 @@
+import io
+
+import pyarrow as pa
+import pytest
+
+import DataLink.DataTool.Preprocess as pr
+from DataLink.DataTool.Inference import CATEGORICAL_NA_FILL, infer_column_types
+
+
+def infer(values: list) -> tuple:
+    return infer_column_types(pa.table({'column': pa.array(values, pa.string())}))[0]
+
+
+@pytest.mark.parametrize('values, expected', [
+    (['1', '-20', None, '300'], ('integer', 'NA')),
+    (['1.5', '2', None], ('float', 'NA')),
+    (['2023-01-02', None, '2024-12-31'], ('date', 'NA')),
+    (['10:30', '23:59'], ('time', 'NA')),
+    (['a', 'b', 'a', 'b', None], ('categorical', CATEGORICAL_NA_FILL)),
+    (['a', 'b', 'a', 'b'], ('categorical', 'NA')),
+    (['alpha', 'beta', 'gamma'], ('text', 'NA')),
+    ([None, None], ('text', 'NA'))
+])
+def test_infer_column_types(values, expected):
+    assert infer(values) == expected
+
+
+@pytest.mark.parametrize('values', [['00501', '12345'], ['1', '007'], ['-01.5', '2']])
+def test_leading_zeros_stay_text(values):
+    assert infer(values)[0] not in ('integer', 'float')
+
+
+def test_inferred_schema_reads_test_file(data_file):
+    sample = pr.read_sample(str(data_file), 500)
+    schema = pr.create_schema(sample.column_names, sample)
+    assert list(schema['ColNames']) == sample.column_names
+    assert 'integer' in set(schema['ColTypes'])
+
+    dataset = pr.read_data(str(data_file), schema, logger=io.StringIO())
+    assert dataset.shape[1] == len(sample.column_names)
+
+
+def test_schema_is_text_without_sample(data_file):
+    sample = pr.read_sample(str(data_file), 1)
+    schema = pr.create_schema(sample.column_names)
+    assert set(schema['ColTypes']) == {'text'} and set(schema['NAFill']) == {'NA'}
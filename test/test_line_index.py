@@ -0,0 +1,56 @@
+from pathlib import Path
+
+import pytest
+
+import DataLink.DataTool.Preprocess as pr
+from DataLink.DataTool.LineIndex import build_line_index
+
+
+def write(tmp_path: Path, content: bytes) -> str:
+    filepath = tmp_path / 'rows.csv'
+    filepath.write_bytes(content)
+    return str(filepath)
+
+
+@pytest.mark.parametrize('trailing_newline', [True, False])
+@pytest.mark.parametrize('stride', [1, 3, 1024])
+def test_offsets_match_csv_rows(tmp_path, trailing_newline, stride):
+    rows = ['{0},"value {0}",{1}'.format(row, row * 2) for row in range(20)]
+    content = ('a,b,c\n' + '\n'.join(rows) + ('\n' if trailing_newline else '')).encode()
+    line_index = build_line_index(write(tmp_path, content), stride)
+    try:
+        assert line_index.rows == len(rows)
+        offsets = [line_index.get_offset(row) for row in range(line_index.rows)]
+        assert offsets == [content.index(row.encode()) for row in rows]
+        assert line_index.get_offset(line_index.rows) == len(content)
+    finally:
+        line_index.close()
+
+
+@pytest.mark.parametrize('trailing_newline', [True, False])
+def test_quoted_line_breaks_do_not_end_rows(tmp_path, trailing_newline):
+    content = ('a,b\n1,"two\nlines"\n2,"say ""hi""\nthere"\n3,plain' + ('\n' if trailing_newline else '')).encode()
+    line_index = build_line_index(write(tmp_path, content), 2)
+    try:
+        assert line_index.rows == 3
+        assert [line_index.get_offset(row) for row in range(3)] == [4, content.index(b'2,'), content.index(b'3,')]
+        table = pr.read_rows(line_index.filepath, line_index, 1, 2)
+        assert table.column('b').to_pylist() == ['say "hi"\nthere', 'plain']
+    finally:
+        line_index.close()
+
+
+def test_offsets_of_test_file(data_file):
+    content = data_file.read_bytes()
+    line_index = build_line_index(str(data_file), 100)
+    try:
+        lines = content.split(b'\n')
+        expected = []
+        position = len(lines[0]) + 1
+        for line in lines[1:]:
+            if position < len(content):
+                expected.append(position)
+            position += len(line) + 1
+        assert [line_index.get_offset(row) for row in range(line_index.rows)] == expected
+    finally:
+        line_index.close()
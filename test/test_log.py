@@ -0,0 +1,40 @@
+import io
+import threading
+
+from DataLink.DataTool.Log import ImportLog, get_import_log
+
+
+def test_messages_are_lines_in_file_sinks(tmp_path):
+    filepath = tmp_path / 'import.log'
+    with open(filepath, 'w', encoding='utf-8') as file:
+        log = ImportLog('test', file)
+        log.write('first')
+        log.write('second')
+    assert filepath.read_text(encoding='utf-8').splitlines() == ['first', 'second']
+    assert log.messages == 2
+
+
+def test_messages_are_printed_without_sink(capsys):
+    ImportLog().write('message')
+    assert capsys.readouterr().out == 'message\n'
+
+
+def test_get_import_log_wraps_sinks_once():
+    sink = io.StringIO()
+    log = get_import_log(sink, 'test')
+    assert get_import_log(log) is log and log.sink is sink
+
+
+def test_concurrent_messages_stay_whole():
+    sink = io.StringIO()
+    log = ImportLog(sink=sink)
+    threads = [
+        threading.Thread(target=lambda number=number: [log.write('thread {0}'.format(number)) for _ in range(200)])
+        for number in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    lines = sink.getvalue().splitlines()
+    assert len(lines) == 800 and set(lines) == {'thread {0}'.format(number) for number in range(4)}
@@ -0,0 +1,51 @@
+import io
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import DataLink.DataTool.Preprocess as pr
+
+
+@pytest.fixture(scope='module')
+def read(config, validation):
+    def read(filepath: Path, **options) -> pd.DataFrame:
+        options.setdefault('logger', io.StringIO())
+        return pr.read_data(str(filepath), config, validation, **options)
+    return read
+
+
+@pytest.fixture(scope='module')
+def expected(read, data_file) -> pd.DataFrame:
+    return read(data_file)
+
+
+@pytest.fixture(scope='module')
+def repeated(tmp_path_factory, data_file) -> Path:
+    """ The test file with its rows repeated past the 1 MB minimum block size, so streaming reads several batches """
+    lines = data_file.read_text(encoding='utf-8').splitlines(keepends=True)
+    filepath = tmp_path_factory.mktemp('data') / 'repeated.csv'
+    filepath.write_text(lines[0] + ''.join(lines[1:]) * 8, encoding='utf-8')
+    return filepath
+
+
+def test_streaming_matches_whole_read(read, data_file, expected):
+    pd.testing.assert_frame_equal(read(data_file, streaming=True), expected)
+
+
+def test_streaming_batches_match_whole_read(read, repeated):
+    log = io.StringIO()
+    streamed = read(repeated, streaming=True, memory_limit=1024 * 1024, logger=log)
+    assert log.getvalue().count('Processing batch') > 1
+    pd.testing.assert_frame_equal(streamed, read(repeated))
+
+
+@pytest.mark.parametrize('streaming', [False, True])
+def test_workers_match_single_thread(read, data_file, expected, streaming):
+    pd.testing.assert_frame_equal(read(data_file, streaming=streaming, workers=4), expected)
+
+
+def test_compact_types_keep_values(read, data_file, expected):
+    compact = read(data_file, compact_types=True)
+    assert compact.memory_usage(deep=True).sum() < expected.memory_usage(deep=True).sum()
+    pd.testing.assert_frame_equal(compact, expected, check_dtype=False, check_categorical=False)
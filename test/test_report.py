@@ -0,0 +1,65 @@
+import io
+
+import pandas as pd
+import pytest
+
+import DataLink.DataTool.Preprocess as pr
+from DataLink.DataTool.Report import REPORT_SAMPLE_ROWS, HeavyHitters, ValidationReport
+
+
+@pytest.fixture(scope='module')
+def late_failure(tmp_path_factory):
+    """ A file whose integer column only fails to parse (a blank cell) in its last row, after several streamed
+    batches were validated, with a text column violating its value check on every third row
+    """
+    rows = 300000
+    filepath = tmp_path_factory.mktemp('data') / 'late_failure.csv'
+    lines = ['{0},{1}\n'.format(row, 'abc'[row % 3]) for row in range(rows)]
+    filepath.write_text('count,code\n' + ''.join(lines) + '   ,a\n', encoding='utf-8')
+    config = pd.DataFrame({
+        'ColNames': ['count', 'code'], 'ColTypes': ['integer', 'text'], 'NAFill': ['0', 'NA']
+    }, dtype='string[pyarrow]')
+    validation = {
+        'code': {
+            'Bound Check': None, 'Value Check': ['a', 'b'], 'Numeric Check': False, 'Date Format Check': None,
+            'Remove Characters': None, 'Remove Missing': False
+        }
+    }
+    return filepath, config, validation, rows // 3
+
+
+def test_heavy_hitters_keep_frequent_values():
+    heavy_hitters = HeavyHitters(capacity=2)
+    heavy_hitters.update(['a', 'b', 'c', 'a'], [10, 1, 1, 5])
+    assert heavy_hitters.top(1) == [('a', 15)] and len(heavy_hitters.counters) == 2
+
+
+def test_report_adds_batches():
+    report = ValidationReport()
+    report.add('code', 'Value', 3, ['c', 'd'], [2, 1], list(range(3)))
+    report.add('code', 'Value', REPORT_SAMPLE_ROWS, ['c'], [REPORT_SAMPLE_ROWS], list(range(REPORT_SAMPLE_ROWS)))
+    report.add('count', 'Bounds', 1, [200], [1], [7])
+    assert report.get_violations() == [('code', 'Value', 3 + REPORT_SAMPLE_ROWS), ('count', 'Bounds', 1)]
+
+    rules = report.to_dataframe()
+    assert list(rules['Column']) == ['code', 'count']
+    assert rules['TopValues'][0][0] == ['c', 2 + REPORT_SAMPLE_ROWS]
+    assert len(rules['SampleRows'][0]) == REPORT_SAMPLE_ROWS
+    assert '"Violations": 1' in report.to_json()
+
+    report.reset()
+    assert report.get_violations() == [] and report.to_dict() == []
+
+
+@pytest.mark.parametrize('streaming', [False, True])
+def test_report_counts_once_when_a_column_is_demoted(late_failure, streaming):
+    filepath, config, validation, violations = late_failure
+    report = ValidationReport()
+    log = io.StringIO()
+    pr.read_data(
+        str(filepath), config, validation, log, streaming=streaming, memory_limit=1024 * 1024, report=report
+    )
+    assert 'could not be parsed as' in log.getvalue()
+    if streaming:
+        assert log.getvalue().count('Processing batch') > 1
+    assert report.get_violations() == [('code', 'Value', violations)]
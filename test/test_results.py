@@ -0,0 +1,82 @@
+import io
+
+import pandas as pd
+import pytest
+
+import DataLink.DataTool.Preprocess as pr
+from DataLink.Pipeline.Engine import run_graph
+from DataLink.Pipeline.Graph import NodeSpec
+from DataLink.Pipeline.Results import NodeResults, get_output_size
+from DataLink.Pipeline.View import to_dataframe
+
+
+@pytest.fixture(scope='module')
+def dataset(data_file, config, validation) -> pd.DataFrame:
+    return pr.read_data(str(data_file), config, validation, logger=io.StringIO())
+
+
+def test_outputs_over_budget_are_spilled_and_reloaded(tmp_path, dataset):
+    size = get_output_size(dataset)
+    results = NodeResults(int(size * 3.5), str(tmp_path))
+    for name in 'abc':
+        results.store(name, name, dataset.copy())
+    assert results.memory_used <= results.memory_budget and results.spills == 0
+
+    results.store('d', 'd', dataset.copy())
+    assert results.entries['a'].output is None and results.spills == 1
+    assert results.memory_used <= results.memory_budget and results.get_spilled_size() > 0
+
+    pd.testing.assert_frame_equal(results.load('a'), dataset)
+    assert results.reloads == 1 and results.entries['b'].output is None
+    assert results.memory_used <= results.memory_budget
+    assert '1 reloads' in results.summary()
+
+
+def test_find_matches_fingerprints(tmp_path, dataset):
+    results = NodeResults(directory=str(tmp_path))
+    results.store('a', 'first', dataset)
+    assert results.find('a', 'first').shape == dataset.shape
+    assert results.find('a', 'second') is None and results.find('b', 'first') is None
+
+
+def test_invalidate_removes_spill_files(tmp_path, dataset):
+    results = NodeResults(1, str(tmp_path))
+    results.store('a', 'a', dataset)
+    results.store('b', 'b', dataset)
+    assert len(list(tmp_path.iterdir())) == 1
+
+    results.retain(['b'])
+    assert list(results.entries) == ['b'] and list(tmp_path.iterdir()) == []
+    results.clear()
+    assert results.entries == {} and results.memory_used == 0
+
+
+def test_views_are_dropped_to_keep_the_budget(pipeline, tmp_path):
+    expected, _ = run_graph(pipeline, log=io.StringIO())
+    for budget in (1, get_output_size(expected['import']) // 2):
+        results = NodeResults(budget, str(tmp_path))
+        run_graph(pipeline, log=io.StringIO(), results=results)
+        assert results.get_usage() <= budget and results.spills == 1
+        assert list(results.entries) == ['import'] and results.entries['import'].output is None
+
+        outputs, timings = run_graph(pipeline, log=io.StringIO(), results=results)
+        assert [timing.cached for timing in timings] == [True, False, False] and results.get_usage() <= budget
+        pd.testing.assert_frame_equal(to_dataframe(outputs['replace']), to_dataframe(expected['replace']))
+
+
+def test_dropped_views_are_computed_again_when_read(pipeline, tmp_path):
+    results = NodeResults(directory=str(tmp_path))
+    expected, _ = run_graph(pipeline, log=io.StringIO(), results=results)
+    results.memory_budget = results.get_usage() - get_output_size(expected['replace']) + 1
+
+    pipeline.nodes.insert(2, NodeSpec('other filter', 'filter', ['import'], pipeline.nodes[1].settings))
+    pipeline.nodes[3].settings['value'] = '6'
+    log = io.StringIO()
+    outputs, timings = run_graph(pipeline, log=log, results=results)
+    assert [timing.name for timing in timings if not timing.cached] == ['other filter', 'replace']
+    assert 'Running filter' in log.getvalue()
+
+    replaced = to_dataframe(expected['filter'])
+    replaced.loc[replaced['Q16'] == 2, 'Q16'] = 6
+    pd.testing.assert_frame_equal(to_dataframe(outputs['replace']), replaced)
+    assert results.get_usage() <= results.memory_budget
@@ -0,0 +1,70 @@
+import os
+import time
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from DataLink.DataTool.Cache import ArrowStore, ImportCache
+from DataLink.Pipeline.Store import ResultStore, main
+
+
+@pytest.fixture
+def output() -> pd.DataFrame:
+    return pd.DataFrame({'count': range(1000), 'code': ['a', 'b'] * 500})
+
+
+def set_used(path: str, seconds_ago: float) -> None:
+    used = time.time() - seconds_ago
+    os.utime(path, (used, used))
+
+
+def test_outputs_are_found_by_fingerprint(tmp_path, output):
+    store = ResultStore(str(tmp_path))
+    assert store.find('fingerprint') is None
+
+    path = store.store('fingerprint', output, 'Filter 1', 'filter')
+    entry = store.find('fingerprint')
+    assert entry.path == path and (entry.node, entry.type, entry.rows, entry.columns) == ('Filter 1', 'filter', 1000, 2)
+    assert store.find('other') is None and (store.hits, store.misses) == (1, 2)
+    assert [file.name for file in tmp_path.iterdir()] == [os.path.basename(path)]
+    assert store.summary().startswith('Result store: 1 hits, 2 misses')
+
+
+def test_stores_do_not_share_keys(tmp_path):
+    assert ResultStore(str(tmp_path)).get_key('a') != ImportCache(str(tmp_path)).get_key(options='a')
+    assert ResultStore(str(tmp_path)).get_key('a') != ResultStore(str(tmp_path)).get_key('b')
+
+
+def test_collect_removes_old_then_least_recently_used_entries(tmp_path, output):
+    store = ResultStore(str(tmp_path))
+    paths = [store.store(str(number), output) for number in range(4)]
+    for number, path in enumerate(paths):
+        set_used(path, 1000 - number)
+    size = os.path.getsize(paths[0])
+
+    assert store.collect(max_age=999.5) == (1, size) and not os.path.exists(paths[0])
+    assert store.collect(max_size=2 * size) == (1, size) and not os.path.exists(paths[1])
+    assert [entry.path for entry in store.get_entries()] == paths[:1:-1]
+    assert store.get_usage() == 2 * size
+
+
+def test_store_is_kept_under_its_size(tmp_path, output):
+    store = ArrowStore(str(tmp_path), max_size=1)
+    path = store.write(store.get_key('a'), pa.Table.from_pandas(output))
+    assert not os.path.exists(path) and store.get_usage() == 0 and list(tmp_path.iterdir()) == []
+
+
+def test_inspect_and_gc_commands(tmp_path, output, capsys):
+    store = ResultStore(str(tmp_path))
+    set_used(store.store('a', output, 'Import 1', 'csv_import'), 10 * 24 * 60 * 60)
+    store.store('b', output, 'Filter 2', 'filter')
+
+    assert main(['--directory', str(tmp_path), 'inspect']) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].startswith('{0}: 2 entries'.format(tmp_path))
+    assert lines[-1].startswith('Import 1') and lines[-2].startswith('Filter 2')
+
+    assert main(['--directory', str(tmp_path), 'gc', '--max-age', '7']) == 0
+    assert capsys.readouterr().out.startswith('Removed 1 entries')
+    assert [entry.node for entry in store.get_entries()] == ['Filter 2']
@@ -0,0 +1,100 @@
+import io
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+import DataLink.DataTool.Preprocess as pr
+from DataLink.DataTool.Report import ValidationReport
+from DataLink.DataTool.Validation import compile_validation, apply_validation
+
+
+def legacy_validate(dataset: pd.DataFrame, validation_instruction: dict) -> tuple:
+    """ The per-rule pandas checks the plan replaced: the validated text columns and the violations of every rule """
+    violations = {}
+    for key, value in validation_instruction.items():
+        column = dataset[key]
+        for character in value['Remove Characters'] or []:
+            column = column.str.replace(character, '', regex=False)
+        rules = []
+        if value['Numeric Check']:
+            rules.append(('Numeric', lambda values: ~values.str.isnumeric()))
+        if value['Bound Check']:
+            lower_bound, upper_bound = value['Bound Check']
+            rules.append(('Bounds', lambda values: (pd.to_numeric(values) < lower_bound) |
+                                                   (pd.to_numeric(values) > upper_bound)))
+        if value['Value Check']:
+            rules.append(('Value', lambda values: ~values.isin(value['Value Check'])))
+        if value['Date Format Check']:
+            rules.append(('DateTime', lambda values: pd.to_datetime(
+                values, format=value['Date Format Check'], errors='coerce'
+            ).isna()))
+        for check, rule in rules:
+            mask = rule(column).fillna(False).astype(bool) & column.notna()
+            if mask.sum() > 0:
+                violations[(key, check)] = int(mask.sum())
+            column = column.mask(mask)
+        dataset[key] = column
+        if value['Remove Missing']:
+            dataset = dataset[dataset[key].notna()]
+    return dataset, violations
+
+
+def validate(dataset: pd.DataFrame, validation_instruction: dict, workers: int = 1) -> tuple:
+    report = ValidationReport()
+    table, keep = apply_validation(
+        compile_validation(validation_instruction),
+        pa.Table.from_pandas(dataset, preserve_index=False),
+        workers,
+        log=io.StringIO(),
+        report=report
+    )
+    validated = table.to_pandas(types_mapper=lambda data_type: pd.StringDtype('pyarrow'))
+    validated.index = dataset.index
+    if keep is not None:
+        validated = validated[keep.to_numpy(zero_copy_only=False)]
+    violations = {
+        (rule_report.column, rule_report.check): rule_report.violations for rule_report in report.rules.values()
+    }
+    return validated, violations
+
+
+def assert_same_validation(dataset: pd.DataFrame, validation_instruction: dict, workers: int = 1) -> None:
+    expected, expected_violations = legacy_validate(dataset.copy(), validation_instruction)
+    validated, violations = validate(dataset, validation_instruction, workers)
+    pd.testing.assert_frame_equal(validated, expected, check_dtype=False)
+    assert violations and violations == expected_violations
+
+
+def test_plan_matches_legacy_checks_on_test_file(data_file, validation):
+    dataset = pr.read_csv(str(data_file))
+    assert_same_validation(dataset, validation)
+
+
+@pytest.mark.parametrize('workers', [1, 4])
+def test_plan_matches_legacy_checks_on_every_rule(workers):
+    dataset = pd.DataFrame({
+        'count': ['1', '12', 'x', None, '150', '7'],
+        'code': ['a', 'b', 'c', 'a', None, 'd'],
+        'date': ['2023-01-02', '2023-13-01', None, 'soon', '2022-12-31', '2023-02-28'],
+        'price': ['$5', '$10', '11', '$x', '3', None]
+    }, dtype=pd.StringDtype('pyarrow'))
+    validation_instruction = {
+        'count': {
+            'Bound Check': [0, 100], 'Value Check': None, 'Numeric Check': True, 'Date Format Check': None,
+            'Remove Characters': None, 'Remove Missing': False
+        },
+        'code': {
+            'Bound Check': None, 'Value Check': ['a', 'b'], 'Numeric Check': False, 'Date Format Check': None,
+            'Remove Characters': None, 'Remove Missing': False
+        },
+        'date': {
+            'Bound Check': None, 'Value Check': None, 'Numeric Check': False, 'Date Format Check': '%Y-%m-%d',
+            'Remove Characters': None, 'Remove Missing': False
+        },
+        'price': {
+            'Bound Check': None, 'Value Check': None, 'Numeric Check': True, 'Date Format Check': None,
+            'Remove Characters': ['$'], 'Remove Missing': True
+        }
+    }
+    assert_same_validation(dataset, validation_instruction, workers)
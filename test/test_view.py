@@ -0,0 +1,62 @@
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from DataLink.Pipeline.View import TableView, get_view, replace_values, to_dataframe, to_table
+
+
+def get_addresses(column: pa.ChunkedArray) -> list:
+    return [buffer.address for chunk in column.chunks for buffer in chunk.buffers() if buffer is not None]
+
+
+@pytest.fixture
+def dataset() -> pd.DataFrame:
+    return pd.DataFrame({
+        'count': pd.array([1, 2, 3, 4, None, 6], dtype='int64[pyarrow]'),
+        'code': pd.array(['a', 'b', 'a', 'c', 'b', None], dtype='string[pyarrow]')
+    }, index=pd.RangeIndex(10, 16))
+
+
+def test_selections_compose_without_copying(dataset):
+    view = get_view(dataset)
+    selected = view.select(pa.array([True, True, False, True, True, True])).select(
+        pa.array([False, True, True, True, False, True])
+    )
+    assert selected.table is view.table and selected.shape == (3, 2)
+    assert selected.get_size() == selected.selection.nbytes
+    pd.testing.assert_frame_equal(to_dataframe(selected), dataset.iloc[[1, 3, 5]])
+    assert to_table(selected).num_rows == 3 and get_view(selected) is selected
+
+
+def test_replace_rebuilds_only_the_replaced_columns(dataset):
+    view = get_view(dataset).select(pa.array([True] * 5 + [False]))
+    replaced = view.replace(['count'], pa.array([True, False, True, False, True, True]), '9')
+    assert replaced.replaced == ('count',) and replaced.selection is view.selection
+    assert get_addresses(replaced.table.column('code')) == get_addresses(view.table.column('code'))
+    assert get_addresses(replaced.table.column('count')) != get_addresses(view.table.column('count'))
+    assert replaced.get_size() == view.selection.nbytes + replaced.table.column('count').nbytes
+
+    expected = dataset.iloc[:5].copy()
+    expected.loc[[10, 12, 14], 'count'] = 9
+    pd.testing.assert_frame_equal(to_dataframe(replaced), expected)
+    pd.testing.assert_frame_equal(to_dataframe(view), dataset.iloc[:5])
+
+    with pytest.raises(KeyError):
+        view.replace(['missing'], view.selection, 1)
+
+
+def test_replace_values_keeps_the_column_type():
+    mask = pa.array([True, False, True])
+    column = pa.chunked_array([pa.array([1, 2]), pa.array([3])])
+    assert replace_values(column, mask, None).to_pylist() == [None, 2, None]
+
+    categories = pa.chunked_array([pa.array(['a', 'b', 'a']).dictionary_encode()])
+    replaced = replace_values(categories, mask, 'b')
+    assert replaced.type == categories.type and replaced.to_pylist() == ['b', 'b', 'b']
+    with pytest.raises(TypeError, match='not one of the categories'):
+        replace_values(categories, mask, 'z')
+
+
+def test_dataframes_pass_through(dataset):
+    assert to_dataframe(dataset) is dataset
+    assert TableView(to_table(dataset), dataset.index).shape == dataset.shape